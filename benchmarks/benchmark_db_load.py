@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark database load paths: multi-row INSERT (to_sql) against COPY.
+
+Synthetic telegram messages are loaded into a scratch copy of
+raw.telegram_messages with each DatabaseManager load method, and the
+rows/s of each is reported. Needs the PostgreSQL database from the
+project configuration; the scratch table is dropped afterwards.
+
+Example:
+    python benchmarks/benchmark_db_load.py --rows 50000 --methods insert copy
+"""
+
+import argparse
+import json
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict
+
+import pandas as pd
+from sqlalchemy import text
+
+# Add project root to Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from generate_sample_data import SampleDataGenerator
+from src.config import Config
+from src.utils import DatabaseManager
+
+SCRATCH_TABLE = 'telegram_messages_load_benchmark'
+
+
+def build_messages(rows: int, seed: int = 42) -> pd.DataFrame:
+    """Generate message rows shaped like TelegramScraper.load_to_database's DataFrame."""
+    random.seed(seed)
+    generator = SampleDataGenerator(Config())
+    records = []
+    while len(records) < rows:
+        for channel in generator.channels:
+            records.extend(generator.generate_channel_data(channel, min(500, rows - len(records))))
+            if len(records) >= rows:
+                break
+
+    df = pd.DataFrame(records[:rows])
+    df['message_id'] = range(1, len(df) + 1)
+    df['date'] = pd.to_datetime(df['date'])
+    df['scraped_at'] = pd.to_datetime(df['scraped_at'])
+    df['raw_data'] = df['raw_data'].apply(lambda x: json.dumps(x, default=str))
+    return df
+
+
+def run_once(db_manager: DatabaseManager, df: pd.DataFrame, method: str) -> Dict[str, float]:
+    """Load the rows into a fresh scratch table and time it."""
+    with db_manager.engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS raw.{SCRATCH_TABLE}"))
+        conn.execute(text(
+            f"CREATE TABLE raw.{SCRATCH_TABLE} (LIKE raw.telegram_messages INCLUDING ALL)"
+        ))
+
+    try:
+        started = time.perf_counter()
+        db_manager.bulk_insert_dataframe(df, SCRATCH_TABLE, schema='raw', method=method)
+        elapsed = time.perf_counter() - started
+
+        with db_manager.engine.connect() as conn:
+            loaded = conn.execute(text(f"SELECT count(*) FROM raw.{SCRATCH_TABLE}")).scalar()
+    finally:
+        with db_manager.engine.begin() as conn:
+            conn.execute(text(f"DROP TABLE IF EXISTS raw.{SCRATCH_TABLE}"))
+
+    return {
+        'method': method,
+        'seconds': elapsed,
+        'rows': loaded,
+        'rows_per_s': loaded / elapsed
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Database load benchmark (needs PostgreSQL)')
+    parser.add_argument('--rows', type=int, default=20000, help='Rows to load per method')
+    parser.add_argument('--methods', nargs='+', choices=['insert', 'copy'], default=['insert', 'copy'])
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    config = Config()
+    db_manager = DatabaseManager(config)
+    if not db_manager.test_connection():
+        print("Database connection failed")
+        sys.exit(1)
+
+    df = build_messages(args.rows)
+
+    print(f"{'method':>8} {'seconds':>9} {'rows':>9} {'rows/s':>11}")
+    baseline = None
+    for method in args.methods:
+        result = run_once(db_manager, df, method)
+        baseline = baseline or result['seconds']
+        print(
+            f"{result['method']:>8} {result['seconds']:>9.2f} {result['rows']:>9} "
+            f"{result['rows_per_s']:>11.0f}   speedup {baseline / result['seconds']:.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
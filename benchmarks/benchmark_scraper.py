@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Benchmark TelegramScraper throughput against the offline fake client.
+
+Runs the serial and concurrent scrape_all_channels paths over the same
+synthetic channels and reports messages/s and media bytes/s. Data is
+written to a temporary data lake; database loading is skipped so the
+numbers reflect scraping and lake writes only.
+
+Example:
+    python benchmarks/benchmark_scraper.py --channels 12 --messages 400 --concurrency 1 4 8
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Add project root to Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from benchmarks.fake_telegram import FakeTelegramClient
+from src.config import Config
+from src.scraping.rate_limiter import AdaptiveRateLimiter
+from src.scraping.session_pool import TelegramSession, TelegramSessionPool
+from src.scraping.telegram_scraper import TelegramScraper
+
+
+class LakeOnlyScraper(TelegramScraper):
+    """Scraper that writes the data lake but skips the database."""
+
+    def load_to_database(self, messages_data: List[Dict[str, Any]]):
+        pass
+
+    def save_albums(self, channel_name: str):
+        self.albums.pop(channel_name, None)
+
+
+def build_config(args, lake_path: Path) -> Config:
+    """Configuration pointing every output at a scratch directory."""
+    config = Config()
+    config.DATA_LAKE_PATH = str(lake_path)
+    config.CHECKPOINT_PATH = str(lake_path / 'state' / 'checkpoints.json')
+    config.ENTITY_CACHE_PATH = str(lake_path / 'state' / 'entity_cache.sqlite')
+    config.METRICS_PATH = ''
+    config.TELEGRAM_CHANNELS = [f'bench_channel_{i}' for i in range(args.channels)]
+    config.SCRAPER_CHANNEL_PAUSE = args.channel_pause
+    config.SCRAPER_REQUEST_BUDGET = 0
+    config.MEDIA_DOWNLOAD_WORKERS = args.download_workers
+    config.MEDIA_STORE_LAYOUT = args.media_layout
+    config.LAKE_FORMAT = args.lake_format
+    return config
+
+
+async def run_once(args, concurrency: int) -> Dict[str, float]:
+    """Scrape every fake channel once and measure throughput."""
+    with tempfile.TemporaryDirectory() as tmp:
+        config = build_config(args, Path(tmp))
+        client = FakeTelegramClient(
+            config.TELEGRAM_CHANNELS,
+            messages_per_channel=args.messages,
+            latency=args.latency,
+            bandwidth=args.bandwidth,
+            repost_ratio=args.repost_ratio,
+            album_ratio=args.album_ratio,
+            flood_every=args.flood_every,
+            flood_seconds=args.flood_seconds
+        )
+        session_pool = TelegramSessionPool([
+            TelegramSession('fake', client, AdaptiveRateLimiter(rate=args.rate, capacity=args.rate))
+        ])
+        scraper = LakeOnlyScraper(config, db_manager=None, session_pool=session_pool)
+
+        started = time.perf_counter()
+        results = await scraper.scrape_all_channels(
+            limit_per_channel=args.messages,
+            days_back=30,
+            concurrency=concurrency,
+            incremental=False
+        )
+        elapsed = time.perf_counter() - started
+
+    messages = sum(results.values())
+    return {
+        'concurrency': concurrency,
+        'seconds': elapsed,
+        'messages': messages,
+        'messages_per_s': messages / elapsed,
+        'bytes_per_s': client.bytes_served / elapsed,
+        'requests': client.requests,
+        'flood_waits': client.flood_waits
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Scraper throughput benchmark (offline)')
+    parser.add_argument('--channels', type=int, default=8, help='Number of fake channels')
+    parser.add_argument('--messages', type=int, default=300, help='Messages per channel')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4], help='Concurrency levels to compare')
+    parser.add_argument('--latency', type=float, default=0.05, help='Seconds per simulated request')
+    parser.add_argument('--bandwidth', type=float, default=5e6, help='Simulated download bytes/s (0 = unlimited)')
+    parser.add_argument('--rate', type=float, default=1000.0, help='Rate limiter requests/s')
+    parser.add_argument('--download-workers', type=int, default=4, help='Media download workers (0 = inline)')
+    parser.add_argument('--media-layout', choices=['content', 'dated'], default='content')
+    parser.add_argument('--lake-format', choices=['ndjson', 'json', 'parquet'], default='ndjson')
+    parser.add_argument('--repost-ratio', type=float, default=0.0, help='Share of reposted photos')
+    parser.add_argument('--album-ratio', type=float, default=0.0, help='Share of media messages in albums')
+    parser.add_argument('--flood-every', type=int, default=0, help='Inject a FloodWait every N requests')
+    parser.add_argument('--flood-seconds', type=int, default=1, help='Seconds per injected FloodWait')
+    parser.add_argument('--channel-pause', type=float, default=0.0, help='Serial-path pause between channels')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    print(f"{'concurrency':>11} {'seconds':>9} {'messages':>9} {'msg/s':>9} {'MB/s':>8} {'requests':>9} {'floods':>7}")
+    baseline = None
+    for concurrency in args.concurrency:
+        result = asyncio.run(run_once(args, concurrency))
+        baseline = baseline or result['seconds']
+        print(
+            f"{result['concurrency']:>11} {result['seconds']:>9.2f} {result['messages']:>9} "
+            f"{result['messages_per_s']:>9.1f} {result['bytes_per_s'] / 1e6:>8.2f} "
+            f"{result['requests']:>9} {result['flood_waits']:>7}"
+            f"   speedup {baseline / result['seconds']:.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
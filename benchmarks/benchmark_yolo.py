@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Benchmark YOLO enrichment throughput: per-image model calls against batches.
+
+Runs the original loop, one `model(path)` call per image, and
+YoloEnrichment.run_yolo_on_images at each batch size and prefetch depth
+(0 decodes inline, between model calls) over the same images, and reports
+images/s. The enrichment logger prints per-stage times for each run.
+Uses synthetic images unless --images points at a folder of real ones.
+Runs on CPU by default; needs ultralytics and opencv.
+
+Example:
+    python benchmarks/benchmark_yolo.py --count 128 --batch-sizes 1 8 16 32 --prefetch-batches 0 2
+"""
+
+import argparse
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import cv2
+import numpy as np
+
+# Add project root to Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.config import Config
+from src.enrichment.yolo_enrichment import YoloEnrichment
+
+
+def write_synthetic_images(folder: Path, count: int, width: int, height: int, seed: int = 42) -> List[str]:
+    """Write JPEGs of random rectangles and circles, sized like channel photos."""
+    rng = np.random.default_rng(seed)
+    paths = []
+    for i in range(count):
+        image = rng.integers(0, 255, (height, width, 3), dtype=np.uint8)
+        for _ in range(5):
+            x, y = int(rng.integers(0, width)), int(rng.integers(0, height))
+            color = tuple(int(c) for c in rng.integers(0, 255, 3))
+            cv2.rectangle(image, (x, y), (x + width // 5, y + height // 5), color, -1)
+            cv2.circle(image, (width - x, height - y), width // 10, color, -1)
+        path = folder / f'image_{i:05d}.jpg'
+        cv2.imwrite(str(path), image)
+        paths.append(str(path))
+    return paths
+
+
+def to_records(paths: List[str]) -> List[Dict[str, Any]]:
+    """Image records shaped like YoloEnrichment.scan_images output."""
+    return [{'channel_name': 'benchmark', 'date': '2024-01-01', 'image_path': path} for path in paths]
+
+
+def run_per_image(enricher: YoloEnrichment, paths: List[str], device: str) -> Dict[str, float]:
+    """The loop run_yolo_on_images used before batching: one model call per path."""
+    started = time.perf_counter()
+    boxes = 0
+    for path in paths:
+        for result in enricher.model(path, verbose=False, device=device):
+            boxes += len(result.boxes)
+    elapsed = time.perf_counter() - started
+    return {'mode': 'per-image', 'seconds': elapsed, 'boxes': boxes, 'images_per_s': len(paths) / elapsed}
+
+
+def run_batched(
+    enricher: YoloEnrichment,
+    paths: List[str],
+    batch_size: int,
+    prefetch_batches: int = 0
+) -> Dict[str, float]:
+    """run_yolo_on_images with a given YOLO_BATCH_SIZE and YOLO_PREFETCH_BATCHES."""
+    enricher.config.YOLO_BATCH_SIZE = batch_size
+    enricher.config.YOLO_PREFETCH_BATCHES = prefetch_batches
+    started = time.perf_counter()
+    detections = enricher.run_yolo_on_images(to_records(paths))
+    elapsed = time.perf_counter() - started
+    return {
+        'mode': f'batch={batch_size} prefetch={prefetch_batches}',
+        'seconds': elapsed,
+        'boxes': len(detections),
+        'images_per_s': len(paths) / elapsed
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='YOLO enrichment batching benchmark')
+    parser.add_argument('--images', help='Folder of .jpg images to use instead of synthetic ones')
+    parser.add_argument('--count', type=int, default=64, help='Synthetic images to generate')
+    parser.add_argument('--width', type=int, default=1280, help='Synthetic image width')
+    parser.add_argument('--height', type=int, default=960, help='Synthetic image height')
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 8, 16], help='Batch sizes to compare')
+    parser.add_argument('--prefetch-batches', type=int, nargs='+', default=[0, 2],
+                        help='Prefetch queue depths to compare (0 = decode inline)')
+    parser.add_argument('--decode-threads', type=int, default=4, help='Image decode threads')
+    parser.add_argument('--device', default='cpu', help='Inference device')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger('src.enrichment.yolo_enrichment').setLevel(logging.INFO)
+
+    config = Config()
+    config.YOLO_DEVICE = args.device
+    config.YOLO_DECODE_THREADS = args.decode_threads
+    enricher = YoloEnrichment(config, db_manager=None)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.images:
+            paths = sorted(str(path) for path in Path(args.images).glob('*.jpg'))
+        else:
+            paths = write_synthetic_images(Path(tmp), args.count, args.width, args.height)
+
+        # Warm up so model loading and first-call setup are not timed
+        run_batched(enricher, paths[:2], 2)
+
+        results = [run_per_image(enricher, paths, args.device)]
+        results.extend(
+            run_batched(enricher, paths, batch_size, prefetch_batches)
+            for batch_size in args.batch_sizes
+            for prefetch_batches in args.prefetch_batches
+        )
+
+    print(f"{len(paths)} images on {args.device}")
+    print(f"{'mode':>20} {'seconds':>9} {'images/s':>9} {'boxes':>7}")
+    baseline = results[0]['seconds']
+    for result in results:
+        print(
+            f"{result['mode']:>20} {result['seconds']:>9.2f} {result['images_per_s']:>9.1f} "
+            f"{result['boxes']:>7}   speedup {baseline / result['seconds']:.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+"""
+Offline stand-in for the subset of the Telethon client the scraper uses.
+
+Channels are filled with synthetic messages from SampleDataGenerator, and
+every request can be given latency, bandwidth and FloodWait behaviour so
+scraping paths can be benchmarked without touching Telegram.
+"""
+
+import asyncio
+import random
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from telethon.errors import ChannelInvalidError, FloodWaitError
+from telethon.tl.types import MessageMediaPhoto, Photo
+
+# Add project root to Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from generate_sample_data import SampleDataGenerator
+from src.config import Config
+
+MESSAGES_PER_PAGE = 100
+
+
+class FakeEntity:
+    """Resolved channel returned by get_entity."""
+
+    def __init__(self, entity_id: int, username: str):
+        self.id = entity_id
+        self.username = username
+        self.access_hash = entity_id * 7919
+
+
+class FakeSender:
+    def __init__(self, sender_id: int):
+        self.id = sender_id
+
+
+class FakeFile:
+    """The `message.file` helper: extension and size of the media."""
+
+    def __init__(self, size: int, ext: str = '.jpg'):
+        self.size = size
+        self.ext = ext
+
+
+class FakeMessage:
+    """A channel message with the attributes the scraper reads."""
+
+    def __init__(self, client: 'FakeTelegramClient', record: Dict[str, Any], photo_id: Optional[int], photo_size: int):
+        self.client = client
+        self.id = record['message_id']
+        self.date = record['date']
+        self.text = record['text']
+        self.sender = FakeSender(record['sender_id'])
+        self.edit_date = None
+        self.views = record['raw_data']['views']
+        self.forwards = record['raw_data']['forwards']
+        self.replies = None
+        self.grouped_id = record['raw_data']['grouped_id']
+        self.document = None
+        self.photo = None
+        self.media = None
+        self.file = None
+        if photo_id is not None:
+            self.photo = Photo(
+                id=photo_id,
+                access_hash=0,
+                file_reference=b'',
+                date=self.date,
+                sizes=[],
+                dc_id=1
+            )
+            self.media = MessageMediaPhoto(photo=self.photo)
+            self.file = FakeFile(photo_size)
+
+    async def download_media(self, file=None):
+        return await self.client._download(self, file)
+
+
+class FakeTelegramClient:
+    """
+    In-memory Telegram client.
+
+    Args:
+        channels: Channel usernames to create
+        messages_per_channel: Messages generated per channel
+        latency: Seconds added to every request (entity, page, download)
+        bandwidth: Download speed in bytes/second; 0 means unlimited
+        photo_size: Size in bytes of every generated photo
+        repost_ratio: Share of photos reusing an earlier photo id
+        album_ratio: Share of media messages grouped into albums with their neighbour
+        flood_every: Raise FloodWaitError on every Nth request; 0 disables
+        flood_seconds: Seconds requested by injected flood waits
+        flood_sleep_threshold: Like Telethon's option of the same name, flood
+                               waits up to this many seconds are slept through
+                               instead of raised; the scraper's clients use 0
+        seed: Random seed, so runs are reproducible
+    """
+
+    def __init__(
+        self,
+        channels: List[str],
+        messages_per_channel: int = 500,
+        latency: float = 0.05,
+        bandwidth: float = 0,
+        photo_size: int = 64 * 1024,
+        repost_ratio: float = 0.0,
+        album_ratio: float = 0.0,
+        flood_every: int = 0,
+        flood_seconds: int = 1,
+        flood_sleep_threshold: int = 0,
+        seed: int = 42
+    ):
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.photo_size = photo_size
+        self.flood_every = flood_every
+        self.flood_seconds = flood_seconds
+        self.flood_sleep_threshold = flood_sleep_threshold
+        self.requests = 0
+        self.flood_waits = 0
+        self.bytes_served = 0
+        self.connected = False
+        self._random = random.Random(seed)
+        self._entities: Dict[str, FakeEntity] = {}
+        self._history: Dict[int, List[FakeMessage]] = {}
+
+        random.seed(seed)
+        generator = SampleDataGenerator(Config())
+        for i, channel in enumerate(channels, start=1):
+            self._entities[channel] = FakeEntity(i, channel)
+            self._history[i] = self._build_history(
+                generator, channel, messages_per_channel, repost_ratio, album_ratio
+            )
+
+    def _build_history(
+        self,
+        generator: SampleDataGenerator,
+        channel: str,
+        count: int,
+        repost_ratio: float,
+        album_ratio: float
+    ) -> List[FakeMessage]:
+        """Generate a channel's messages, oldest first, with increasing ids."""
+        records = generator.generate_channel_data(channel, count)
+        records.sort(key=lambda record: record['date'])
+
+        messages = []
+        photo_ids: List[int] = []
+        previous_grouped_id = None
+        for message_id, record in enumerate(records, start=1):
+            record['message_id'] = message_id
+            record['date'] = datetime.fromisoformat(record['date']).astimezone(timezone.utc)
+
+            photo_id = None
+            if record['has_media']:
+                if photo_ids and self._random.random() < repost_ratio:
+                    photo_id = self._random.choice(photo_ids)
+                else:
+                    photo_id = self._random.getrandbits(48)
+                    photo_ids.append(photo_id)
+                if self._random.random() < album_ratio:
+                    record['raw_data']['grouped_id'] = previous_grouped_id or self._random.getrandbits(48)
+                previous_grouped_id = record['raw_data']['grouped_id']
+            else:
+                previous_grouped_id = None
+
+            messages.append(FakeMessage(self, record, photo_id, self.photo_size))
+        return messages
+
+    async def _request(self):
+        """Simulate one API round trip, injecting flood waits if configured."""
+        self.requests += 1
+        if self.flood_every and self.requests % self.flood_every == 0:
+            self.flood_waits += 1
+            if self.flood_seconds > self.flood_sleep_threshold:
+                raise FloodWaitError(request=None, capture=self.flood_seconds)
+            # Slept through inside the library; the caller never sees it
+            await asyncio.sleep(self.flood_seconds)
+        await asyncio.sleep(self.latency)
+
+    async def start(self):
+        self.connected = True
+        return self
+
+    async def disconnect(self):
+        self.connected = False
+
+    def is_connected(self) -> bool:
+        return self.connected
+
+    async def get_entity(self, username: str) -> FakeEntity:
+        await self._request()
+        if username not in self._entities:
+            raise ValueError(f'No user has "{username}" as username')
+        return self._entities[username]
+
+    async def iter_messages(
+        self,
+        entity,
+        limit: Optional[int] = None,
+        offset_date: Optional[datetime] = None,
+        offset_id: int = 0,
+        min_id: int = 0,
+        max_id: int = 0,
+        reverse: bool = False,
+        wait_time: Optional[float] = None
+    ):
+        """Yield messages with Telethon's ordering and bound semantics, a page per request."""
+        # Accepts resolved entities and InputPeerChannel alike
+        entity_id = getattr(entity, 'channel_id', None) or entity.id
+        if entity.access_hash != entity_id * 7919:
+            await self._request()
+            raise ChannelInvalidError(request=None)
+        history = self._history[entity_id]
+        if reverse:
+            selected = [
+                m for m in history
+                if m.id > min_id
+                and (not offset_id or m.id > offset_id)
+                and (not max_id or m.id < max_id)
+                and (offset_date is None or m.date > offset_date)
+            ]
+        else:
+            selected = [
+                m for m in reversed(history)
+                if m.id > min_id
+                and (not offset_id or m.id < offset_id)
+                and (not max_id or m.id < max_id)
+                and (offset_date is None or m.date < offset_date)
+            ]
+        if limit is not None:
+            selected = selected[:limit]
+
+        for i, message in enumerate(selected):
+            if i % MESSAGES_PER_PAGE == 0:
+                await self._request()
+            yield message
+
+    async def _download(self, message: FakeMessage, file=None):
+        await self._request()
+        size = message.file.size
+        if self.bandwidth:
+            await asyncio.sleep(size / self.bandwidth)
+        self.bytes_served += size
+
+        # Same photo id, same bytes, so content-addressed dedup can be measured
+        data = random.Random(message.photo.id).randbytes(size)
+        if file is bytes:
+            return data
+
+        target = Path(file or '.')
+        if target.is_dir() or not target.suffix:
+            target.mkdir(parents=True, exist_ok=True)
+            target = target / f'photo_{message.photo.id}.jpg'
+        target.write_bytes(data)
+        return str(target)
@@ -1,8 +1,8 @@
 """
 Dagster sensors for the Telegram data pipeline.
 """
-import os
 from dagster import sensor, RunRequest, SkipReason, DefaultSensorStatus
+from src.scraping.lake_catalog import MESSAGES, LakeCatalog
 from .constants import RAW_DATA_DIR
 from .jobs import full_telegram_pipeline
 
@@ -13,26 +13,25 @@ from .jobs import full_telegram_pipeline
 )
 def telegram_directory_sensor(context):
     """
-    A sensor that monitors the `data/raw` directory for new JSON files
-    and triggers the full pipeline if new files are found.
+    A sensor that watches the lake catalog for message files written by
+    the scraper and triggers the full pipeline when there are new ones.
+    
+    The cursor is the catalog's last seen write sequence number, so each
+    check is one indexed query rather than a walk of the data lake.
     """
-    last_mtime = float(context.cursor) if context.cursor else 0
-    max_mtime = last_mtime
+    last_seq = int(context.cursor) if context.cursor and context.cursor.isdigit() else 0
     
-    # Check for new or modified files in the raw data directory
-    for filename in os.listdir(RAW_DATA_DIR):
-        if filename.endswith(".json"):
-            filepath = os.path.join(RAW_DATA_DIR, filename)
-            if os.path.isfile(filepath):
-                mtime = os.path.getmtime(filepath)
-                if mtime > last_mtime:
-                    max_mtime = max(max_mtime, mtime)
+    catalog = LakeCatalog(str(RAW_DATA_DIR))
+    try:
+        latest_seq, changed = catalog.changes_since(last_seq, kind=MESSAGES)
+    finally:
+        catalog.close()
 
-    if max_mtime > last_mtime:
-        context.update_cursor(str(max_mtime))
+    if changed:
+        context.update_cursor(str(latest_seq))
         return RunRequest(
-            run_key=f"new_file_{max_mtime}",
+            run_key=f"lake_catalog_{latest_seq}",
             run_config={},
         )
     
-    return SkipReason(f"No new files found since last check (cursor: {last_mtime}).")
+    return SkipReason(f"No new files found since last check (cursor: {last_seq}).")
@@ -7,6 +7,7 @@ with detections as (
         id as detection_id,
         channel_name,
         date as detection_date,
+        message_id,
         image_path,
         detected_object_class,
         confidence_score,
@@ -21,6 +22,7 @@ with detections as (
 message_lookup as (
     select 
         telegram_message_key,
+        message_id,
         channel_name,
         message_date,
         image_path
@@ -44,9 +46,15 @@ joined as (
         m.telegram_message_key,
         m.message_date
     from detections d
+    -- Content-addressed images are shared by every repost, so detections
+    -- that name their message join on it; dated-layout images are one
+    -- file per message and join on the path
     left join message_lookup m
       on d.channel_name = m.channel_name
-     and d.image_path = m.image_path
+     and (
+          d.message_id = m.message_id
+          or (d.message_id is null and d.image_path = m.image_path)
+     )
 ),
 
 final as (
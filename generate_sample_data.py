@@ -11,6 +11,7 @@ from typing import List, Dict, Any
 import uuid
 
 from src.config import Config
+from src.scraping.lake_catalog import IMAGE, MESSAGES, LakeCatalog
 
 class SampleDataGenerator:
     """Generates sample Telegram data for testing."""
@@ -128,6 +129,8 @@ class SampleDataGenerator:
         date_str = datetime.now().strftime('%Y-%m-%d')
         messages_dir = data_lake_path / 'telegram_messages' / date_str
         messages_dir.mkdir(parents=True, exist_ok=True)
+        # Record the files, so catalog consumers (loader, YOLO, sensors) see them
+        catalog = LakeCatalog(str(data_lake_path))
         
         total_messages = 0
         
@@ -144,10 +147,12 @@ class SampleDataGenerator:
             file_path = messages_dir / f'{channel}.json'
             with open(file_path, 'w', encoding='utf-8') as f:
                 json.dump(messages, f, ensure_ascii=False, indent=2)
+            catalog.record_file(file_path, MESSAGES, channel, date_str, row_count=len(messages))
             
             total_messages += len(messages)
             print(f"Saved {len(messages)} messages for {channel}")
         
+        catalog.close()
         print(f"Total sample messages generated: {total_messages}")
         print(f"Data saved to: {messages_dir}")
         
@@ -158,6 +163,7 @@ class SampleDataGenerator:
         try:
             from PIL import Image, ImageDraw, ImageFont
             
+            catalog = LakeCatalog(self.config.DATA_LAKE_PATH)
             for channel in self.channels:
                 for i in range(num_images // len(self.channels)):
                     # Create directory
@@ -176,7 +182,9 @@ class SampleDataGenerator:
                     # Save image
                     image_path = image_dir / f'sample_{i+1}.jpg'
                     img.save(image_path)
+                    catalog.record_file(image_path, IMAGE, channel, date_str)
             
+            catalog.close()
             print(f"Generated {num_images} sample images")
             
         except ImportError:
@@ -8,13 +8,15 @@ import asyncio
 import argparse
 import logging
 import sys
+from datetime import datetime
 from pathlib import Path
 
 # Add src to Python path
 sys.path.append(str(Path(__file__).parent))
 
-from src.scraping.telegram_scraper import run_telegram_scraper
+from src.scraping.telegram_scraper import run_backfill, run_telegram_scraper
 from src.scraping.data_loader import DataLakeLoader
+from src.scraping.lake_catalog import LakeCatalog
 from src.config import Config
 from src.utils import DatabaseManager
 
@@ -29,16 +31,24 @@ def setup_logging(log_level: str = "INFO"):
         ]
     )
 
-async def scrape_and_load():
+async def scrape_and_load(
+    concurrency: int = None,
+    full_refresh: bool = False,
+    reset_checkpoints: bool = False
+):
     """Scrape data and load it into database."""
     logger = logging.getLogger(__name__)
     
     try:
         # Run the scraper
         logger.info("Starting Telegram scraping process...")
-        results = await run_telegram_scraper()
+        results = await run_telegram_scraper(
+            concurrency=concurrency,
+            incremental=not full_refresh,
+            reset_checkpoints=reset_checkpoints
+        )
         
-        total_messages = sum(len(messages) for messages in results.values())
+        total_messages = sum(results.values())
         logger.info(f"Scraping completed. Total messages: {total_messages}")
         
         return results
@@ -47,7 +57,48 @@ async def scrape_and_load():
         logger.error(f"Scraping process failed: {e}")
         raise
 
-def load_existing_data():
+async def backfill_history(
+    start_date: str,
+    end_date: str,
+    window_days: int = None,
+    concurrency: int = None,
+    channels: list = None
+):
+    """Backfill a historical date range window by window."""
+    logger = logging.getLogger(__name__)
+    
+    try:
+        logger.info(f"Starting backfill from {start_date} to {end_date}...")
+        counts = await run_backfill(
+            start_date,
+            end_date,
+            window_days=window_days,
+            concurrency=concurrency,
+            channels=channels
+        )
+        
+        logger.info(f"Backfill completed. Total messages: {sum(counts.values())}")
+        
+        return counts
+        
+    except Exception as e:
+        logger.error(f"Backfill process failed: {e}")
+        raise
+
+def reconcile_lake_catalog():
+    """Index lake files the scraper did not write, e.g. copied in by hand."""
+    logger = logging.getLogger(__name__)
+    
+    config = Config()
+    catalog = LakeCatalog(config.DATA_LAKE_PATH)
+    try:
+        counts = catalog.reconcile()
+        logger.info(f"Lake catalog reconciled: {counts}")
+        return counts
+    finally:
+        catalog.close()
+
+def load_existing_data(reload_all: bool = False, workers: int = None):
     """Load existing data from data lake into database."""
     logger = logging.getLogger(__name__)
     
@@ -61,6 +112,9 @@ def load_existing_data():
             logger.error("Database connection failed")
             return False
         
+        # Create the coming months' partitions and apply retention
+        db_manager.maintain_message_partitions()
+        
         # Load data from data lake
         loader = DataLakeLoader(config, db_manager)
         
@@ -69,7 +123,10 @@ def load_existing_data():
         logger.info(f"Data lake summary: {summary}")
         
         # Load all data
-        loader.load_json_files_to_db()
+        if config.LAKE_FORMAT == 'parquet':
+            loader.load_parquet_to_db()
+        else:
+            loader.load_json_files_to_db(reload_all=reload_all, workers=workers)
         
         return True
         
@@ -82,9 +139,53 @@ def main():
     parser = argparse.ArgumentParser(description='Telegram Data Scraper')
     parser.add_argument(
         '--action', 
-        choices=['scrape', 'load', 'both'], 
+        choices=['scrape', 'load', 'both', 'backfill', 'catalog'], 
         default='both',
-        help='Action to perform: scrape new data, load existing data, or both'
+        help='Action to perform: scrape new data, load existing data, both, backfill a date range, '
+             'or reconcile the lake catalog with files added by other tools'
+    )
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        help='Number of channels to scrape at once (defaults to SCRAPER_CONCURRENCY)'
+    )
+    parser.add_argument(
+        '--full-refresh',
+        action='store_true',
+        help='Ignore channel checkpoints and re-scrape the whole days_back window'
+    )
+    parser.add_argument(
+        '--reset-checkpoints',
+        action='store_true',
+        help='Clear all channel checkpoints before scraping'
+    )
+    parser.add_argument(
+        '--reload-all',
+        action='store_true',
+        help='Load every lake file, even those the load manifest marks as loaded'
+    )
+    parser.add_argument(
+        '--load-workers',
+        type=int,
+        help='Processes to load lake files with (defaults to LOAD_WORKERS)'
+    )
+    parser.add_argument(
+        '--start-date',
+        help='First day to backfill (YYYY-MM-DD), required with --action backfill'
+    )
+    parser.add_argument(
+        '--end-date',
+        help='Last day to backfill, inclusive (YYYY-MM-DD); defaults to today'
+    )
+    parser.add_argument(
+        '--window-days',
+        type=int,
+        help='Days per backfill window (defaults to BACKFILL_WINDOW_DAYS)'
+    )
+    parser.add_argument(
+        '--channels',
+        nargs='+',
+        help='Channels to backfill (defaults to all configured channels)'
     )
     parser.add_argument(
         '--log-level', 
@@ -94,6 +195,8 @@ def main():
     )
     
     args = parser.parse_args()
+    if args.action == 'backfill' and not args.start_date:
+        parser.error('--start-date is required with --action backfill')
     
     # Setup logging
     setup_logging(args.log_level)
@@ -104,11 +207,27 @@ def main():
     try:
         if args.action in ['scrape', 'both']:
             # Run scraping
-            asyncio.run(scrape_and_load())
+            asyncio.run(scrape_and_load(
+                concurrency=args.concurrency,
+                full_refresh=args.full_refresh,
+                reset_checkpoints=args.reset_checkpoints
+            ))
+        
+        if args.action == 'backfill':
+            asyncio.run(backfill_history(
+                args.start_date,
+                args.end_date or datetime.now().strftime('%Y-%m-%d'),
+                window_days=args.window_days,
+                concurrency=args.concurrency,
+                channels=args.channels
+            ))
+        
+        if args.action == 'catalog':
+            reconcile_lake_catalog()
         
         if args.action in ['load', 'both']:
             # Load existing data
-            load_existing_data()
+            load_existing_data(reload_all=args.reload_all, workers=args.load_workers)
         
         logger.info("Process completed successfully")
         
@@ -35,6 +35,21 @@ def main():
         type=str,
         help='Specific date folder to process (YYYY-MM-DD format). If not provided, processes all available images.'
     )
+    parser.add_argument(
+        '--reprocess-all',
+        action='store_true',
+        help='Run every image again, even those already processed by the current model'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        help='Processes to shard images across, each with its own model (defaults to YOLO_WORKERS)'
+    )
+    parser.add_argument(
+        '--threads-per-worker',
+        type=int,
+        help='CPU threads per worker model (defaults to YOLO_THREADS_PER_WORKER, or CPUs / workers)'
+    )
     parser.add_argument(
         '--log-level', 
         choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'], 
@@ -68,7 +83,12 @@ def main():
         
         # Run enrichment
         logger.info(f"Processing images from date folder: {args.date_folder if args.date_folder else 'all'}")
-        yolo_enricher.enrich(date_folder=args.date_folder)
+        yolo_enricher.enrich(
+            date_folder=args.date_folder,
+            reprocess_all=args.reprocess_all,
+            workers=args.workers,
+            threads_per_worker=args.threads_per_worker
+        )
         
         logger.info("YOLO enrichment completed successfully!")
         return True
@@ -3,31 +3,145 @@ CREATE SCHEMA IF NOT EXISTS raw;
 CREATE SCHEMA IF NOT EXISTS staging;
 CREATE SCHEMA IF NOT EXISTS marts;
 
--- Create raw tables for telegram data
+-- Create raw tables for telegram data, partitioned by month of the message date
 CREATE TABLE IF NOT EXISTS raw.telegram_messages (
-    id SERIAL PRIMARY KEY,
+    id SERIAL,
     message_id BIGINT,
     channel_name VARCHAR(255),
-    date TIMESTAMP,
+    date TIMESTAMP NOT NULL,
     text TEXT,
     sender_id BIGINT,
     has_media BOOLEAN DEFAULT FALSE,
     media_type VARCHAR(50),
     image_path TEXT,
     scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    raw_data JSONB
-);
+    raw_data JSONB,
+    PRIMARY KEY (id, date)
+) PARTITION BY RANGE (date);
+
+-- Catches messages from months that have no partition yet
+CREATE TABLE IF NOT EXISTS raw.telegram_messages_default
+    PARTITION OF raw.telegram_messages DEFAULT;
 
 -- Create indexes
 CREATE INDEX IF NOT EXISTS idx_channel_date ON raw.telegram_messages(channel_name, date);
 CREATE INDEX IF NOT EXISTS idx_message_id ON raw.telegram_messages(message_id);
 CREATE INDEX IF NOT EXISTS idx_has_media ON raw.telegram_messages(has_media);
 
+-- Natural key: a message is loaded once per channel; reloads upsert into it.
+-- Unique indexes on a partitioned table must include the partition key,
+-- and a message's date never changes, so it is part of the key.
+CREATE UNIQUE INDEX IF NOT EXISTS uq_telegram_messages_channel_message
+    ON raw.telegram_messages(channel_name, message_id, date);
+
+-- Creates the month partition of raw.telegram_messages holding `month_start`,
+-- first moving that month's rows out of the default partition. Returns the
+-- partition name, or NULL if it already existed.
+CREATE OR REPLACE FUNCTION raw.create_telegram_messages_partition(month_start DATE)
+RETURNS TEXT AS $$
+DECLARE
+    range_start TIMESTAMP := date_trunc('month', month_start);
+    range_end TIMESTAMP := date_trunc('month', month_start) + INTERVAL '1 month';
+    partition_name TEXT := 'telegram_messages_p' || to_char(month_start, 'YYYY_MM');
+BEGIN
+    IF to_regclass('raw.' || partition_name) IS NOT NULL THEN
+        RETURN NULL;
+    END IF;
+
+    EXECUTE format(
+        'CREATE TABLE raw.%I (LIKE raw.telegram_messages INCLUDING DEFAULTS)',
+        partition_name
+    );
+    EXECUTE format(
+        'WITH moved AS (DELETE FROM raw.telegram_messages_default WHERE date >= $1 AND date < $2 RETURNING *) INSERT INTO raw.%I SELECT * FROM moved',
+        partition_name
+    ) USING range_start, range_end;
+    EXECUTE format(
+        'ALTER TABLE raw.telegram_messages ATTACH PARTITION raw.%I FOR VALUES FROM (%L) TO (%L)',
+        partition_name, range_start, range_end
+    );
+    RETURN partition_name;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Creates every missing month partition between two dates; returns how many were created
+CREATE OR REPLACE FUNCTION raw.ensure_telegram_messages_partitions(first_day DATE, last_day DATE)
+RETURNS INTEGER AS $$
+DECLARE
+    month_start DATE := date_trunc('month', first_day);
+    created INTEGER := 0;
+BEGIN
+    WHILE month_start <= last_day LOOP
+        IF raw.create_telegram_messages_partition(month_start) IS NOT NULL THEN
+            created := created + 1;
+        END IF;
+        month_start := month_start + INTERVAL '1 month';
+    END LOOP;
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Retention: drops the month partitions that end on or before `before_day`.
+-- Dropping a partition is a catalog change rather than a DELETE, so it is
+-- instant and leaves no dead rows to vacuum. Returns how many were dropped.
+CREATE OR REPLACE FUNCTION raw.drop_telegram_messages_partitions(before_day DATE)
+RETURNS INTEGER AS $$
+DECLARE
+    partition_name TEXT;
+    dropped INTEGER := 0;
+BEGIN
+    FOR partition_name IN
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE pg_inherits.inhparent = 'raw.telegram_messages'::regclass
+          AND child.relname ~ '^telegram_messages_p[0-9]{4}_[0-9]{2}$'
+          AND to_date(right(child.relname, 7), 'YYYY_MM') + INTERVAL '1 month' <= before_day
+        ORDER BY child.relname
+    LOOP
+        EXECUTE format('DROP TABLE raw.%I', partition_name);
+        dropped := dropped + 1;
+    END LOOP;
+    RETURN dropped;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Partitions for the past year and the next three months; loaders create others as needed
+SELECT raw.ensure_telegram_messages_partitions(
+    (CURRENT_DATE - INTERVAL '12 months')::date,
+    (CURRENT_DATE + INTERVAL '3 months')::date
+);
+
+-- Album metadata: one row per group of messages sharing a grouped_id
+CREATE TABLE IF NOT EXISTS raw.telegram_albums (
+    id SERIAL PRIMARY KEY,
+    grouped_id BIGINT NOT NULL,
+    channel_name VARCHAR(255) NOT NULL,
+    date TIMESTAMP,
+    message_ids JSONB,
+    caption TEXT,
+    media_count INTEGER,
+    image_paths JSONB,
+    scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT uq_telegram_albums_channel_group UNIQUE (channel_name, grouped_id)
+);
+
+-- Lake files already loaded, so loaders only process new or changed files
+CREATE TABLE IF NOT EXISTS raw.load_manifest (
+    path TEXT PRIMARY KEY,
+    size_bytes BIGINT NOT NULL,
+    mtime_ns BIGINT NOT NULL,
+    checksum CHAR(64) NOT NULL,
+    row_count INTEGER NOT NULL,
+    loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 -- Create raw table for YOLO image detections
 CREATE TABLE IF NOT EXISTS raw.image_detections (
     id SERIAL PRIMARY KEY,
     channel_name VARCHAR(255),
     date DATE,
+    message_id BIGINT,
     image_path TEXT,
     detected_object_class VARCHAR(100),
     confidence_score FLOAT,
@@ -41,6 +155,20 @@ CREATE TABLE IF NOT EXISTS raw.image_detections (
 -- Create indexes for image detections
 CREATE INDEX IF NOT EXISTS idx_image_path ON raw.image_detections(image_path);
 CREATE INDEX IF NOT EXISTS idx_detected_object_class ON raw.image_detections(detected_object_class);
+CREATE INDEX IF NOT EXISTS idx_image_detections_message ON raw.image_detections(channel_name, message_id);
+
+-- Images run through YOLO, so enrichment only processes new or changed
+-- images, or images last processed by another model version
+CREATE TABLE IF NOT EXISTS raw.processed_images (
+    image_path TEXT NOT NULL,
+    channel_name VARCHAR(255) NOT NULL,
+    date DATE NOT NULL,
+    checksum CHAR(64),
+    model_version TEXT NOT NULL,
+    detection_count INTEGER NOT NULL,
+    processed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (image_path, channel_name, date)
+);
 
 -- Grant permissions
 GRANT ALL PRIVILEGES ON ALL TABLES IN SCHEMA raw TO postgres;
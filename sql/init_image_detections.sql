@@ -3,6 +3,7 @@ CREATE TABLE IF NOT EXISTS raw.image_detections (
     id SERIAL PRIMARY KEY,
     channel_name VARCHAR(255),
     date DATE,
+    message_id BIGINT,
     image_path TEXT,
     detected_object_class VARCHAR(100),
     confidence_score FLOAT,
@@ -15,3 +16,17 @@ CREATE TABLE IF NOT EXISTS raw.image_detections (
 
 CREATE INDEX IF NOT EXISTS idx_image_path ON raw.image_detections(image_path);
 CREATE INDEX IF NOT EXISTS idx_detected_object_class ON raw.image_detections(detected_object_class);
+CREATE INDEX IF NOT EXISTS idx_image_detections_message ON raw.image_detections(channel_name, message_id);
+
+-- Images run through YOLO, so enrichment only processes new or changed
+-- images, or images last processed by another model version
+CREATE TABLE IF NOT EXISTS raw.processed_images (
+    image_path TEXT NOT NULL,
+    channel_name VARCHAR(255) NOT NULL,
+    date DATE NOT NULL,
+    checksum CHAR(64),
+    model_version TEXT NOT NULL,
+    detection_count INTEGER NOT NULL,
+    processed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (image_path, channel_name, date)
+);
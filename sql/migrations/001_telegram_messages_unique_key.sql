@@ -0,0 +1,16 @@
+-- Adds the (channel_name, message_id) natural key to an existing
+-- raw.telegram_messages table so loads can upsert instead of append.
+-- New databases get the index from sql/init.sql.
+
+-- Remove duplicates left by earlier append-only loads, keeping the most
+-- recently loaded copy of each message
+DELETE FROM raw.telegram_messages older
+USING raw.telegram_messages newer
+WHERE older.channel_name = newer.channel_name
+  AND older.message_id = newer.message_id
+  AND older.id < newer.id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_telegram_messages_channel_message
+    ON raw.telegram_messages(channel_name, message_id);
+
+ANALYZE raw.telegram_messages;
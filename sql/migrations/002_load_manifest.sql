@@ -0,0 +1,11 @@
+-- Adds the manifest of loaded lake files to an existing database.
+-- New databases get the table from sql/init.sql.
+
+CREATE TABLE IF NOT EXISTS raw.load_manifest (
+    path TEXT PRIMARY KEY,
+    size_bytes BIGINT NOT NULL,
+    mtime_ns BIGINT NOT NULL,
+    checksum CHAR(64) NOT NULL,
+    row_count INTEGER NOT NULL,
+    loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
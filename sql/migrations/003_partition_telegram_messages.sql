@@ -0,0 +1,145 @@
+-- Converts an existing raw.telegram_messages heap into the monthly range
+-- partitioned layout of sql/init.sql. New databases are created partitioned.
+--
+-- Runs in one transaction: rows are copied into month partitions, the old
+-- table is dropped, and ids keep coming from the same sequence. Apply after
+-- 001 and 002. Messages without a date cannot be partitioned; if there are
+-- any, the old table is kept as raw.telegram_messages_unpartitioned holding
+-- just those rows.
+
+ALTER TABLE raw.telegram_messages RENAME TO telegram_messages_unpartitioned;
+ALTER TABLE raw.telegram_messages_unpartitioned
+    RENAME CONSTRAINT telegram_messages_pkey TO telegram_messages_unpartitioned_pkey;
+DROP INDEX IF EXISTS raw.idx_channel_date;
+DROP INDEX IF EXISTS raw.idx_message_id;
+DROP INDEX IF EXISTS raw.idx_has_media;
+DROP INDEX IF EXISTS raw.uq_telegram_messages_channel_message;
+
+CREATE TABLE raw.telegram_messages (
+    id INTEGER NOT NULL DEFAULT nextval('raw.telegram_messages_id_seq'),
+    message_id BIGINT,
+    channel_name VARCHAR(255),
+    date TIMESTAMP NOT NULL,
+    text TEXT,
+    sender_id BIGINT,
+    has_media BOOLEAN DEFAULT FALSE,
+    media_type VARCHAR(50),
+    image_path TEXT,
+    scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    raw_data JSONB,
+    PRIMARY KEY (id, date)
+) PARTITION BY RANGE (date);
+
+-- Keep the id sequence alive when the old table is dropped
+ALTER SEQUENCE raw.telegram_messages_id_seq OWNED BY raw.telegram_messages.id;
+
+CREATE TABLE raw.telegram_messages_default
+    PARTITION OF raw.telegram_messages DEFAULT;
+
+CREATE INDEX idx_channel_date ON raw.telegram_messages(channel_name, date);
+CREATE INDEX idx_message_id ON raw.telegram_messages(message_id);
+CREATE INDEX idx_has_media ON raw.telegram_messages(has_media);
+CREATE UNIQUE INDEX uq_telegram_messages_channel_message
+    ON raw.telegram_messages(channel_name, message_id, date);
+
+-- Creates the month partition of raw.telegram_messages holding `month_start`,
+-- first moving that month's rows out of the default partition. Returns the
+-- partition name, or NULL if it already existed.
+CREATE OR REPLACE FUNCTION raw.create_telegram_messages_partition(month_start DATE)
+RETURNS TEXT AS $$
+DECLARE
+    range_start TIMESTAMP := date_trunc('month', month_start);
+    range_end TIMESTAMP := date_trunc('month', month_start) + INTERVAL '1 month';
+    partition_name TEXT := 'telegram_messages_p' || to_char(month_start, 'YYYY_MM');
+BEGIN
+    IF to_regclass('raw.' || partition_name) IS NOT NULL THEN
+        RETURN NULL;
+    END IF;
+
+    EXECUTE format(
+        'CREATE TABLE raw.%I (LIKE raw.telegram_messages INCLUDING DEFAULTS)',
+        partition_name
+    );
+    EXECUTE format(
+        'WITH moved AS (DELETE FROM raw.telegram_messages_default WHERE date >= $1 AND date < $2 RETURNING *) INSERT INTO raw.%I SELECT * FROM moved',
+        partition_name
+    ) USING range_start, range_end;
+    EXECUTE format(
+        'ALTER TABLE raw.telegram_messages ATTACH PARTITION raw.%I FOR VALUES FROM (%L) TO (%L)',
+        partition_name, range_start, range_end
+    );
+    RETURN partition_name;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Creates every missing month partition between two dates; returns how many were created
+CREATE OR REPLACE FUNCTION raw.ensure_telegram_messages_partitions(first_day DATE, last_day DATE)
+RETURNS INTEGER AS $$
+DECLARE
+    month_start DATE := date_trunc('month', first_day);
+    created INTEGER := 0;
+BEGIN
+    WHILE month_start <= last_day LOOP
+        IF raw.create_telegram_messages_partition(month_start) IS NOT NULL THEN
+            created := created + 1;
+        END IF;
+        month_start := month_start + INTERVAL '1 month';
+    END LOOP;
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Retention: drops the month partitions that end on or before `before_day`.
+-- Dropping a partition is a catalog change rather than a DELETE, so it is
+-- instant and leaves no dead rows to vacuum. Returns how many were dropped.
+CREATE OR REPLACE FUNCTION raw.drop_telegram_messages_partitions(before_day DATE)
+RETURNS INTEGER AS $$
+DECLARE
+    partition_name TEXT;
+    dropped INTEGER := 0;
+BEGIN
+    FOR partition_name IN
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE pg_inherits.inhparent = 'raw.telegram_messages'::regclass
+          AND child.relname ~ '^telegram_messages_p[0-9]{4}_[0-9]{2}$'
+          AND to_date(right(child.relname, 7), 'YYYY_MM') + INTERVAL '1 month' <= before_day
+        ORDER BY child.relname
+    LOOP
+        EXECUTE format('DROP TABLE raw.%I', partition_name);
+        dropped := dropped + 1;
+    END LOOP;
+    RETURN dropped;
+END;
+$$ LANGUAGE plpgsql;
+
+-- One partition per month of existing data, plus the next three months
+SELECT raw.ensure_telegram_messages_partitions(
+    COALESCE(min(date), CURRENT_DATE)::date,
+    (GREATEST(max(date), CURRENT_DATE) + INTERVAL '3 months')::date
+)
+FROM raw.telegram_messages_unpartitioned;
+
+INSERT INTO raw.telegram_messages (
+    id, message_id, channel_name, date, text, sender_id, has_media,
+    media_type, image_path, scraped_at, raw_data
+)
+SELECT
+    id, message_id, channel_name, date, text, sender_id, has_media,
+    media_type, image_path, scraped_at, raw_data
+FROM raw.telegram_messages_unpartitioned
+WHERE date IS NOT NULL;
+
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM raw.telegram_messages_unpartitioned WHERE date IS NULL) THEN
+        DELETE FROM raw.telegram_messages_unpartitioned WHERE date IS NOT NULL;
+        RAISE NOTICE 'Kept messages without a date in raw.telegram_messages_unpartitioned';
+    ELSE
+        DROP TABLE raw.telegram_messages_unpartitioned;
+    END IF;
+END;
+$$;
+
+ANALYZE raw.telegram_messages;
@@ -0,0 +1,29 @@
+-- Adds the processed-image ledger to an existing database.
+-- New databases get the table from sql/init.sql.
+--
+-- Enrichment runs before this migration appended detections on every run;
+-- keep one copy of each detection per image record.
+DELETE FROM raw.image_detections older
+USING raw.image_detections newer
+WHERE older.image_path = newer.image_path
+  AND older.channel_name = newer.channel_name
+  AND older.date = newer.date
+  AND older.detected_object_class = newer.detected_object_class
+  AND older.bbox_xmin = newer.bbox_xmin
+  AND older.bbox_ymin = newer.bbox_ymin
+  AND older.bbox_xmax = newer.bbox_xmax
+  AND older.bbox_ymax = newer.bbox_ymax
+  AND older.id < newer.id;
+
+-- Images run through YOLO, so enrichment only processes new or changed
+-- images, or images last processed by another model version
+CREATE TABLE IF NOT EXISTS raw.processed_images (
+    image_path TEXT NOT NULL,
+    channel_name VARCHAR(255) NOT NULL,
+    date DATE NOT NULL,
+    checksum CHAR(64),
+    model_version TEXT NOT NULL,
+    detection_count INTEGER NOT NULL,
+    processed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (image_path, channel_name, date)
+);
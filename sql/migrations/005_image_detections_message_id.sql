@@ -0,0 +1,12 @@
+-- Links image detections to the message that showed the image.
+-- New databases get the column from sql/init.sql.
+--
+-- A content-addressed image reposted in a channel has one path for every
+-- message, so detections are now stored once per message and carry its id.
+ALTER TABLE raw.image_detections ADD COLUMN IF NOT EXISTS message_id BIGINT;
+
+CREATE INDEX IF NOT EXISTS idx_image_detections_message ON raw.image_detections(channel_name, message_id);
+
+-- Forget content-addressed images in the ledger, so the next enrichment run
+-- replaces their detections with per-message rows
+DELETE FROM raw.processed_images WHERE image_path LIKE '%images/objects/%';
@@ -0,0 +1,48 @@
+-- Keeps one raw.telegram_albums row per (channel_name, grouped_id).
+-- New databases get the constraint from sql/init.sql.
+--
+-- Albums used to be appended on every save, so re-scrapes and albums cut at
+-- a scrape boundary left several rows per group. Merge them into the
+-- oldest row before adding the unique key the scraper now upserts on.
+UPDATE raw.telegram_albums AS keep
+SET date = merged.date,
+    message_ids = merged.message_ids,
+    caption = merged.caption,
+    media_count = GREATEST(merged.media_count, jsonb_array_length(merged.image_paths)),
+    image_paths = merged.image_paths,
+    scraped_at = merged.scraped_at
+FROM (
+    SELECT
+        a.channel_name,
+        a.grouped_id,
+        MIN(a.id) AS keep_id,
+        MIN(a.date) AS date,
+        (
+            SELECT jsonb_agg(DISTINCT id ORDER BY id)
+            FROM raw.telegram_albums b, jsonb_array_elements(COALESCE(b.message_ids, '[]'::jsonb)) AS ids(id)
+            WHERE b.channel_name = a.channel_name AND b.grouped_id = a.grouped_id
+        ) AS message_ids,
+        (ARRAY_AGG(a.caption ORDER BY a.id) FILTER (WHERE a.caption IS NOT NULL))[1] AS caption,
+        MAX(a.media_count) AS media_count,
+        (
+            SELECT COALESCE(jsonb_agg(DISTINCT path), '[]'::jsonb)
+            FROM raw.telegram_albums b, jsonb_array_elements(COALESCE(b.image_paths, '[]'::jsonb)) AS paths(path)
+            WHERE b.channel_name = a.channel_name AND b.grouped_id = a.grouped_id
+        ) AS image_paths,
+        MAX(a.scraped_at) AS scraped_at
+    FROM raw.telegram_albums a
+    GROUP BY a.channel_name, a.grouped_id
+    HAVING COUNT(*) > 1
+) AS merged
+WHERE keep.id = merged.keep_id;
+
+DELETE FROM raw.telegram_albums AS duplicate
+USING raw.telegram_albums AS keep
+WHERE duplicate.channel_name = keep.channel_name
+  AND duplicate.grouped_id = keep.grouped_id
+  AND duplicate.id > keep.id;
+
+DROP INDEX IF EXISTS raw.idx_album_channel_group;
+
+ALTER TABLE raw.telegram_albums
+    ADD CONSTRAINT uq_telegram_albums_channel_group UNIQUE (channel_name, grouped_id);
@@ -15,6 +15,8 @@ class Config:
     POSTGRES_USER = os.getenv("POSTGRES_USER", "postgres")
     POSTGRES_PASSWORD = os.getenv("POSTGRES_PASSWORD")
     POSTGRES_PORT = os.getenv("POSTGRES_PORT", "5432")
+    MESSAGE_PARTITION_MONTHS_AHEAD = int(os.getenv("MESSAGE_PARTITION_MONTHS_AHEAD", "3"))
+    MESSAGE_RETENTION_MONTHS = int(os.getenv("MESSAGE_RETENTION_MONTHS", "0"))  # 0 = keep all months
     
     @property
     def database_url(self) -> str:
@@ -24,6 +26,9 @@ class Config:
     # Telegram Configuration
     TELEGRAM_API_ID = os.getenv("TELEGRAM_API_ID")
     TELEGRAM_API_HASH = os.getenv("TELEGRAM_API_HASH")
+    # Extra accounts to shard channels across: "session_file:api_id:api_hash,..."
+    TELEGRAM_SESSIONS = os.getenv("TELEGRAM_SESSIONS", "")
+    SESSION_FAILOVER_SECONDS = int(os.getenv("SESSION_FAILOVER_SECONDS", "30"))
     
     # Telegram Channels to Scrape
     TELEGRAM_CHANNELS = [
@@ -32,8 +37,48 @@ class Config:
         "tikvahpharma"
     ]
     
+    # Scraper Concurrency Configuration
+    SCRAPER_CONCURRENCY = int(os.getenv("SCRAPER_CONCURRENCY", "1"))  # 1 = serial
+    SCRAPER_REQUEST_BUDGET = int(os.getenv("SCRAPER_REQUEST_BUDGET", "0"))  # 0 = unlimited
+    SCRAPER_RATE_LIMIT = float(os.getenv("SCRAPER_RATE_LIMIT", "2.0"))  # starting requests per second
+    SCRAPER_RATE_MAX = float(os.getenv("SCRAPER_RATE_MAX", "10.0"))  # ceiling the rate climbs toward between flood waits
+    SCRAPER_RATE_BURST = int(os.getenv("SCRAPER_RATE_BURST", "5"))
+    SCRAPER_MAX_FLOOD_RETRIES = int(os.getenv("SCRAPER_MAX_FLOOD_RETRIES", "5"))
+    SCRAPER_CHANNEL_PAUSE = float(os.getenv("SCRAPER_CHANNEL_PAUSE", "5"))  # serial mode only
+    BACKFILL_WINDOW_DAYS = int(os.getenv("BACKFILL_WINDOW_DAYS", "7"))
+    
     # Data Lake Configuration
     DATA_LAKE_PATH = os.getenv("DATA_LAKE_PATH", "./data/raw")
+    LAKE_FORMAT = os.getenv("LAKE_FORMAT", "ndjson")  # ndjson | json | parquet
+    LAKE_COMPRESSION = os.getenv("LAKE_COMPRESSION", "none")  # none | gzip | zstd
+    LOAD_BATCH_SIZE = int(os.getenv("LOAD_BATCH_SIZE", "5000"))
+    DB_LOAD_METHOD = os.getenv("DB_LOAD_METHOD", "copy")  # copy | insert
+    LOAD_MODE = os.getenv("LOAD_MODE", "upsert")  # upsert | append
+    LOAD_WORKERS = int(os.getenv("LOAD_WORKERS", "1"))  # processes for lake loading; 1 = in-process
+    PARQUET_BATCH_SIZE = int(os.getenv("PARQUET_BATCH_SIZE", "10000"))  # scrapes also flush every LOAD_BATCH_SIZE
+    
+    # Media Download Configuration
+    MEDIA_DOWNLOAD_WORKERS = int(os.getenv("MEDIA_DOWNLOAD_WORKERS", "4"))  # 0 = download inline
+    MEDIA_MAX_BYTES_IN_FLIGHT = int(os.getenv("MEDIA_MAX_BYTES_IN_FLIGHT", str(64 * 1024 * 1024)))
+    MEDIA_QUEUE_SIZE = int(os.getenv("MEDIA_QUEUE_SIZE", "100"))
+    MEDIA_STORE_LAYOUT = os.getenv("MEDIA_STORE_LAYOUT", "content")  # content | dated
+    
+    # Scraper State Configuration
+    CHECKPOINT_PATH = os.getenv("CHECKPOINT_PATH", "./data/state/scraper_checkpoints.json")
+    ENTITY_CACHE_PATH = os.getenv("ENTITY_CACHE_PATH", "./data/state/entity_cache.sqlite")
+    ENTITY_CACHE_TTL_HOURS = float(os.getenv("ENTITY_CACHE_TTL_HOURS", "168"))
+    METRICS_PATH = os.getenv("METRICS_PATH", "./data/state/scraper_metrics.prom")  # .json or Prometheus text; empty disables
+    
+    # Image Enrichment Configuration
+    YOLO_MODEL = os.getenv("YOLO_MODEL", "yolov8n.pt")  # nano model for speed
+    YOLO_MODEL_VERSION = os.getenv("YOLO_MODEL_VERSION", "")  # empty = derived from weights and ultralytics
+    YOLO_BATCH_SIZE = int(os.getenv("YOLO_BATCH_SIZE", "16"))  # images per model call
+    YOLO_DEVICE = os.getenv("YOLO_DEVICE", "")  # e.g. cpu or 0; empty = ultralytics default
+    YOLO_IMAGE_SIZE = int(os.getenv("YOLO_IMAGE_SIZE", "640"))  # model input size; images are letterboxed to it
+    YOLO_DECODE_THREADS = int(os.getenv("YOLO_DECODE_THREADS", "4"))  # threads reading and resizing images
+    YOLO_PREFETCH_BATCHES = int(os.getenv("YOLO_PREFETCH_BATCHES", "2"))  # decoded batches queued ahead; 0 = decode inline
+    YOLO_WORKERS = int(os.getenv("YOLO_WORKERS", "1"))  # model processes; 1 = in-process
+    YOLO_THREADS_PER_WORKER = int(os.getenv("YOLO_THREADS_PER_WORKER", "0"))  # 0 = CPU count / YOLO_WORKERS
     
     # API Configuration
     API_HOST = os.getenv("API_HOST", "0.0.0.0")
@@ -1,5 +1,6 @@
 """Image enrichment module with YOLO object detection."""
 
 from .yolo_enrichment import YoloEnrichment
+from .image_ledger import ProcessedImageLedger
 
-__all__ = ['YoloEnrichment']
+__all__ = ['YoloEnrichment', 'ProcessedImageLedger']
@@ -0,0 +1,193 @@
+"""Record of which images have been run through which detection model."""
+
+import logging
+from typing import Dict, Any, List, Tuple
+
+import pandas as pd
+from sqlalchemy import text
+
+from src.utils import DatabaseManager
+
+logger = logging.getLogger(__name__)
+
+LEDGER_TABLE = 'raw.processed_images'
+
+class ProcessedImageLedger:
+    """
+    Tracks enriched images in raw.processed_images.
+
+    Each (image_path, channel_name, date) image record keeps the checksum
+    of the content it was run on and the model version that ran. A record
+    is pending when it is new, its content changed, or it was processed by
+    a different model version. Its detections are then replaced rather
+    than appended.
+    """
+
+    def __init__(self, db_manager: DatabaseManager, model_version: str):
+        self.db_manager = db_manager
+        self.model_version = model_version
+        self._entries: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+        self._load()
+
+    def _load(self):
+        """Read every ledger entry in one query."""
+        try:
+            with self.db_manager.engine.connect() as conn:
+                rows = conn.execute(text(
+                    f"SELECT image_path, channel_name, date, checksum, model_version FROM {LEDGER_TABLE}"
+                )).mappings().all()
+            self._entries = {
+                (row['image_path'], row['channel_name'], str(row['date'])): dict(row)
+                for row in rows
+            }
+            logger.info(f"Processed-image ledger has {len(self._entries)} images")
+        except Exception as e:
+            logger.error(f"Failed to read processed-image ledger {LEDGER_TABLE}: {e}")
+            raise
+
+    @staticmethod
+    def _key(record: Dict[str, Any]) -> Tuple[str, str, str]:
+        return record['image_path'], record['channel_name'], str(record['date'])
+
+    def pending(self, image_records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Keep the image records that need detection with the current model.
+
+        Args:
+            image_records: Records with image_path, channel_name, date and checksum
+
+        Returns:
+            The records that are new, changed or processed by another model version
+        """
+        pending = []
+        for record in image_records:
+            entry = self._entries.get(self._key(record))
+            if (
+                entry is None
+                or entry['model_version'] != self.model_version
+                or entry['checksum'] != record.get('checksum')
+            ):
+                pending.append(record)
+        logger.info(
+            f"{len(pending)} of {len(image_records)} images need detection "
+            f"with model {self.model_version}"
+        )
+        return pending
+
+    def _insert_detections(self, conn, detections: List[Dict[str, Any]]):
+        """
+        Insert detection rows inside the caller's transaction.
+
+        Uses COPY like DatabaseManager.bulk_insert_dataframe, unless
+        DB_LOAD_METHOD is 'insert' or the database is not PostgreSQL.
+        """
+        columns = list(detections[0])
+        if self.db_manager.config.DB_LOAD_METHOD == 'copy' and conn.dialect.name == 'postgresql':
+            cursor = conn.connection.cursor()
+            try:
+                self.db_manager.copy_rows(
+                    (tuple(detection[column] for column in columns) for detection in detections),
+                    columns,
+                    'image_detections',
+                    schema='raw',
+                    cursor=cursor
+                )
+            finally:
+                cursor.close()
+            return
+        pd.DataFrame(detections, columns=columns).to_sql(
+            'image_detections',
+            conn,
+            schema='raw',
+            if_exists='append',
+            index=False,
+            method='multi',
+            chunksize=1000
+        )
+
+    def record(self, image_records: List[Dict[str, Any]], detections: List[Dict[str, Any]]):
+        """
+        Replace the images' detections and mark them processed, in one transaction.
+
+        Detections left by an earlier model version or earlier content are
+        deleted first, so reruns never duplicate rows. Images without any
+        detections are recorded too, so they are not run again.
+
+        Args:
+            image_records: Records that were run through the model
+            detections: Their detection rows for raw.image_detections
+        """
+        if not image_records:
+            return
+
+        # Records of one image differ only in message_id; the ledger keeps one entry
+        entries_by_key = {
+            self._key(record): {
+                'image_path': record['image_path'],
+                'channel_name': record['channel_name'],
+                'date': record['date'],
+                'checksum': record.get('checksum'),
+                'model_version': self.model_version,
+                'detection_count': 0
+            }
+            for record in image_records
+        }
+        keys = list(entries_by_key)
+        entries = list(entries_by_key.values())
+        # An image linked to several messages has its boxes repeated per
+        # message; count the boxes of one message, not the repeats
+        boxes: Dict[Tuple[Tuple[str, str, str], Any], int] = {}
+        for detection in detections:
+            message_key = (self._key(detection), detection.get('message_id'))
+            boxes[message_key] = boxes.get(message_key, 0) + 1
+        counts: Dict[Tuple[str, str, str], int] = {}
+        for (key, _), count in boxes.items():
+            counts[key] = max(counts.get(key, 0), count)
+        for key, entry in zip(keys, entries):
+            entry['detection_count'] = counts.get(key, 0)
+
+        try:
+            with self.db_manager.engine.begin() as conn:
+                deleted = conn.execute(
+                    text("""
+                        DELETE FROM raw.image_detections d
+                        USING unnest(CAST(:paths AS TEXT[]), CAST(:channels AS TEXT[]), CAST(:dates AS DATE[]))
+                            AS stale(image_path, channel_name, date)
+                        WHERE d.image_path = stale.image_path
+                          AND d.channel_name = stale.channel_name
+                          AND d.date = stale.date
+                    """),
+                    {
+                        'paths': [key[0] for key in keys],
+                        'channels': [key[1] for key in keys],
+                        'dates': [key[2] for key in keys]
+                    }
+                ).rowcount
+
+                if detections:
+                    self._insert_detections(conn, detections)
+
+                conn.execute(
+                    text(f"""
+                        INSERT INTO {LEDGER_TABLE}
+                            (image_path, channel_name, date, checksum, model_version, detection_count, processed_at)
+                        VALUES
+                            (:image_path, :channel_name, :date, :checksum, :model_version, :detection_count, CURRENT_TIMESTAMP)
+                        ON CONFLICT (image_path, channel_name, date) DO UPDATE SET
+                            checksum = EXCLUDED.checksum,
+                            model_version = EXCLUDED.model_version,
+                            detection_count = EXCLUDED.detection_count,
+                            processed_at = EXCLUDED.processed_at
+                    """),
+                    entries
+                )
+
+            for key, entry in zip(keys, entries):
+                self._entries[key] = entry
+            logger.info(
+                f"Recorded {len(entries)} processed images: {len(detections)} detections saved, "
+                f"{deleted} stale detections removed"
+            )
+        except Exception as e:
+            logger.error(f"Failed to record processed images in {LEDGER_TABLE}: {e}")
+            raise
@@ -0,0 +1,182 @@
+"""Threaded image decoding that feeds the YOLO model ready batches."""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Padding colour ultralytics uses for its own letterboxing
+LETTERBOX_COLOR = (114, 114, 114)
+
+# Letterbox geometry: (scale ratio, left padding, top padding, original width, original height)
+Letterbox = Tuple[float, int, int, int, int]
+
+# A decoded image ready for the model: (image path, letterboxed image, geometry)
+DecodedImage = Tuple[str, np.ndarray, Letterbox]
+
+class StageTimer:
+    """
+    Accumulates seconds spent per pipeline stage, across threads.
+
+    Decode time is summed over all decode threads, so with prefetching the
+    stage totals add up to more than the wall time; the difference is the
+    work that overlapped.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.seconds: Dict[str, float] = {}
+
+    def add(self, stage: str, seconds: float):
+        with self._lock:
+            self.seconds[stage] = self.seconds.get(stage, 0.0) + seconds
+
+    @contextmanager
+    def time(self, stage: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - started)
+
+    def summary(self) -> str:
+        """Stage totals, the wall time and how much of the work overlapped."""
+        seconds = dict(self.seconds)
+        wall = seconds.pop('wall', 0.0)
+        stages = ', '.join(f"{stage} {value:.2f}s" for stage, value in seconds.items())
+        overlap = seconds.get('decode', 0.0) + seconds.get('model', 0.0) - wall
+        return f"{stages}, wall {wall:.2f}s (overlap {max(overlap, 0.0):.2f}s)"
+
+
+def letterbox(image: np.ndarray, size: int) -> Tuple[np.ndarray, Letterbox]:
+    """
+    Resize an image to fit a size x size square, keeping its aspect ratio,
+    and pad the rest the way ultralytics does.
+
+    Returns:
+        Tuple of the letterboxed image and its geometry, for unscale_box
+    """
+    height, width = image.shape[:2]
+    ratio = min(size / height, size / width)
+    new_width, new_height = round(width * ratio), round(height * ratio)
+    if (new_width, new_height) != (width, height):
+        image = cv2.resize(image, (new_width, new_height), interpolation=cv2.INTER_LINEAR)
+    pad_left = (size - new_width) // 2
+    pad_top = (size - new_height) // 2
+    image = cv2.copyMakeBorder(
+        image,
+        pad_top, size - new_height - pad_top,
+        pad_left, size - new_width - pad_left,
+        cv2.BORDER_CONSTANT,
+        value=LETTERBOX_COLOR
+    )
+    return image, (ratio, pad_left, pad_top, width, height)
+
+
+def unscale_box(xyxy: List[float], geometry: Letterbox) -> List[float]:
+    """Map a box on the letterboxed image back to original image coordinates."""
+    ratio, pad_left, pad_top, width, height = geometry
+    xmin, ymin, xmax, ymax = xyxy
+    return [
+        min(max((xmin - pad_left) / ratio, 0.0), width),
+        min(max((ymin - pad_top) / ratio, 0.0), height),
+        min(max((xmax - pad_left) / ratio, 0.0), width),
+        min(max((ymax - pad_top) / ratio, 0.0), height)
+    ]
+
+
+def decode_image(img_path: str, size: int, timer: StageTimer) -> Optional[DecodedImage]:
+    """Read, decode and letterbox one image; None if it cannot be read."""
+    with timer.time('decode'):
+        image = cv2.imread(img_path)
+        if image is None:
+            logger.error(f"YOLO failed on {img_path}: image could not be read")
+            return None
+        image, geometry = letterbox(image, size)
+    return img_path, image, geometry
+
+
+def iter_decoded_batches(
+    paths: List[str],
+    batch_size: int,
+    size: int,
+    timer: StageTimer,
+    threads: int = 4,
+    prefetch_batches: int = 2
+) -> Iterator[List[DecodedImage]]:
+    """
+    Yield batches of decoded images, decoding ahead of the consumer.
+
+    A producer thread decodes each batch on a pool of `threads` threads and
+    puts it on a queue holding at most `prefetch_batches` batches, so images
+    are read and resized while the model runs on the previous batch. With
+    `prefetch_batches` 0 the images are decoded in the caller's thread,
+    batch by batch. Unreadable images are left out of their batch.
+
+    Args:
+        paths: Image files, in order
+        batch_size: Images per batch
+        size: Letterbox size (the model's input size)
+        timer: Receives `decode`, `decode_blocked` (producer waiting for
+               queue space) and `model_waiting` (consumer waiting for a batch)
+        threads: Decode threads
+        prefetch_batches: Queue depth in batches
+    """
+    batches = [paths[start:start + batch_size] for start in range(0, len(paths), batch_size)]
+
+    if prefetch_batches <= 0:
+        for batch_paths in batches:
+            yield [item for item in (decode_image(path, size, timer) for path in batch_paths) if item]
+        return
+
+    ready: queue.Queue = queue.Queue(maxsize=prefetch_batches)
+    stop = threading.Event()
+    done = object()
+
+    def put(item) -> bool:
+        # Wait for queue space, giving up if the consumer stopped
+        started = time.perf_counter()
+        while not stop.is_set():
+            try:
+                ready.put(item, timeout=0.1)
+                timer.add('decode_blocked', time.perf_counter() - started)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, threads), thread_name_prefix='yolo-decode') as pool:
+                for batch_paths in batches:
+                    decoded = pool.map(lambda path: decode_image(path, size, timer), batch_paths)
+                    if not put([item for item in decoded if item]):
+                        return
+        except Exception as e:
+            put(e)
+            return
+        put(done)
+
+    producer = threading.Thread(target=produce, name='yolo-prefetch', daemon=True)
+    producer.start()
+    try:
+        while True:
+            started = time.perf_counter()
+            item = ready.get()
+            timer.add('model_waiting', time.perf_counter() - started)
+            if item is done:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        producer.join()
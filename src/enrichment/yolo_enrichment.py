@@ -2,85 +2,351 @@
 
 import os
 import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Dict, Any
-import pandas as pd
-from ultralytics import YOLO
+from typing import List, Dict, Any, Iterator, Optional, Set, Tuple
+from ultralytics import YOLO, __version__ as ULTRALYTICS_VERSION
 from datetime import datetime
 
 from src.config import Config
 from src.utils import DatabaseManager
+from src.enrichment.image_ledger import ProcessedImageLedger
+from src.enrichment.image_pipeline import (
+    DecodedImage,
+    Letterbox,
+    StageTimer,
+    iter_decoded_batches,
+    unscale_box
+)
+from src.scraping.lake_catalog import IMAGE, LakeCatalog
+from src.scraping.lake_io import scan_file
+from src.scraping.media_store import MediaStore
 
 logger = logging.getLogger(__name__)
 
+# Images detected between ledger commits, so an interrupted run keeps its progress
+LEDGER_CHUNK_IMAGES = 1024
+
+# Batches per shard handed to a worker process in sharded mode
+SHARD_BATCHES = 4
+
+# Enricher of the current worker process, set up once by _init_yolo_worker
+_worker_enricher: Optional['YoloEnrichment'] = None
+
+def _init_yolo_worker(config: Config, threads: int, log_level: int):
+    """Give a YOLO worker process its own model, limited to `threads` CPU threads."""
+    global _worker_enricher
+    logging.basicConfig(
+        level=log_level,
+        format='%(asctime)s - %(processName)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    import torch
+    torch.set_num_threads(threads)
+    _worker_enricher = YoloEnrichment(config, db_manager=None)
+
+def _detect_in_worker(image_records: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Set[str]]:
+    """Run YOLO on one shard in a worker process (see YoloEnrichment._detect)."""
+    return _worker_enricher._detect(image_records)
+
 class YoloEnrichment:
     """YOLOv8-based object detection for Telegram images."""
     def __init__(self, config: Config, db_manager: DatabaseManager):
         self.config = config
         self.db_manager = db_manager
-        self.model = YOLO('yolov8n.pt')  # Use the nano model for speed
+        self.model = YOLO(self.config.YOLO_MODEL)
+        self.model_version = self._model_version()
+
+    def _model_version(self) -> str:
+        """
+        Identify the detection model, for the processed-image ledger.
+
+        Config.YOLO_MODEL_VERSION wins if set; otherwise the weights file
+        name and content hash and the ultralytics version are combined, so
+        swapping weights or upgrading ultralytics reprocesses the images.
+        """
+        if self.config.YOLO_MODEL_VERSION:
+            return self.config.YOLO_MODEL_VERSION
+        weights = Path(getattr(self.model, 'ckpt_path', None) or self.config.YOLO_MODEL)
+        digest = scan_file(weights)[0][:12] if weights.is_file() else 'unknown'
+        return f"{weights.name}:{digest}:ultralytics-{ULTRALYTICS_VERSION}"
 
     def scan_images(self, date_folder: str = None) -> List[Dict[str, Any]]:
-        """Scan the data lake for new images to process."""
-        images_root = Path(self.config.DATA_LAKE_PATH) / 'images'
-        image_records = []
-        for channel_dir in images_root.iterdir():
-            if not channel_dir.is_dir():
-                continue
-            for date_dir in channel_dir.iterdir():
-                if not date_dir.is_dir():
-                    continue
-                if date_folder and date_dir.name != date_folder:
-                    continue
-                for img_file in date_dir.glob('*.jpg'):
-                    image_records.append({
-                        'channel_name': channel_dir.name,
-                        'date': date_dir.name,
-                        'image_path': str(img_file)
-                    })
+        """
+        Look up the images to process in the lake catalog.
+
+        A content-addressed image reposted by a channel on the same day has
+        one catalog entry; it is expanded into one record per message from
+        the media index, so every detection row names its message. Images in
+        the dated layout are one file per message and carry no message_id.
+        """
+        message_ids = self._content_message_ids(date_folder)
+        catalog = LakeCatalog(self.config.DATA_LAKE_PATH)
+        try:
+            image_records = []
+            for entry in catalog.iter_files(IMAGE, date_folder):
+                record = {
+                    'channel_name': entry['channel_name'],
+                    'date': entry['date'],
+                    'image_path': str(Path(self.config.DATA_LAKE_PATH) / entry['path']),
+                    'checksum': entry['checksum']
+                }
+                key = (entry['path'], entry['channel_name'], entry['date'])
+                for message_id in message_ids.get(key, [None]):
+                    image_records.append({**record, 'message_id': message_id})
+        finally:
+            catalog.close()
         logger.info(f"Found {len(image_records)} images to process.")
         return image_records
 
+    def _content_message_ids(self, date_folder: str = None) -> Dict[Tuple[str, str, str], List[int]]:
+        """Messages showing each content-addressed image, keyed by (path, channel_name, date)."""
+        if not (Path(self.config.DATA_LAKE_PATH) / 'images' / 'media_index.sqlite').exists():
+            return {}
+        message_ids: Dict[Tuple[str, str, str], List[int]] = {}
+        media_store = MediaStore(self.config.DATA_LAKE_PATH)
+        try:
+            for link in media_store.iter_links(date_folder):
+                key = (link['path'], link['channel_name'], link['date'])
+                message_ids.setdefault(key, []).append(link['message_id'])
+        finally:
+            media_store.close()
+        return message_ids
+
     def run_yolo_on_images(self, image_records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Run YOLOv8 on each image and collect detection results."""
-        detections = []
+        """
+        Run YOLOv8 on the images in batches and collect detection results.
+
+        Records sharing an image_path (the same content-addressed image posted
+        by several channels or on several days) are detected once and the
+        boxes are copied to every record. Images are decoded and letterboxed
+        here and passed to the model Config.YOLO_BATCH_SIZE at a time, since
+        ultralytics only batches in-memory images; file paths would be
+        inferred one by one. Decoding runs on Config.YOLO_DECODE_THREADS
+        threads up to Config.YOLO_PREFETCH_BATCHES batches ahead of the model.
+        """
+        return self._detect(image_records)[0]
+
+    def _detect(self, image_records: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Set[str]]:
+        """
+        Run YOLOv8 on the images in batches.
+
+        Returns:
+            Tuple of the detection rows and the image paths the model ran on;
+            unreadable or failed images are left out of the latter
+        """
+        records_by_path: Dict[str, List[Dict[str, Any]]] = {}
         for record in image_records:
-            img_path = record['image_path']
-            try:
-                results = self.model(img_path)
-                for r in results:
-                    for box in r.boxes:
-                        detections.append({
-                            'channel_name': record['channel_name'],
-                            'date': record['date'],
-                            'image_path': img_path,
-                            'detected_object_class': self.model.names[int(box.cls)],
-                            'confidence_score': float(box.conf),
-                            'bbox_xmin': float(box.xyxy[0][0]),
-                            'bbox_ymin': float(box.xyxy[0][1]),
-                            'bbox_xmax': float(box.xyxy[0][2]),
-                            'bbox_ymax': float(box.xyxy[0][3]),
-                            'detected_at': datetime.now()
-                        })
-            except Exception as e:
-                logger.error(f"YOLO failed on {img_path}: {e}")
+            records_by_path.setdefault(record['image_path'], []).append(record)
+
+        timer = StageTimer()
+        detections = []
+        processed = set()
+        with timer.time('wall'):
+            batches = iter_decoded_batches(
+                list(records_by_path),
+                batch_size=max(1, self.config.YOLO_BATCH_SIZE),
+                size=self.config.YOLO_IMAGE_SIZE,
+                timer=timer,
+                threads=self.config.YOLO_DECODE_THREADS,
+                prefetch_batches=self.config.YOLO_PREFETCH_BATCHES
+            )
+            for batch in batches:
+                with timer.time('model'):
+                    predictions = self._predict_batch(batch)
+                for (img_path, _, geometry), result in predictions:
+                    processed.add(img_path)
+                    detections.extend(
+                        self._result_detections(result, records_by_path[img_path], img_path, geometry)
+                    )
         logger.info(f"Detected {len(detections)} objects in images.")
+        logger.info(f"YOLO stage times: {timer.summary()}")
+        return detections, processed
+
+    def _predict_batch(self, batch: List[DecodedImage]) -> List[Tuple[DecodedImage, Any]]:
+        """
+        Run the model on decoded images in one call.
+
+        If the batched call fails, the images are retried one by one so a
+        single bad image only loses its own detections.
+
+        Returns:
+            List of (decoded image, ultralytics result) pairs
+        """
+        if not batch:
+            return []
+        kwargs = {'verbose': False, 'imgsz': self.config.YOLO_IMAGE_SIZE}
+        if self.config.YOLO_DEVICE:
+            kwargs['device'] = self.config.YOLO_DEVICE
+        try:
+            results = self.model([image for _, image, _ in batch], **kwargs)
+            return list(zip(batch, results))
+        except Exception as e:
+            if len(batch) == 1:
+                logger.error(f"YOLO failed on {batch[0][0]}: {e}")
+                return []
+            logger.warning(f"YOLO batch of {len(batch)} images failed, retrying one by one: {e}")
+            return [pair for item in batch for pair in self._predict_batch([item])]
+
+    def _result_detections(
+        self,
+        result: Any,
+        records: List[Dict[str, Any]],
+        img_path: str,
+        geometry: Letterbox
+    ) -> List[Dict[str, Any]]:
+        """
+        Turn one image's boxes into detection rows, one per record showing the image.
+
+        Boxes come back on the letterboxed image and are mapped to the
+        original image's pixel coordinates.
+        """
+        boxes = result.boxes
+        detected_at = datetime.now()
+        detections = []
+        for xyxy, cls, conf in zip(boxes.xyxy.tolist(), boxes.cls.tolist(), boxes.conf.tolist()):
+            xyxy = unscale_box(xyxy, geometry)
+            for record in records:
+                detections.append({
+                    'channel_name': record['channel_name'],
+                    'date': record['date'],
+                    'message_id': record.get('message_id'),
+                    'image_path': img_path,
+                    'detected_object_class': self.model.names[int(cls)],
+                    'confidence_score': float(conf),
+                    'bbox_xmin': float(xyxy[0]),
+                    'bbox_ymin': float(xyxy[1]),
+                    'bbox_xmax': float(xyxy[2]),
+                    'bbox_ymax': float(xyxy[3]),
+                    'detected_at': detected_at
+                })
         return detections
 
-    def save_detections_to_db(self, detections: List[Dict[str, Any]]):
-        """Save detection results to the database."""
-        if not detections:
-            logger.warning("No detections to save.")
-            return
-        df = pd.DataFrame(detections)
-        self.db_manager.bulk_insert_dataframe(df, 'image_detections', schema='raw')
-        logger.info(f"Saved {len(df)} detections to the database.")
+    def enrich(
+        self,
+        date_folder: str = None,
+        reprocess_all: bool = False,
+        workers: Optional[int] = None,
+        threads_per_worker: Optional[int] = None
+    ):
+        """
+        Full enrichment pipeline: scan, detect, save.
+
+        Only images that are new, changed, or were processed by another
+        model version are run, according to the processed-image ledger.
+        Their detections replace any earlier ones, and the ledger is
+        committed every LEDGER_CHUNK_IMAGES images. Images that could not
+        be read or failed in the model stay pending for the next run.
+
+        With more than one worker, the images are split into shards that
+        a pool of processes runs, each with its own model instance. This
+        process stays the only database writer: it records the detections
+        of each finished shard.
+
+        Args:
+            date_folder: Only enrich images from this date (YYYY-MM-DD)
+            reprocess_all: Ignore the ledger and run every image again
+            workers: Worker processes; defaults to Config.YOLO_WORKERS,
+                     1 runs the model in this process
+            threads_per_worker: CPU threads per worker's model; defaults to
+                                Config.YOLO_THREADS_PER_WORKER, or the CPU
+                                count split evenly across the workers if 0
+
+        Raises:
+            RuntimeError: If a worker failed; the other shards are saved
+        """
+        workers = workers or self.config.YOLO_WORKERS
+        threads_per_worker = (
+            threads_per_worker
+            or self.config.YOLO_THREADS_PER_WORKER
+            or max(1, (os.cpu_count() or 1) // max(1, workers))
+        )
 
-    def enrich(self, date_folder: str = None):
-        """Full enrichment pipeline: scan, detect, save."""
         images = self.scan_images(date_folder)
-        detections = self.run_yolo_on_images(images)
-        self.save_detections_to_db(detections)
+        ledger = ProcessedImageLedger(self.db_manager, self.model_version)
+        if not reprocess_all:
+            images = ledger.pending(images)
+
+        done_records: List[Dict[str, Any]] = []
+        done_detections: List[Dict[str, Any]] = []
+        failed_shards = 0
+        for shard, result in self._iter_shard_detections(images, workers, threads_per_worker):
+            if isinstance(result, Exception):
+                failed_shards += 1
+                continue
+            detections, processed = result
+            done_records.extend(record for record in shard if record['image_path'] in processed)
+            done_detections.extend(detections)
+            if len(done_records) >= LEDGER_CHUNK_IMAGES:
+                ledger.record(done_records, done_detections)
+                done_records, done_detections = [], []
+        ledger.record(done_records, done_detections)
+
+        if failed_shards:
+            raise RuntimeError(f"{failed_shards} YOLO worker shards failed; their images stay pending")
+
+    @staticmethod
+    def _shards(image_records: List[Dict[str, Any]], shard_size: int) -> List[List[Dict[str, Any]]]:
+        """
+        Split image records into shards of about `shard_size` images.
+
+        All records of one image_path go to the same shard, so each image
+        is detected once.
+        """
+        records_by_path: Dict[str, List[Dict[str, Any]]] = {}
+        for record in image_records:
+            records_by_path.setdefault(record['image_path'], []).append(record)
+
+        shards, shard, shard_images = [], [], 0
+        for records in records_by_path.values():
+            shard.extend(records)
+            shard_images += 1
+            if shard_images >= shard_size:
+                shards.append(shard)
+                shard, shard_images = [], 0
+        if shard:
+            shards.append(shard)
+        return shards
+
+    def _iter_shard_detections(
+        self,
+        image_records: List[Dict[str, Any]],
+        workers: int,
+        threads_per_worker: int
+    ) -> Iterator[Tuple[List[Dict[str, Any]], Any]]:
+        """
+        Detect objects in-process or across a process pool, yielding shards as they finish.
+
+        Worker processes are spawned rather than forked, so none of them
+        inherits this process's engine or model. A failed shard is yielded
+        with its exception instead of a (detections, processed) result.
+        """
+        if workers <= 1:
+            for shard in self._shards(image_records, LEDGER_CHUNK_IMAGES):
+                yield shard, self._detect(shard)
+            return
+
+        shards = self._shards(image_records, max(1, self.config.YOLO_BATCH_SIZE) * SHARD_BATCHES)
+        if not shards:
+            return
+        logger.info(
+            f"Running YOLO on {len(image_records)} image records in {len(shards)} shards "
+            f"across {workers} processes with {threads_per_worker} threads each"
+        )
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(shards)),
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_yolo_worker,
+            initargs=(self.config, threads_per_worker, logging.getLogger().level)
+        ) as executor:
+            futures = {executor.submit(_detect_in_worker, shard): shard for shard in shards}
+            for future in as_completed(futures):
+                try:
+                    yield futures[future], future.result()
+                except Exception as e:
+                    # The worker process itself failed, e.g. it could not load the model
+                    logger.error(f"YOLO shard of {len(futures[future])} images failed: {e}")
+                    yield futures[future], e
 
 
 def main():
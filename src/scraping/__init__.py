@@ -2,5 +2,14 @@
 
 from .telegram_scraper import TelegramScraper, run_telegram_scraper
 from .data_loader import DataLakeLoader
+from .checkpoints import CheckpointStore
+from .entity_cache import EntityCache
+from .lake_catalog import LakeCatalog
+from .media_store import MediaStore
+from .metrics import ScraperMetrics
+from .session_pool import TelegramSession, TelegramSessionPool
 
-__all__ = ['TelegramScraper', 'run_telegram_scraper', 'DataLakeLoader']
+__all__ = [
+    'TelegramScraper', 'run_telegram_scraper', 'DataLakeLoader', 'CheckpointStore',
+    'EntityCache', 'LakeCatalog', 'MediaStore', 'ScraperMetrics', 'TelegramSession', 'TelegramSessionPool'
+]
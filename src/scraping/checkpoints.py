@@ -0,0 +1,113 @@
+"""Persisted per-channel high-water marks for incremental scraping and backfills."""
+
+import json
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+class CheckpointStore:
+    """
+    Records scraping progress per channel in a JSON file.
+
+    Each channel keeps the highest message_id scraped by incremental runs
+    and, for backfills, the progress of every date window.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._checkpoints: Dict[str, Dict[str, Any]] = {}
+        self._load()
+
+    def _load(self):
+        """Load checkpoints from disk if the file exists."""
+        if not self.path.exists():
+            return
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._checkpoints = json.load(f)
+            logger.info(f"Loaded checkpoints for {len(self._checkpoints)} channels from {self.path}")
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to read checkpoint file {self.path}, starting fresh: {e}")
+            self._checkpoints = {}
+
+    def save(self):
+        """Atomically write checkpoints to disk."""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._checkpoints, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.error(f"Failed to save checkpoints to {self.path}: {e}")
+            raise
+
+    def get(self, channel_name: str) -> int:
+        """Return the highest scraped message_id for a channel, or 0 if none."""
+        return self._checkpoints.get(channel_name, {}).get('last_message_id', 0)
+
+    def update(self, channel_name: str, last_message_id: Optional[int]):
+        """Advance a channel's high-water mark; it never moves backwards."""
+        if not last_message_id or last_message_id <= self.get(channel_name):
+            return
+
+        self._checkpoints.setdefault(channel_name, {}).update({
+            'last_message_id': int(last_message_id),
+            'updated_at': datetime.now().isoformat()
+        })
+        self.save()
+        logger.info(f"Checkpoint for {channel_name} advanced to message {last_message_id}")
+
+    def get_window(self, channel_name: str, window_key: str) -> Dict[str, Any]:
+        """
+        Return the progress of one backfill window.
+
+        Returns:
+            Dictionary with `resume_after` (oldest message_id persisted so far,
+            or None) and `done`; empty if the window has not been started
+        """
+        return self._checkpoints.get(channel_name, {}).get('backfill_windows', {}).get(window_key, {})
+
+    def update_window(
+        self,
+        channel_name: str,
+        window_key: str,
+        resume_after: Optional[int] = None,
+        done: bool = False
+    ):
+        """
+        Record backfill progress for a window.
+
+        Args:
+            channel_name: Channel being backfilled
+            window_key: Identifier of the date window
+            resume_after: Oldest message_id persisted; a restart continues below it
+            done: Whether the whole window has been persisted
+        """
+        windows = self._checkpoints.setdefault(channel_name, {}).setdefault('backfill_windows', {})
+        window = windows.setdefault(window_key, {'resume_after': None, 'done': False})
+        if resume_after:
+            window['resume_after'] = int(resume_after)
+        window['done'] = window['done'] or done
+        window['updated_at'] = datetime.now().isoformat()
+        self.save()
+
+    def reset(self, channel_name: Optional[str] = None):
+        """
+        Forget high-water marks so the next run backfills.
+
+        Args:
+            channel_name: Channel to reset. If None, resets all channels
+        """
+        if channel_name:
+            self._checkpoints.pop(channel_name, None)
+            logger.info(f"Reset checkpoint for {channel_name}")
+        else:
+            self._checkpoints = {}
+            logger.info("Reset all channel checkpoints")
+        self.save()
@@ -1,17 +1,50 @@
-"""Data loader for loading raw JSON files into PostgreSQL database."""
+"""Data loader for loading raw JSON/NDJSON files into PostgreSQL database."""
 
-import json
 import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Dict, Any
-import pandas as pd
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from datetime import datetime
 
 from src.config import Config
 from src.utils import DatabaseManager
+from src.scraping.lake_catalog import MESSAGES, LakeCatalog
+from src.scraping.load_manifest import CHANGED, UNCHANGED, LoadManifest
+from src.scraping.lake_io import (
+    iter_lake_records,
+    iter_record_batches,
+    list_lake_files
+)
+from src.scraping.parquet_lake import (
+    MESSAGE_COLUMNS,
+    PARQUET_DATASET_DIR,
+    RAW_DATA_COLUMNS,
+    iter_parquet_batches,
+    table_rows_to_records
+)
 
 logger = logging.getLogger(__name__)
 
+# Columns loaded into raw.telegram_messages, in row order
+LOAD_COLUMNS = MESSAGE_COLUMNS + ['raw_data']
+
+# Loader of the current worker process, set up once by _init_load_worker
+_worker_loader: Optional['DataLakeLoader'] = None
+
+def _init_load_worker(config: Config, log_level: int):
+    """Give a loader worker process its own DatabaseManager and connection pool."""
+    global _worker_loader
+    logging.basicConfig(
+        level=log_level,
+        format='%(asctime)s - %(processName)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    _worker_loader = DataLakeLoader(config, DatabaseManager(config))
+
+def _load_file_in_worker(json_file: str, known_checksum: Optional[str], reload_all: bool) -> Dict[str, Any]:
+    """Load one lake file in a worker process (see DataLakeLoader._load_lake_file)."""
+    return _worker_loader._load_lake_file(Path(json_file), known_checksum, reload_all)
+
 class DataLakeLoader:
     """Loads data from the data lake into the database."""
     
@@ -19,20 +52,43 @@ class DataLakeLoader:
         self.config = config
         self.db_manager = db_manager
     
-    def load_json_files_to_db(self, date_folder: str = None):
+    def load_json_files_to_db(
+        self,
+        date_folder: str = None,
+        reload_all: bool = False,
+        workers: Optional[int] = None
+    ) -> Dict[str, Any]:
         """
         Load JSON files from data lake into database.
         
+        Files recorded in the load manifest with the same size, mtime and
+        checksum are skipped, so a run only does work for new or changed
+        files. Changed files are reloaded with an upsert, whatever LOAD_MODE
+        says, since their earlier rows are already in the table.
+        
+        With more than one worker, files are parsed and loaded in a pool of
+        processes, each with its own database connection pool. This process
+        stays the coordinator: it decides which files need loading, collects
+        the per-file results and is the only writer of the manifest.
+        
         Args:
             date_folder: Specific date folder to load (YYYY-MM-DD format)
                         If None, loads all available data
+            reload_all: Ignore the manifest and load every file
+            workers: Loader processes (default: Config.LOAD_WORKERS; 1 loads in-process)
+            
+        Returns:
+            Dictionary with total `rows`, `files_loaded`, `files_skipped`
+            and `errors` mapping failed file paths to their error
         """
+        summary = {'rows': 0, 'files_loaded': 0, 'files_skipped': 0, 'errors': {}}
+        
         data_lake_path = Path(self.config.DATA_LAKE_PATH)
         telegram_messages_path = data_lake_path / 'telegram_messages'
         
         if not telegram_messages_path.exists():
             logger.warning(f"Data lake path does not exist: {telegram_messages_path}")
-            return
+            return summary
         
         # Determine which date folders to process
         if date_folder:
@@ -40,112 +96,249 @@ class DataLakeLoader:
         else:
             date_folders = [d for d in telegram_messages_path.iterdir() if d.is_dir()]
         
-        total_loaded = 0
+        self._ensure_partitions(date_folders)
+        manifest = LoadManifest(self.db_manager, self.config.DATA_LAKE_PATH)
         
+        # Files that may need loading, with the checksum they were last loaded at
+        pending = []
         for folder in date_folders:
             if not folder.exists():
                 logger.warning(f"Date folder does not exist: {folder}")
                 continue
-                
-            logger.info(f"Processing date folder: {folder.name}")
             
-            # Process all JSON files in the date folder
-            json_files = list(folder.glob('*.json'))
+            # Process all JSON/NDJSON files in the date folder
+            for json_file in list_lake_files(folder):
+                if not reload_all and manifest.is_unchanged(json_file):
+                    summary['files_skipped'] += 1
+                    continue
+                entry = manifest.entry(json_file)
+                pending.append((json_file, entry['checksum'] if entry else None))
+        
+        workers = workers or self.config.LOAD_WORKERS
+        logger.info(
+            f"Loading {len(pending)} lake files with {workers} worker(s) "
+            f"({summary['files_skipped']} unchanged files skipped)"
+        )
+        
+        for result in self._iter_file_loads(pending, reload_all, workers):
+            json_file = Path(result['path'])
+            if result['error']:
+                summary['errors'][str(json_file)] = result['error']
+                logger.error(f"Failed to load {json_file}: {result['error']}")
+                continue
+            
+            try:
+                if result['status'] == UNCHANGED and not reload_all:
+                    # Only the timestamp moved; refresh the entry without loading
+                    manifest.record(json_file, result['state'])
+                    summary['files_skipped'] += 1
+                    continue
+                
+                manifest.record(json_file, result['state'], result['rows'])
+            except Exception as e:
+                summary['errors'][str(json_file)] = str(e)
+                continue
             
-            for json_file in json_files:
+            summary['rows'] += result['rows']
+            summary['files_loaded'] += 1
+            logger.info(f"Loaded {result['rows']} messages from {json_file.name} ({result['status']})")
+        
+        logger.info(
+            f"Total messages loaded: {summary['rows']} from {summary['files_loaded']} files "
+            f"({summary['files_skipped']} unchanged files skipped, {len(summary['errors'])} failed)"
+        )
+        return summary
+    
+    def _ensure_partitions(self, date_folders: List[Path]):
+        """Create the monthly message partitions spanned by the date folders being loaded."""
+        dates = []
+        for folder in date_folders:
+            try:
+                dates.append(datetime.strptime(folder.name, '%Y-%m-%d').date())
+            except ValueError:
+                continue
+        if dates:
+            self.db_manager.ensure_message_partitions(min(dates), max(dates))
+    
+    def _iter_file_loads(
+        self,
+        pending: List[Tuple[Path, Optional[str]]],
+        reload_all: bool,
+        workers: int
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Load files in-process or across a process pool, yielding results as they finish.
+        
+        Worker processes are spawned rather than forked, so none of them
+        inherits this process's engine or its open connections.
+        """
+        if workers <= 1 or len(pending) <= 1:
+            for json_file, known_checksum in pending:
+                yield self._load_lake_file(json_file, known_checksum, reload_all)
+            return
+        
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(pending)),
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_load_worker,
+            initargs=(self.config, logging.getLogger().level)
+        ) as executor:
+            futures = {
+                executor.submit(_load_file_in_worker, str(json_file), known_checksum, reload_all): json_file
+                for json_file, known_checksum in pending
+            }
+            for future in as_completed(futures):
                 try:
-                    messages_loaded = self._load_json_file(json_file)
-                    total_loaded += messages_loaded
-                    logger.info(f"Loaded {messages_loaded} messages from {json_file.name}")
-                    
+                    yield future.result()
                 except Exception as e:
-                    logger.error(f"Failed to load {json_file}: {e}")
-                    continue
+                    # The worker process itself failed, e.g. it could not connect
+                    yield {'path': str(futures[future]), 'error': str(e)}
+    
+    def _load_lake_file(
+        self,
+        json_file: Path,
+        known_checksum: Optional[str] = None,
+        reload_all: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Load one lake file unless its contents were already loaded.
+        
+        The file is hashed before it is read, so records appended while it
+        loads are picked up as a change on the next run. Errors are returned
+        rather than raised, for the coordinator to collect.
         
-        logger.info(f"Total messages loaded: {total_loaded}")
+        Args:
+            json_file: Lake file to load
+            known_checksum: Checksum in the file's manifest entry, if any
+            reload_all: Load the file even if its checksum is unchanged
+            
+        Returns:
+            Dictionary with `path`, `status`, `state` (for LoadManifest.record),
+            `rows` loaded and `error`
+        """
+        result = {'path': str(json_file), 'status': None, 'state': None, 'rows': 0, 'error': None}
+        try:
+            result['state'] = LoadManifest.file_state(json_file)
+            result['status'] = LoadManifest.classify(result['state'], known_checksum)
+            if result['status'] == UNCHANGED and not reload_all:
+                return result
+            
+            result['rows'] = self._load_json_file(
+                json_file,
+                mode='upsert' if result['status'] == CHANGED or reload_all else None
+            )
+        except Exception as e:
+            result['error'] = str(e)
+        return result
     
-    def _load_json_file(self, json_file_path: Path) -> int:
-        """Load a single JSON file into the database."""
+    def _load_json_file(self, json_file_path: Path, mode: Optional[str] = None) -> int:
+        """
+        Load a single JSON or NDJSON file into the database.
+        
+        Records are inserted in batches of Config.LOAD_BATCH_SIZE. NDJSON
+        files are read line by line and legacy JSON arrays element by
+        element, so memory stays flat for large files.
+        
+        Args:
+            json_file_path: Lake file to load
+            mode: Load mode passed to DatabaseManager.load_message_rows
+        """
         try:
-            with open(json_file_path, 'r', encoding='utf-8') as f:
-                messages_data = json.load(f)
+            total_rows = 0
+            for batch in iter_record_batches(
+                iter_lake_records(json_file_path),
+                self.config.LOAD_BATCH_SIZE
+            ):
+                total_rows += self._insert_messages(batch, mode=mode)
             
-            if not messages_data:
+            if not total_rows:
                 logger.warning(f"No data found in {json_file_path}")
-                return 0
             
-            # Convert to DataFrame
-            df = pd.DataFrame(messages_data)
-            
-            # Ensure proper data types
-            df['date'] = pd.to_datetime(df['date'])
-            df['scraped_at'] = pd.to_datetime(df['scraped_at'])
-            
-            # Convert raw_data dict to JSON string if it's not already
-            if 'raw_data' in df.columns:
-                df['raw_data'] = df['raw_data'].apply(
-                    lambda x: json.dumps(x) if isinstance(x, dict) else x
-                )
-            
-            # Insert into database
-            self.db_manager.bulk_insert_dataframe(
-                df, 
-                'telegram_messages', 
-                schema='raw'
-            )
-            
-            return len(df)
+            return total_rows
             
         except Exception as e:
             logger.error(f"Error loading JSON file {json_file_path}: {e}")
             raise
     
-    def get_data_lake_summary(self) -> Dict[str, Any]:
-        """Get summary of data in the data lake."""
-        data_lake_path = Path(self.config.DATA_LAKE_PATH)
-        telegram_messages_path = data_lake_path / 'telegram_messages'
+    def _insert_messages(self, messages_data: List[Dict[str, Any]], mode: Optional[str] = None) -> int:
+        """
+        Insert one batch of message records into raw.telegram_messages.
         
-        summary = {
-            'total_date_folders': 0,
-            'total_json_files': 0,
-            'date_folders': [],
-            'channels': set(),
-            'date_range': {'earliest': None, 'latest': None}
-        }
+        Records are turned into row tuples and streamed to the database
+        writer as they are encoded, without a DataFrame in between.
+        """
+        rows = (
+            tuple(record.get(column) for column in LOAD_COLUMNS)
+            for record in messages_data
+        )
         
-        if not telegram_messages_path.exists():
-            return summary
+        # Insert into database, merging messages loaded before
+        self.db_manager.load_message_rows(rows, LOAD_COLUMNS, mode=mode)
         
-        date_folders = [d for d in telegram_messages_path.iterdir() if d.is_dir()]
-        summary['total_date_folders'] = len(date_folders)
+        return len(messages_data)
+    
+    def load_parquet_to_db(
+        self,
+        channels: Optional[List[str]] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> int:
+        """
+        Load the partitioned Parquet dataset into the database.
         
-        dates = []
-        for folder in date_folders:
-            date_str = folder.name
-            summary['date_folders'].append(date_str)
-            
-            try:
-                dates.append(datetime.strptime(date_str, '%Y-%m-%d'))
-            except ValueError:
-                continue
-            
-            # Count JSON files and extract channel names
-            json_files = list(folder.glob('*.json'))
-            summary['total_json_files'] += len(json_files)
+        Only the message columns are read, and the channel/date filters are
+        pushed down to the partition directories, so unrelated files are
+        never opened.
+        
+        Args:
+            channels: Only load these channels. If None, loads all channels
+            start_date: First message date to load (YYYY-MM-DD)
+            end_date: Last message date to load (YYYY-MM-DD)
             
-            for json_file in json_files:
-                channel_name = json_file.stem
-                summary['channels'].add(channel_name)
+        Returns:
+            Number of messages loaded
+        """
+        dataset_path = Path(self.config.DATA_LAKE_PATH) / PARQUET_DATASET_DIR
+        if not dataset_path.exists():
+            logger.warning(f"Parquet dataset does not exist: {dataset_path}")
+            return 0
         
-        # Determine date range
-        if dates:
-            summary['date_range']['earliest'] = min(dates).strftime('%Y-%m-%d')
-            summary['date_range']['latest'] = max(dates).strftime('%Y-%m-%d')
+        if start_date and end_date:
+            self.db_manager.ensure_message_partitions(
+                datetime.strptime(start_date, '%Y-%m-%d').date(),
+                datetime.strptime(end_date, '%Y-%m-%d').date()
+            )
         
-        summary['channels'] = list(summary['channels'])
+        total_loaded = 0
+        for rows in iter_parquet_batches(
+            dataset_path,
+            batch_size=self.config.LOAD_BATCH_SIZE,
+            columns=MESSAGE_COLUMNS + RAW_DATA_COLUMNS,
+            channels=channels,
+            start_date=start_date,
+            end_date=end_date
+        ):
+            total_loaded += self._insert_messages(table_rows_to_records(rows))
         
-        return summary
-
+        logger.info(f"Total messages loaded from Parquet: {total_loaded}")
+        return total_loaded
+    
+    def get_data_lake_summary(self) -> Dict[str, Any]:
+        """Get summary of data in the data lake, from the lake catalog."""
+        catalog = LakeCatalog(self.config.DATA_LAKE_PATH)
+        try:
+            messages = catalog.summary(MESSAGES)
+        finally:
+            catalog.close()
+        
+        return {
+            'total_date_folders': len(messages['dates']),
+            'total_json_files': messages['files'],
+            'total_rows': messages['rows'],
+            'date_folders': messages['dates'],
+            'channels': messages['channels'],
+            'date_range': {'earliest': messages['earliest'], 'latest': messages['latest']}
+        }
 
 def main():
     """Main function to load data from data lake to database."""
@@ -167,6 +360,9 @@ def main():
         logger.error("Database connection failed. Exiting.")
         return
     
+    # Create the coming months' partitions and apply retention
+    db_manager.maintain_message_partitions()
+    
     # Initialize data loader
     loader = DataLakeLoader(config, db_manager)
     
@@ -175,7 +371,10 @@ def main():
     logger.info(f"Data lake summary: {summary}")
     
     # Load all data from data lake
-    loader.load_json_files_to_db()
+    if config.LAKE_FORMAT == 'parquet':
+        loader.load_parquet_to_db()
+    else:
+        loader.load_json_files_to_db()
 
 
 if __name__ == "__main__":
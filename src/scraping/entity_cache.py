@@ -0,0 +1,89 @@
+"""On-disk cache of resolved channel ids and access hashes."""
+
+import logging
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS channel_entities (
+    session_name TEXT NOT NULL,
+    username TEXT NOT NULL,
+    channel_id INTEGER NOT NULL,
+    access_hash INTEGER NOT NULL,
+    resolved_at REAL NOT NULL,
+    PRIMARY KEY (session_name, username)
+);
+"""
+
+class EntityCache:
+    """
+    Remembers what channel usernames resolved to, so runs skip get_entity.
+
+    Access hashes are issued per account, so entries are keyed by session
+    name as well as username. Entries older than `ttl_seconds` are ignored,
+    since a username can be handed over to a different channel.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float = 7 * 24 * 3600):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.executescript(CACHE_SCHEMA)
+        self._conn.commit()
+
+    def close(self):
+        """Close the cache connection."""
+        self._conn.close()
+
+    @staticmethod
+    def _key(username: str) -> str:
+        return username.lstrip('@').lower()
+
+    def get(self, session_name: str, username: str) -> Optional[Dict[str, Any]]:
+        """
+        Return a cached resolution if it has not expired.
+
+        Returns:
+            Dictionary with `channel_id` and `access_hash`, or None
+        """
+        row = self._conn.execute(
+            """
+            SELECT channel_id, access_hash, resolved_at FROM channel_entities
+            WHERE session_name = ? AND username = ?
+            """,
+            (session_name, self._key(username))
+        ).fetchone()
+        if row and time.time() - row[2] < self.ttl_seconds:
+            self.hits += 1
+            return {'channel_id': row[0], 'access_hash': row[1]}
+
+        self.misses += 1
+        return None
+
+    def put(self, session_name: str, username: str, channel_id: int, access_hash: int):
+        """Record that a username resolved to a channel for a session's account."""
+        self._conn.execute(
+            """
+            INSERT OR REPLACE INTO channel_entities
+                (session_name, username, channel_id, access_hash, resolved_at)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            (session_name, self._key(username), channel_id, access_hash, time.time())
+        )
+        self._conn.commit()
+
+    def invalidate(self, session_name: str, username: str):
+        """Forget a resolution that Telegram rejected."""
+        self._conn.execute(
+            "DELETE FROM channel_entities WHERE session_name = ? AND username = ?",
+            (session_name, self._key(username))
+        )
+        self._conn.commit()
+        logger.info(f"Invalidated cached entity for {username} on session {session_name}")
@@ -0,0 +1,347 @@
+"""SQLite index of the files and images in the data lake."""
+
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Iterator, Optional, Tuple
+
+from src.scraping.lake_io import (
+    iter_lake_records,
+    lake_file_channel,
+    list_lake_files,
+    scan_file
+)
+from src.scraping.media_store import MediaStore
+
+logger = logging.getLogger(__name__)
+
+CATALOG_FILE = 'lake_catalog.sqlite'
+
+# Kinds of lake entries
+MESSAGES = 'messages'
+ALBUMS = 'albums'
+IMAGE = 'image'
+
+IMAGE_SUFFIXES = {'.jpg', '.jpeg', '.png', '.webp'}
+
+CATALOG_SCHEMA = """
+CREATE TABLE IF NOT EXISTS lake_files (
+    path TEXT NOT NULL,
+    channel_name TEXT NOT NULL,
+    date TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    row_count INTEGER,
+    checksum TEXT,
+    seq INTEGER NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (path, channel_name, date)
+);
+CREATE INDEX IF NOT EXISTS idx_lake_files_kind_date ON lake_files(kind, date);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_lake_files_seq ON lake_files(seq);
+"""
+
+class LakeCatalog:
+    """
+    Records every lake file and image with its channel, date, size, row
+    count and checksum, so consumers query an index instead of walking
+    the lake directories.
+
+    Paths are relative to the data lake root. A content-addressed image
+    posted by several channels or on several days has one entry per
+    (channel, date). Each write takes the next `seq`, which sensors use
+    as a cursor for changes. An empty catalog is filled by walking the
+    lake; files written by other tools are picked up by reconcile().
+    """
+
+    def __init__(self, data_lake_path: str):
+        self.data_lake_path = Path(data_lake_path)
+        self.index_path = self.data_lake_path / CATALOG_FILE
+        self.data_lake_path.mkdir(parents=True, exist_ok=True)
+        self._root = self.data_lake_path.resolve()
+        self._lock = threading.Lock()
+        # Autocommit; writes open their own IMMEDIATE transactions
+        self._conn = sqlite3.connect(
+            str(self.index_path),
+            timeout=30,
+            isolation_level=None,
+            check_same_thread=False
+        )
+        # Scrapers write while loaders and sensors read
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(CATALOG_SCHEMA)
+        # Also covers a catalog whose first rebuild failed part way
+        if self._conn.execute("SELECT 1 FROM lake_files LIMIT 1").fetchone() is None:
+            self.rebuild()
+
+    def close(self):
+        """Close the catalog connection."""
+        self._conn.close()
+
+    def _resolve(self, file_path: Path) -> Tuple[Path, str]:
+        """
+        Absolute path and lake-relative key of a file.
+
+        Relative paths may be relative to the working directory, like
+        `data/raw/images/...`, or to the lake root, like the media store's
+        `images/objects/...`; whichever lands inside the lake is used.
+        """
+        path = Path(file_path)
+        resolved = path.resolve()
+        if not resolved.is_relative_to(self._root) and not path.is_absolute():
+            resolved = (self._root / path).resolve()
+        try:
+            return resolved, resolved.relative_to(self._root).as_posix()
+        except ValueError:
+            raise ValueError(f"{file_path} is outside the data lake {self._root}")
+
+    def record_file(
+        self,
+        file_path: Path,
+        kind: str,
+        channel_name: str,
+        date: str,
+        row_count: Optional[int] = None,
+        checksum: Optional[str] = None
+    ):
+        """
+        Add or refresh a file's entry after it was written.
+
+        Args:
+            file_path: Written file, absolute or relative to the lake root
+            kind: MESSAGES, ALBUMS or IMAGE
+            channel_name: Channel the file belongs to
+            date: Day the file belongs to (YYYY-MM-DD)
+            row_count: Records in the file; counted from the file if None.
+                       Not kept for images
+            checksum: SHA-256 of the file; computed if None
+        """
+        try:
+            file_path, key = self._resolve(file_path)
+            size_bytes = file_path.stat().st_size
+            if checksum is None:
+                checksum, newlines = scan_file(file_path)
+                if row_count is None and file_path.suffix == '.ndjson':
+                    row_count = newlines
+            if kind == IMAGE:
+                row_count = None
+            elif row_count is None:
+                row_count = sum(1 for _ in iter_lake_records(file_path))
+
+            with self._lock:
+                self._conn.execute('BEGIN IMMEDIATE')
+                try:
+                    self._conn.execute(
+                        """
+                        INSERT OR REPLACE INTO lake_files
+                            (path, channel_name, date, kind, size_bytes, row_count, checksum, seq, updated_at)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, (SELECT COALESCE(MAX(seq), 0) + 1 FROM lake_files), ?)
+                        """,
+                        (key, channel_name, date, kind, size_bytes,
+                         row_count, checksum, time.time())
+                    )
+                    self._conn.execute('COMMIT')
+                except Exception:
+                    self._conn.execute('ROLLBACK')
+                    raise
+        except Exception as e:
+            logger.error(f"Failed to record {file_path} in lake catalog: {e}")
+            raise
+
+    def _walk(self) -> Iterator[Tuple[Path, str, str, str, Optional[str]]]:
+        """Yield (path, kind, channel_name, date, checksum) for every file in the lake."""
+        for kind, folder_name in ((MESSAGES, 'telegram_messages'), (ALBUMS, 'telegram_albums')):
+            root = self.data_lake_path / folder_name
+            if not root.exists():
+                continue
+            for date_dir in sorted(d for d in root.iterdir() if d.is_dir()):
+                for file_path in list_lake_files(date_dir):
+                    yield file_path, kind, lake_file_channel(file_path), date_dir.name, None
+
+        images_root = self.data_lake_path / 'images'
+        if not images_root.exists():
+            return
+        # Dated layout: images/<channel>/<date>/<file>
+        for channel_dir in sorted(images_root.iterdir()):
+            if not channel_dir.is_dir() or channel_dir.name == 'objects':
+                continue
+            for date_dir in sorted(d for d in channel_dir.iterdir() if d.is_dir()):
+                for image_path in sorted(date_dir.iterdir()):
+                    if image_path.suffix.lower() in IMAGE_SUFFIXES:
+                        yield image_path, IMAGE, channel_dir.name, date_dir.name, None
+
+        # Content-addressed layout: links in the media index
+        if (images_root / 'media_index.sqlite').exists():
+            media_store = MediaStore(str(self.data_lake_path))
+            try:
+                for link in list(media_store.iter_links()):
+                    if (self.data_lake_path / link['path']).exists():
+                        yield link['path'], IMAGE, link['channel_name'], link['date'], link['sha256']
+            finally:
+                media_store.close()
+
+    def rebuild(self) -> int:
+        """
+        Index the files already in the lake by walking it once.
+
+        A file that cannot be indexed is logged and skipped.
+
+        Returns:
+            Number of entries recorded
+        """
+        started = time.perf_counter()
+        count = 0
+        for file_path, kind, channel_name, date, checksum in self._walk():
+            try:
+                self.record_file(file_path, kind, channel_name, date, checksum=checksum)
+                count += 1
+            except Exception:
+                # Already logged by record_file
+                continue
+
+        logger.info(
+            f"Indexed {count} existing lake entries in {self.index_path} "
+            f"in {time.perf_counter() - started:.2f}s"
+        )
+        return count
+
+    def reconcile(self) -> Dict[str, int]:
+        """
+        Bring the catalog in line with the files on disk.
+
+        Walks the lake like rebuild(), but only indexes files that have no
+        entry or whose size changed, and removes entries whose file is
+        gone. Use it after files were added by anything other than the
+        scraper, e.g. copied in by hand.
+
+        Returns:
+            Dictionary with the number of entries `added`, `updated` and `removed`
+        """
+        known = {
+            (path, channel_name, date): size_bytes
+            for path, channel_name, date, size_bytes in self._conn.execute(
+                "SELECT path, channel_name, date, size_bytes FROM lake_files"
+            )
+        }
+        counts = {'added': 0, 'updated': 0, 'removed': 0}
+        seen = set()
+        for file_path, kind, channel_name, date, checksum in self._walk():
+            try:
+                resolved, path = self._resolve(file_path)
+                key = (path, channel_name, date)
+                seen.add(key)
+                if key in known and known[key] == resolved.stat().st_size:
+                    continue
+                self.record_file(resolved, kind, channel_name, date, checksum=checksum)
+                counts['updated' if key in known else 'added'] += 1
+            except Exception as e:
+                logger.error(f"Failed to reconcile {file_path} with the lake catalog: {e}")
+
+        missing = [key for key in known if key not in seen and not (self._root / key[0]).exists()]
+        if missing:
+            with self._lock:
+                self._conn.execute('BEGIN IMMEDIATE')
+                try:
+                    self._conn.executemany(
+                        "DELETE FROM lake_files WHERE path = ? AND channel_name = ? AND date = ?",
+                        missing
+                    )
+                    self._conn.execute('COMMIT')
+                except Exception:
+                    self._conn.execute('ROLLBACK')
+                    raise
+        counts['removed'] = len(missing)
+
+        logger.info(
+            f"Reconciled lake catalog {self.index_path}: {counts['added']} added, "
+            f"{counts['updated']} updated, {counts['removed']} removed"
+        )
+        return counts
+
+    def iter_files(self, kind: str, date: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over the entries of one kind.
+
+        Args:
+            kind: MESSAGES, ALBUMS or IMAGE
+            date: Only return entries for this date (YYYY-MM-DD). If None, returns all
+        """
+        query = """
+            SELECT path, channel_name, date, size_bytes, row_count, checksum
+            FROM lake_files WHERE kind = ?
+        """
+        params: Tuple = (kind,)
+        if date:
+            query += " AND date = ?"
+            params = (kind, date)
+        query += " ORDER BY date, channel_name, path"
+
+        for path, channel_name, entry_date, size_bytes, row_count, checksum in self._conn.execute(query, params):
+            yield {
+                'path': path,
+                'channel_name': channel_name,
+                'date': entry_date,
+                'size_bytes': size_bytes,
+                'row_count': row_count,
+                'checksum': checksum
+            }
+
+    def summary(self, kind: str = MESSAGES) -> Dict[str, Any]:
+        """
+        Aggregate the entries of one kind.
+
+        Returns:
+            Dictionary with `files`, `rows`, `size_bytes`, sorted `dates`
+            and `channels`, and the `earliest` and `latest` date
+        """
+        files, rows, size_bytes = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(row_count), 0), COALESCE(SUM(size_bytes), 0) FROM lake_files WHERE kind = ?",
+            (kind,)
+        ).fetchone()
+        dates = [row[0] for row in self._conn.execute(
+            "SELECT DISTINCT date FROM lake_files WHERE kind = ? ORDER BY date", (kind,)
+        )]
+        channels = [row[0] for row in self._conn.execute(
+            "SELECT DISTINCT channel_name FROM lake_files WHERE kind = ? ORDER BY channel_name", (kind,)
+        )]
+        valid_dates = [d for d in dates if _is_date(d)]
+        return {
+            'files': files,
+            'rows': rows,
+            'size_bytes': size_bytes,
+            'dates': dates,
+            'channels': channels,
+            'earliest': valid_dates[0] if valid_dates else None,
+            'latest': valid_dates[-1] if valid_dates else None
+        }
+
+    def changes_since(self, seq: int, kind: Optional[str] = None) -> Tuple[int, int]:
+        """
+        Count entries written after a cursor.
+
+        Args:
+            seq: Cursor from an earlier call (0 for everything)
+            kind: Only count entries of this kind
+
+        Returns:
+            Tuple of the latest `seq` (the next cursor) and the number of
+            entries written after `seq`
+        """
+        query = "SELECT COALESCE(MAX(seq), ?), COUNT(*) FROM lake_files WHERE seq > ?"
+        params: Tuple = (seq, seq)
+        if kind:
+            query += " AND kind = ?"
+            params = (seq, seq, kind)
+        latest, changed = self._conn.execute(query, params).fetchone()
+        return latest, changed
+
+
+def _is_date(value: str) -> bool:
+    try:
+        datetime.strptime(value, '%Y-%m-%d')
+        return True
+    except ValueError:
+        return False
@@ -0,0 +1,244 @@
+"""Reading and writing message files in the data lake."""
+
+import gzip
+import hashlib
+import io
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, TextIO, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Suffix appended to .ndjson files for each supported compression
+COMPRESSION_SUFFIXES = {
+    'none': '',
+    'gzip': '.gz',
+    'zstd': '.zst'
+}
+
+LAKE_FILE_PATTERNS = ['*.json', '*.ndjson', '*.ndjson.gz', '*.ndjson.zst']
+
+# Characters read at a time when streaming a legacy JSON array
+JSON_READ_CHUNK = 1024 * 1024
+
+
+def _require_zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError(
+            "zstd compression requires the 'zstandard' package: pip install zstandard"
+        )
+    return zstandard
+
+
+def lake_file_name(channel_name: str, lake_format: str = 'ndjson', compression: str = 'none') -> str:
+    """Return the file name used for a channel's messages in a date folder."""
+    if lake_format == 'json':
+        return f'{channel_name}.json'
+    if compression not in COMPRESSION_SUFFIXES:
+        raise ValueError(f"Unsupported lake compression: {compression}")
+    return f'{channel_name}.ndjson{COMPRESSION_SUFFIXES[compression]}'
+
+
+def lake_file_channel(file_path: Path) -> str:
+    """Return the channel name a lake file belongs to."""
+    return file_path.name.split('.', 1)[0]
+
+
+def list_lake_files(folder: Path) -> List[Path]:
+    """List the message files of every supported format in a date folder."""
+    files = []
+    for pattern in LAKE_FILE_PATTERNS:
+        files.extend(folder.glob(pattern))
+    return sorted(files)
+
+
+def scan_file(file_path: Path) -> Tuple[str, int]:
+    """
+    Hash a file's bytes in 1 MB blocks, counting newlines on the way.
+
+    Returns:
+        Tuple of the SHA-256 hex digest and the number of newline bytes,
+        which is the record count of an uncompressed NDJSON file
+    """
+    digest = hashlib.sha256()
+    newlines = 0
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+            newlines += block.count(b'\n')
+    return digest.hexdigest(), newlines
+
+
+def open_lake_text(file_path: Path, mode: str = 'rt'):
+    """Open a lake file as text, transparently handling gzip and zstd."""
+    file_path = Path(file_path)
+    if file_path.suffix == '.gz':
+        return gzip.open(file_path, mode, encoding='utf-8')
+
+    if file_path.suffix == '.zst':
+        zstandard = _require_zstandard()
+        raw = open(file_path, mode[0] + 'b')
+        if mode.startswith('r'):
+            # Appended runs are separate frames, so read across them
+            stream = zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True)
+        else:
+            stream = zstandard.ZstdCompressor().stream_writer(raw)
+        return io.TextIOWrapper(stream, encoding='utf-8')
+
+    return open(file_path, mode, encoding='utf-8')
+
+
+class NdjsonLakeWriter:
+    """
+    Append-only newline-delimited JSON writer for one channel/date file.
+
+    Each record is written as it arrives, so memory use does not depend on
+    how many messages a channel has. Re-opening the same file appends.
+    """
+
+    def __init__(self, file_path: Path):
+        self.file_path = Path(file_path)
+        self.count = 0
+        self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open_lake_text(self.file_path, 'at')
+
+    def __enter__(self) -> 'NdjsonLakeWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def write(self, record: Dict[str, Any]):
+        """Append one record as a JSON line."""
+        self._file.write(json.dumps(record, ensure_ascii=False, default=str))
+        self._file.write('\n')
+        self.count += 1
+
+    def write_many(self, records: Iterable[Dict[str, Any]]):
+        """Append several records."""
+        for record in records:
+            self.write(record)
+
+    def flush(self):
+        """Push written records to the file."""
+        self._file.flush()
+
+    def close(self):
+        """Flush and close the file."""
+        if self._file and not self._file.closed:
+            self._file.close()
+            logger.debug(f"Wrote {self.count} records to {self.file_path}")
+
+
+def iter_lake_records(file_path: Path) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the message records stored in a lake file.
+
+    NDJSON files are read line by line and legacy .json arrays element by
+    element, so memory use does not grow with the file size.
+    """
+    file_path = Path(file_path)
+    if '.ndjson' in file_path.suffixes:
+        with open_lake_text(file_path, 'rt') as f:
+            for line_number, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError as e:
+                    # A crash mid-write can leave a truncated last line
+                    logger.warning(f"Skipping malformed line {line_number} in {file_path}: {e}")
+        return
+
+    with open(file_path, 'r', encoding='utf-8') as f:
+        yield from iter_json_array(f)
+
+
+def iter_json_array(f: TextIO, chunk_size: int = JSON_READ_CHUNK) -> Iterator[Any]:
+    """
+    Yield the elements of a top-level JSON array without loading it whole.
+
+    The stream is read in chunks and each element decoded with
+    JSONDecoder.raw_decode, so only the unread part of the current chunk
+    and the element being decoded are held in memory.
+
+    Raises:
+        ValueError: If the stream is not a well-formed JSON array
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    pos = 0
+    eof = False
+    started = False
+    after_value = False
+    after_comma = False
+
+    def read_more(size: int):
+        nonlocal buffer, pos, eof
+        data = f.read(size)
+        eof = not data
+        # Drop what was consumed, so the buffer never holds more than one element
+        buffer = buffer[pos:] + data
+        pos = 0
+
+    while True:
+        while pos < len(buffer) and buffer[pos].isspace():
+            pos += 1
+        if pos == len(buffer):
+            if eof:
+                raise ValueError("Unexpected end of JSON array")
+            read_more(chunk_size)
+            continue
+
+        char = buffer[pos]
+        if not started:
+            if char != '[':
+                raise ValueError("Expected a JSON array")
+            started = True
+            pos += 1
+        elif char == ']' and not after_comma:
+            return
+        elif after_value:
+            if char != ',':
+                raise ValueError(f"Expected ',' or ']' in JSON array, found {char!r}")
+            after_value = False
+            after_comma = True
+            pos += 1
+        else:
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                end = None
+            # A number cut at the end of the buffer decodes as a shorter one
+            # (`-25.` as -25), so a value only counts once a delimiter follows
+            if end is None or (
+                not eof and (end == len(buffer) or not (buffer[end] in ',]' or buffer[end].isspace()))
+            ):
+                # The element may continue past the buffer; read at least as much again
+                read_more(max(chunk_size, len(buffer) - pos))
+                continue
+            yield value
+            pos = end
+            after_value = True
+            after_comma = False
+
+
+def iter_record_batches(
+    records: Iterable[Dict[str, Any]],
+    batch_size: int
+) -> Iterator[List[Dict[str, Any]]]:
+    """Group records into lists of at most `batch_size`."""
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
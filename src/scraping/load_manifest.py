@@ -0,0 +1,127 @@
+"""Record of which data lake files have been loaded into the database."""
+
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from sqlalchemy import text
+
+from src.utils import DatabaseManager
+from src.scraping.lake_io import scan_file
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_TABLE = 'raw.load_manifest'
+
+# File states reported by LoadManifest.classify
+NEW = 'new'
+CHANGED = 'changed'
+UNCHANGED = 'unchanged'
+
+class LoadManifest:
+    """
+    Tracks loaded lake files in raw.load_manifest, keyed by lake-relative path.
+
+    A file whose size and mtime match its entry is skipped without being
+    read. When either differs the file is hashed: the same checksum means
+    only its timestamp moved, a different one means its contents changed
+    and it must be reloaded.
+    """
+
+    def __init__(self, db_manager: DatabaseManager, data_lake_path: str):
+        self.db_manager = db_manager
+        self.data_lake_path = Path(data_lake_path)
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._load()
+
+    def _load(self):
+        """Read every manifest entry in one query."""
+        try:
+            with self.db_manager.engine.connect() as conn:
+                rows = conn.execute(text(
+                    f"SELECT path, size_bytes, mtime_ns, checksum, row_count FROM {MANIFEST_TABLE}"
+                )).mappings().all()
+            self._entries = {row['path']: dict(row) for row in rows}
+            logger.info(f"Load manifest has {len(self._entries)} files")
+        except Exception as e:
+            logger.error(f"Failed to read load manifest {MANIFEST_TABLE}: {e}")
+            raise
+
+    def _key(self, file_path: Path) -> str:
+        return Path(os.path.relpath(file_path, self.data_lake_path)).as_posix()
+
+    @staticmethod
+    def checksum(file_path: Path) -> str:
+        """SHA-256 of a file's bytes, read in 1 MB blocks."""
+        return scan_file(file_path)[0]
+
+    @classmethod
+    def file_state(cls, file_path: Path) -> Dict[str, Any]:
+        """Size, mtime and checksum of a file, as stored in the manifest."""
+        stat = Path(file_path).stat()
+        return {
+            'size_bytes': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'checksum': cls.checksum(file_path)
+        }
+
+    def entry(self, file_path: Path) -> Optional[Dict[str, Any]]:
+        """The manifest entry of a file, if it was loaded before."""
+        return self._entries.get(self._key(file_path))
+
+    def is_unchanged(self, file_path: Path) -> bool:
+        """Whether a file's size and mtime match its entry, without reading it."""
+        entry = self.entry(file_path)
+        if not entry:
+            return False
+        stat = Path(file_path).stat()
+        return entry['size_bytes'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns
+
+    @staticmethod
+    def classify(state: Dict[str, Any], known_checksum: Optional[str]) -> str:
+        """
+        Compare a file's state, captured before loading it, with its entry's checksum.
+
+        Returns:
+            NEW, CHANGED or UNCHANGED
+        """
+        if known_checksum is None:
+            return NEW
+        return UNCHANGED if state['checksum'] == known_checksum else CHANGED
+
+    def record(self, file_path: Path, state: Dict[str, Any], row_count: Optional[int] = None):
+        """
+        Mark a file as loaded.
+
+        Args:
+            file_path: Loaded lake file
+            state: file_state() captured before the load, so rows appended
+                  during it show up as a change on the next run
+            row_count: Rows loaded; None keeps the entry's previous count
+        """
+        key = self._key(file_path)
+        if row_count is None:
+            row_count = self._entries.get(key, {}).get('row_count', 0)
+        self._save(key, state, row_count)
+
+    def _save(self, key: str, state: Dict[str, Any], row_count: int):
+        try:
+            with self.db_manager.engine.begin() as conn:
+                conn.execute(
+                    text(f"""
+                        INSERT INTO {MANIFEST_TABLE} (path, size_bytes, mtime_ns, checksum, row_count, loaded_at)
+                        VALUES (:path, :size_bytes, :mtime_ns, :checksum, :row_count, CURRENT_TIMESTAMP)
+                        ON CONFLICT (path) DO UPDATE SET
+                            size_bytes = EXCLUDED.size_bytes,
+                            mtime_ns = EXCLUDED.mtime_ns,
+                            checksum = EXCLUDED.checksum,
+                            row_count = EXCLUDED.row_count,
+                            loaded_at = EXCLUDED.loaded_at
+                    """),
+                    {'path': key, 'row_count': row_count, **state}
+                )
+            self._entries[key] = {'path': key, 'row_count': row_count, **state}
+        except Exception as e:
+            logger.error(f"Failed to record {key} in load manifest: {e}")
+            raise
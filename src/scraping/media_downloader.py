@@ -0,0 +1,196 @@
+"""Worker pool that downloads message media off the scraping loop."""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Size assumed for media whose size Telegram does not report up front
+DEFAULT_MEDIA_SIZE = 512 * 1024
+
+
+class MediaCallbackError(Exception):
+    """Raised by drain() when a job's completion callback failed."""
+
+
+class MediaDownloadPool:
+    """
+    Producer/consumer pipeline for media downloads.
+
+    Message iteration submits download jobs onto a bounded queue and a pool
+    of workers drains it, writing the downloaded path back into each job's
+    message dictionary as `image_path`. A job may cover several messages
+    (an album), which one worker downloads together. The total size of
+    downloads running at once is capped by `max_bytes_in_flight`.
+
+    A failed download only leaves `image_path` empty, but a failed
+    completion callback is raised again from drain() and join(), like the
+    same error would be when media is downloaded inline.
+    """
+
+    def __init__(
+        self,
+        download: Callable[[Any, str], Awaitable[Optional[str]]],
+        workers: int = 4,
+        max_bytes_in_flight: int = 64 * 1024 * 1024,
+        queue_size: int = 100
+    ):
+        self.download = download
+        self.workers = workers
+        self.max_bytes_in_flight = max_bytes_in_flight
+        self.bytes_in_flight = 0
+        self.downloaded = 0
+        self.failed = 0
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._bytes_available = asyncio.Condition()
+        self._tasks: List[asyncio.Task] = []
+        self._callback_error: Optional[Exception] = None
+
+    async def __aenter__(self) -> 'MediaDownloadPool':
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if exc_type is asyncio.CancelledError:
+            await self.cancel()
+        else:
+            # Messages already collected still need their media
+            await self.join()
+
+    def start(self):
+        """Start the download workers."""
+        self._tasks = [
+            asyncio.create_task(self._worker(i)) for i in range(self.workers)
+        ]
+        logger.debug(f"Started {self.workers} media download workers")
+
+    async def submit(
+        self,
+        message,
+        channel_name: str,
+        message_data: Dict[str, Any],
+        on_done: Optional[Callable[[Dict[str, Any]], None]] = None
+    ):
+        """
+        Queue a download, waiting if the queue is full.
+
+        Args:
+            message: Telegram message whose media to download
+            channel_name: Channel the message belongs to
+            message_data: Extracted record whose `image_path` is filled in
+            on_done: Called with the record once the download has finished
+        """
+        await self.submit_batch(
+            [message],
+            channel_name,
+            [message_data],
+            on_done=(lambda records: on_done(records[0])) if on_done else None
+        )
+
+    async def submit_batch(
+        self,
+        messages: List[Any],
+        channel_name: str,
+        records: List[Dict[str, Any]],
+        on_done: Optional[Callable[[List[Dict[str, Any]]], None]] = None
+    ):
+        """
+        Queue the media of several messages as one unit of work.
+
+        Args:
+            messages: Telegram messages whose media to download
+            channel_name: Channel the messages belong to
+            records: Extracted records, aligned with `messages`
+            on_done: Called with all records once every download has finished
+        """
+        await self._queue.put((messages, channel_name, records, on_done))
+
+    async def drain(self):
+        """
+        Wait for every queued download to finish, keeping the workers running.
+
+        Raises:
+            MediaCallbackError: If a completion callback failed since the last drain
+        """
+        await self._queue.join()
+        error, self._callback_error = self._callback_error, None
+        if error:
+            raise MediaCallbackError(f"Completion callback failed: {error}") from error
+
+    async def join(self):
+        """Wait for every queued download to finish, then stop the workers."""
+        try:
+            await self.drain()
+        finally:
+            await self.cancel()
+        logger.debug(f"Media downloads finished: {self.downloaded} ok, {self.failed} failed")
+
+    async def cancel(self):
+        """Stop the workers without waiting for queued downloads."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    @staticmethod
+    def estimate_size(message) -> int:
+        """Best-effort size of a message's media in bytes."""
+        size = getattr(getattr(message, 'file', None), 'size', None)
+        return size or DEFAULT_MEDIA_SIZE
+
+    async def _reserve(self, size: int):
+        """Block until `size` bytes fit under the in-flight limit."""
+        async with self._bytes_available:
+            # A single download larger than the limit may run on its own
+            await self._bytes_available.wait_for(
+                lambda: self.bytes_in_flight == 0
+                or self.bytes_in_flight + size <= self.max_bytes_in_flight
+            )
+            self.bytes_in_flight += size
+
+    async def _release(self, size: int):
+        async with self._bytes_available:
+            self.bytes_in_flight -= size
+            self._bytes_available.notify_all()
+
+    async def _worker(self, worker_id: int):
+        """Drain the queue, downloading one job's media at a time."""
+        while True:
+            messages, channel_name, records, on_done = await self._queue.get()
+            size = sum(self.estimate_size(message) for message in messages)
+            try:
+                await self._reserve(size)
+                try:
+                    paths = await asyncio.gather(
+                        *(self.download(message, channel_name) for message in messages),
+                        return_exceptions=True
+                    )
+                finally:
+                    await self._release(size)
+
+                for record, path in zip(records, paths):
+                    if isinstance(path, Exception):
+                        logger.error(f"Download worker {worker_id} failed on message {record.get('message_id')}: {path}")
+                        path = None
+                    record['image_path'] = path
+                    if path:
+                        self.downloaded += 1
+                    else:
+                        self.failed += 1
+            except asyncio.CancelledError:
+                self._queue.task_done()
+                raise
+            except Exception as e:
+                self.failed += len(records)
+                logger.error(f"Download worker {worker_id} failed on a job of {len(records)} messages: {e}")
+
+            # Report completion before task_done() so join() covers callbacks
+            if on_done:
+                try:
+                    on_done(records)
+                except Exception as e:
+                    logger.error(f"Completion callback failed for {len(records)} messages: {e}")
+                    if self._callback_error is None:
+                        self._callback_error = e
+            self._queue.task_done()
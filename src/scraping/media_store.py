@@ -0,0 +1,142 @@
+"""Content-addressed image store with a per-channel/date link index."""
+
+import hashlib
+import logging
+import os
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS media_objects (
+    sha256 TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS media_ids (
+    media_id INTEGER PRIMARY KEY,
+    sha256 TEXT NOT NULL REFERENCES media_objects(sha256)
+);
+CREATE TABLE IF NOT EXISTS media_links (
+    channel_name TEXT NOT NULL,
+    message_id INTEGER NOT NULL,
+    date TEXT NOT NULL,
+    sha256 TEXT NOT NULL REFERENCES media_objects(sha256),
+    PRIMARY KEY (channel_name, message_id)
+);
+CREATE INDEX IF NOT EXISTS idx_media_links_date ON media_links(date);
+CREATE INDEX IF NOT EXISTS idx_media_links_sha256 ON media_links(sha256);
+"""
+
+class MediaStore:
+    """
+    Stores each distinct image once under `images/objects/<aa>/<sha256><ext>`.
+
+    A SQLite index maps Telegram media ids to content hashes, so reposted
+    photos are never downloaded twice, and links every (channel, date,
+    message) to the object it shows. Paths returned are relative to the
+    data lake root, like the dated layout's.
+    """
+
+    def __init__(self, data_lake_path: str):
+        self.data_lake_path = Path(data_lake_path)
+        self.images_root = self.data_lake_path / 'images'
+        self.objects_dir = self.images_root / 'objects'
+        self.index_path = self.images_root / 'media_index.sqlite'
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.index_path), check_same_thread=False)
+        self._conn.executescript(INDEX_SCHEMA)
+        self._conn.commit()
+
+    def close(self):
+        """Close the index connection."""
+        self._conn.close()
+
+    def lookup(self, media_id: int) -> Optional[Dict[str, Any]]:
+        """Return the stored object for a Telegram media id, if already downloaded."""
+        row = self._conn.execute(
+            """
+            SELECT o.sha256, o.path
+            FROM media_ids i JOIN media_objects o ON o.sha256 = i.sha256
+            WHERE i.media_id = ?
+            """,
+            (media_id,)
+        ).fetchone()
+        if row and (self.data_lake_path / row[1]).exists():
+            return {'sha256': row[0], 'path': row[1]}
+        return None
+
+    def put(self, data: bytes, extension: str, media_id: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Store image bytes by content hash, skipping the write if already present.
+
+        Args:
+            data: Raw image bytes
+            extension: File extension including the dot, e.g. '.jpg'
+            media_id: Telegram photo/document id to record for future lookups
+
+        Returns:
+            Dictionary with the object's sha256 and lake-relative path
+        """
+        sha256 = hashlib.sha256(data).hexdigest()
+        relative_path = os.path.join('images', 'objects', sha256[:2], f'{sha256}{extension}')
+        file_path = self.data_lake_path / relative_path
+
+        if not file_path.exists():
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = file_path.with_suffix(file_path.suffix + '.tmp')
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, file_path)
+        else:
+            logger.debug(f"Image content already stored: {relative_path}")
+
+        self._conn.execute(
+            "INSERT OR IGNORE INTO media_objects (sha256, path, size, created_at) VALUES (?, ?, ?, ?)",
+            (sha256, relative_path, len(data), datetime.now().isoformat())
+        )
+        if media_id is not None:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO media_ids (media_id, sha256) VALUES (?, ?)",
+                (media_id, sha256)
+            )
+        self._conn.commit()
+
+        return {'sha256': sha256, 'path': relative_path}
+
+    def link(self, channel_name: str, date: str, message_id: int, sha256: str):
+        """Record that a channel's message on a given date shows an object."""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO media_links (channel_name, message_id, date, sha256) VALUES (?, ?, ?, ?)",
+            (channel_name, message_id, date, sha256)
+        )
+        self._conn.commit()
+
+    def iter_links(self, date: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over linked images.
+
+        Args:
+            date: Only return links for this date (YYYY-MM-DD). If None, returns all
+        """
+        query = """
+            SELECT l.channel_name, l.date, l.message_id, l.sha256, o.path
+            FROM media_links l JOIN media_objects o ON o.sha256 = l.sha256
+        """
+        params = ()
+        if date:
+            query += " WHERE l.date = ?"
+            params = (date,)
+
+        for channel_name, link_date, message_id, sha256, path in self._conn.execute(query, params):
+            yield {
+                'channel_name': channel_name,
+                'date': link_date,
+                'message_id': message_id,
+                'sha256': sha256,
+                'path': path
+            }
@@ -0,0 +1,127 @@
+"""Per-channel counters and timers for scraper runs."""
+
+import json
+import logging
+import os
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator
+
+logger = logging.getLogger(__name__)
+
+METRIC_PREFIX = 'telegram_scraper'
+
+# Known metrics and their help text, labelled by channel; `_total` ones are counters
+METRICS = {
+    'messages_total': 'Messages scraped and persisted',
+    'scrape_seconds_total': 'Wall-clock time spent scraping the channel',
+    'media_downloads_total': 'Media files downloaded from Telegram',
+    'media_dedup_hits_total': 'Media served from the content store without a download',
+    'media_bytes_total': 'Bytes of media downloaded',
+    'media_download_seconds_total': 'Time spent in media downloads, summed over workers',
+    'flood_waits_total': 'FloodWait errors received',
+    'flood_wait_seconds_total': 'Seconds Telegram asked us to wait',
+    'entity_resolutions_total': 'Channel usernames resolved with get_entity',
+    'entity_cache_hits_total': 'Channel lookups served from the entity cache',
+    'entity_resolve_seconds_total': 'Time spent in get_entity, including flood waits',
+    'lake_records_total': 'Records written to the data lake',
+    'lake_write_seconds_total': 'Time spent writing the data lake',
+    'db_rows_total': 'Rows loaded into the database',
+    'db_load_seconds_total': 'Time spent loading the database',
+    'messages_per_second': 'Messages persisted per second of scraping',
+    'media_bytes_per_second': 'Media bytes downloaded per second of scraping',
+}
+
+class ScraperMetrics:
+    """
+    Collects counters per channel and exports them as JSON or Prometheus text.
+
+    Timers add elapsed seconds to a `<name>_seconds_total` counter, so time
+    spent in concurrent tasks (e.g. download workers) is summed rather than
+    measured as wall-clock.
+    """
+
+    def __init__(self):
+        self._values: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+
+    def inc(self, channel_name: str, name: str, value: float = 1):
+        """Add `value` to one of a channel's counters."""
+        self._values[channel_name][name] += value
+
+    def observe(self, channel_name: str, name: str, seconds: float):
+        """Add a measured duration to a channel's `<name>_seconds_total` counter."""
+        self.inc(channel_name, f'{name}_seconds_total', seconds)
+
+    @contextmanager
+    def timer(self, channel_name: str, name: str) -> Iterator[None]:
+        """Time the enclosed block into `<name>_seconds_total`."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(channel_name, name, time.perf_counter() - started)
+
+    def get(self, channel_name: str, name: str) -> float:
+        """Current value of a channel's counter."""
+        return self._values.get(channel_name, {}).get(name, 0.0)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """
+        Copy of every channel's counters, plus derived throughput.
+
+        Returns:
+            Dictionary mapping channel names to metric name/value pairs,
+            including `messages_per_second` and `media_bytes_per_second`
+        """
+        snapshot = {}
+        for channel_name, values in self._values.items():
+            channel_metrics = dict(values)
+            seconds = values.get('scrape_seconds_total', 0.0)
+            if seconds > 0:
+                channel_metrics['messages_per_second'] = values.get('messages_total', 0.0) / seconds
+                channel_metrics['media_bytes_per_second'] = values.get('media_bytes_total', 0.0) / seconds
+            snapshot[channel_name] = channel_metrics
+        return snapshot
+
+    def to_prometheus(self) -> str:
+        """Render the metrics in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        names = sorted({name for values in snapshot.values() for name in values})
+
+        lines = []
+        for name in names:
+            metric = f'{METRIC_PREFIX}_{name}'
+            lines.append(f'# HELP {metric} {METRICS.get(name, name.replace("_", " "))}')
+            lines.append(f'# TYPE {metric} {"counter" if name.endswith("_total") else "gauge"}')
+            for channel_name in sorted(snapshot):
+                if name in snapshot[channel_name]:
+                    label = channel_name.replace('\\', '\\\\').replace('"', '\\"')
+                    value = snapshot[channel_name][name]
+                    value = int(value) if float(value).is_integer() else value
+                    lines.append(f'{metric}{{channel="{label}"}} {value}')
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path: str):
+        """
+        Atomically write the metrics to a file.
+
+        A `.json` path gets a JSON snapshot; any other path gets Prometheus
+        text, e.g. for the node_exporter textfile collector.
+        """
+        try:
+            path = Path(path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if path.suffix == '.json':
+                content = json.dumps(self.snapshot(), indent=2, sort_keys=True)
+            else:
+                content = self.to_prometheus()
+
+            tmp_path = path.with_suffix(path.suffix + '.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.error(f"Failed to write scraper metrics to {path}: {e}")
+            raise
@@ -0,0 +1,221 @@
+"""Columnar Parquet layout for the telegram_messages data lake."""
+
+import json
+import logging
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+PARQUET_DATASET_DIR = 'telegram_messages_parquet'
+
+# Hive-style partition keys: channel_name=<channel>/message_date=<YYYY-MM-DD>
+PARTITION_COLUMNS = ['channel_name', 'message_date']
+
+# Fields of raw_data stored as their own typed columns
+RAW_DATA_COLUMNS = ['views', 'forwards', 'replies', 'edit_date', 'grouped_id']
+
+MESSAGE_COLUMNS = [
+    'message_id', 'channel_name', 'date', 'text', 'sender_id', 'has_media',
+    'media_type', 'image_path', 'scraped_at'
+]
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.dataset
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError(
+            "The Parquet lake format requires the 'pyarrow' package: pip install pyarrow"
+        )
+    return pyarrow
+
+
+def _schema():
+    pa = _require_pyarrow()
+    return pa.schema([
+        ('message_id', pa.int64()),
+        ('channel_name', pa.string()),
+        ('message_date', pa.string()),
+        ('date', pa.timestamp('us', tz='UTC')),
+        ('text', pa.string()),
+        ('sender_id', pa.int64()),
+        ('has_media', pa.bool_()),
+        ('media_type', pa.string()),
+        ('image_path', pa.string()),
+        ('scraped_at', pa.timestamp('us')),
+        ('views', pa.int64()),
+        ('forwards', pa.int64()),
+        ('replies', pa.string()),
+        ('edit_date', pa.timestamp('us', tz='UTC')),
+        ('grouped_id', pa.int64()),
+    ])
+
+
+def records_to_table(records: List[Dict[str, Any]]):
+    """Flatten message records into an Arrow table with typed raw_data columns."""
+    pa = _require_pyarrow()
+    # Object columns keep ids exact: inferring float64 for an id column
+    # holding None would round grouped_ids (~1.3e16) above 2**53
+    df = pd.DataFrame(records, columns=MESSAGE_COLUMNS + ['raw_data'], dtype=object)
+
+    raw_data = [
+        x if isinstance(x, dict) else (json.loads(x) if isinstance(x, str) else {})
+        for x in df.pop('raw_data')
+    ]
+    for column in RAW_DATA_COLUMNS:
+        df[column] = pd.Series([x.get(column) for x in raw_data], index=df.index, dtype=object)
+
+    df['date'] = pd.to_datetime(df['date'], utc=True)
+    df['scraped_at'] = pd.to_datetime(df['scraped_at'])
+    df['edit_date'] = pd.to_datetime(df['edit_date'], utc=True)
+    df['replies'] = df['replies'].apply(lambda x: None if x is None else str(x))
+    for column in ['message_id', 'sender_id', 'views', 'forwards', 'grouped_id']:
+        df[column] = df[column].astype('Int64')
+    df['message_date'] = df['date'].dt.strftime('%Y-%m-%d')
+
+    return pa.Table.from_pandas(df, schema=_schema(), preserve_index=False)
+
+
+def table_rows_to_records(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Rebuild message records, including the raw_data dict, from flattened rows."""
+    records = []
+    for row in rows:
+        record = {column: row.get(column) for column in MESSAGE_COLUMNS}
+        record['raw_data'] = {column: row.get(column) for column in RAW_DATA_COLUMNS}
+        records.append(record)
+    return records
+
+
+class ParquetLakeWriter:
+    """
+    Buffers message records and writes them as partitioned Parquet files.
+
+    Files land under `<root>/channel_name=<c>/message_date=<d>/`; each flush
+    of `batch_size` records adds new part files, so writers never rewrite
+    existing data.
+    """
+
+    def __init__(self, root: Path, batch_size: int = 10000):
+        _require_pyarrow()
+        self.file_path = Path(root)
+        self.batch_size = batch_size
+        self.count = 0
+        self._buffer: List[Dict[str, Any]] = []
+        self.file_path.mkdir(parents=True, exist_ok=True)
+
+    def __enter__(self) -> 'ParquetLakeWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def write(self, record: Dict[str, Any]):
+        """Buffer one record, flushing once the batch is full."""
+        self._buffer.append(record)
+        self.count += 1
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def write_many(self, records: Iterable[Dict[str, Any]]):
+        """Buffer several records."""
+        for record in records:
+            self.write(record)
+
+    def flush(self):
+        """Write buffered records as new Parquet part files."""
+        if not self._buffer:
+            return
+
+        import pyarrow.parquet as pq
+
+        table = records_to_table(self._buffer)
+        pq.write_to_dataset(
+            table,
+            root_path=str(self.file_path),
+            partition_cols=PARTITION_COLUMNS,
+            basename_template=f'part-{uuid.uuid4().hex}-{{i}}.parquet'
+        )
+        logger.debug(f"Wrote {len(self._buffer)} records to {self.file_path}")
+        self._buffer = []
+
+    def close(self):
+        """Flush any remaining records."""
+        self.flush()
+
+
+def open_parquet_dataset(root: Path):
+    """Open the partitioned message dataset for scanning."""
+    _require_pyarrow()
+    import pyarrow.dataset as ds
+
+    return ds.dataset(str(root), format='parquet', partitioning='hive')
+
+
+def build_filter(
+    channels: Optional[List[str]] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None
+):
+    """
+    Build a predicate on the partition columns so scans skip whole directories.
+
+    Args:
+        channels: Only these channels
+        start_date: First message date to include (YYYY-MM-DD)
+        end_date: Last message date to include (YYYY-MM-DD)
+    """
+    _require_pyarrow()
+    import pyarrow.dataset as ds
+
+    expression = None
+    conditions = []
+    if channels:
+        conditions.append(ds.field('channel_name').isin(channels))
+    if start_date:
+        conditions.append(ds.field('message_date') >= start_date)
+    if end_date:
+        conditions.append(ds.field('message_date') <= end_date)
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+    return expression
+
+
+def scan_parquet_lake(
+    root: Path,
+    columns: Optional[List[str]] = None,
+    channels: Optional[List[str]] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None
+):
+    """Read only the requested columns and partitions into an Arrow table."""
+    dataset = open_parquet_dataset(root)
+    return dataset.to_table(
+        columns=columns,
+        filter=build_filter(channels, start_date, end_date)
+    )
+
+
+def iter_parquet_batches(
+    root: Path,
+    batch_size: int = 10000,
+    columns: Optional[List[str]] = None,
+    channels: Optional[List[str]] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None
+) -> Iterator[List[Dict[str, Any]]]:
+    """Yield lists of row dictionaries from the dataset, one Arrow batch at a time."""
+    dataset = open_parquet_dataset(root)
+    scanner = dataset.scanner(
+        columns=columns,
+        filter=build_filter(channels, start_date, end_date),
+        batch_size=batch_size
+    )
+    for batch in scanner.to_batches():
+        if batch.num_rows:
+            yield batch.to_pylist()
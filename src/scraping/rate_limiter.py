@@ -0,0 +1,82 @@
+"""Adaptive token-bucket rate limiter for Telegram API requests."""
+
+import asyncio
+import logging
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket shared by every task talking to one Telegram account.
+
+    Each request takes a token; tokens refill at `rate` per second up to
+    `capacity`. The rate adapts to what Telegram tells us (AIMD): a
+    FloodWait halves it and blocks every caller until the wait is over,
+    and each successful request nudges it up towards `max_rate`. Starting
+    below a `max_rate` above `rate` lets the limiter probe for the real
+    ceiling instead of only ever slowing down.
+    """
+
+    def __init__(
+        self,
+        rate: float = 2.0,
+        capacity: int = 5,
+        min_rate: float = 0.1,
+        max_rate: Optional[float] = None,
+        backoff: float = 0.5,
+        recovery: float = 0.05
+    ):
+        self.rate = rate
+        self.capacity = capacity
+        self.min_rate = min_rate
+        self.max_rate = max(max_rate or rate, rate)
+        self.backoff = backoff
+        self.recovery = recovery
+        self.tokens = float(capacity)
+        self.flood_waits = 0
+        self.flood_wait_seconds = 0.0
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    @property
+    def blocked_for(self) -> float:
+        """Seconds left on the current flood wait, if any."""
+        return max(0.0, self._blocked_until - time.monotonic())
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens: int = 1):
+        """Wait until `tokens` requests may be made, then take them."""
+        async with self._lock:
+            while True:
+                if self.blocked_for:
+                    await asyncio.sleep(self.blocked_for)
+                    continue
+
+                now = time.monotonic()
+                self._refill(now)
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    self.rate = min(self.max_rate, self.rate + self.recovery)
+                    return
+
+                await asyncio.sleep((tokens - self.tokens) / self.rate)
+
+    def on_flood_wait(self, seconds: float):
+        """Record a FloodWait: block all callers and back the rate off."""
+        self.flood_waits += 1
+        self.flood_wait_seconds += seconds
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+        self.tokens = 0.0
+        self.rate = max(self.min_rate, self.rate * self.backoff)
+        logger.warning(f"Flood wait of {seconds}s; request rate lowered to {self.rate:.2f}/s")
+
+    async def wait(self):
+        """Sleep until the current flood wait, if any, has passed."""
+        while self.blocked_for:
+            await asyncio.sleep(self.blocked_for)
@@ -0,0 +1,147 @@
+"""Pool of Telegram accounts that channels are sharded across."""
+
+import bisect
+import hashlib
+import logging
+import time
+from typing import Any, List, Tuple
+
+from telethon import TelegramClient
+
+from src.config import Config
+from src.scraping.rate_limiter import AdaptiveRateLimiter
+
+logger = logging.getLogger(__name__)
+
+class TelegramSession:
+    """One Telegram account: its client, its own rate limiter and flood state."""
+
+    def __init__(self, name: str, client: Any, rate_limiter: AdaptiveRateLimiter):
+        self.name = name
+        self.client = client
+        self.rate_limiter = rate_limiter
+        self.flood_until = 0.0
+
+    @property
+    def flood_limited(self) -> bool:
+        """Whether Telegram has asked this account to wait."""
+        return time.monotonic() < self.flood_until
+
+
+class TelegramSessionPool:
+    """
+    Shards channels across accounts with a consistent-hash ring.
+
+    Each channel maps to a preferred session, so adding an account only
+    moves the channels that land on its ring segment. While a session is
+    flood-limited, its channels fail over to the next session on the ring.
+    """
+
+    def __init__(self, sessions: List[TelegramSession], virtual_nodes: int = 100):
+        if not sessions:
+            raise ValueError("A session pool needs at least one session")
+
+        self.sessions = sessions
+        self._ring: List[Tuple[int, TelegramSession]] = sorted(
+            (self._hash(f'{session.name}#{i}'), session)
+            for session in sessions
+            for i in range(virtual_nodes)
+        )
+        self._ring_keys = [key for key, _ in self._ring]
+
+    @classmethod
+    def from_config(cls, config: Config) -> 'TelegramSessionPool':
+        """
+        Build the pool from Config.TELEGRAM_SESSIONS.
+
+        The setting is a comma-separated list of `session_file:api_id:api_hash`
+        entries. When it is empty, the single TELEGRAM_API_ID/TELEGRAM_API_HASH
+        account is used with the 'telegram_session' session file.
+        """
+        credentials = []
+        for entry in config.TELEGRAM_SESSIONS.split(','):
+            if not entry.strip():
+                continue
+            try:
+                name, api_id, api_hash = entry.strip().split(':')
+            except ValueError:
+                raise ValueError(
+                    f"Invalid TELEGRAM_SESSIONS entry '{entry}', expected session_file:api_id:api_hash"
+                )
+            credentials.append((name, api_id, api_hash))
+        if not credentials:
+            credentials = [('telegram_session', config.TELEGRAM_API_ID, config.TELEGRAM_API_HASH)]
+
+        sessions = []
+        for name, api_id, api_hash in credentials:
+            sessions.append(TelegramSession(
+                name,
+                # Raise every FloodWait instead of letting Telethon sleep through
+                # short ones, so the rate limiter and session failover see them
+                TelegramClient(name, api_id, api_hash, flood_sleep_threshold=0),
+                AdaptiveRateLimiter(
+                    rate=config.SCRAPER_RATE_LIMIT,
+                    capacity=config.SCRAPER_RATE_BURST,
+                    max_rate=config.SCRAPER_RATE_MAX
+                )
+            ))
+
+        logger.info(f"Initialized Telegram session pool with {len(sessions)} sessions")
+        return cls(sessions)
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        return int(hashlib.md5(key.encode('utf-8')).hexdigest(), 16)
+
+    @property
+    def default(self) -> TelegramSession:
+        """The first configured session."""
+        return self.sessions[0]
+
+    def sessions_for(self, channel_name: str) -> List[TelegramSession]:
+        """All sessions in ring order starting from the channel's preferred one."""
+        start = bisect.bisect(self._ring_keys, self._hash(channel_name)) % len(self._ring)
+        ordered = []
+        for i in range(len(self._ring)):
+            session = self._ring[(start + i) % len(self._ring)][1]
+            if session not in ordered:
+                ordered.append(session)
+                if len(ordered) == len(self.sessions):
+                    break
+        return ordered
+
+    def session_for(self, channel_name: str) -> TelegramSession:
+        """
+        Pick the session to scrape a channel with.
+
+        Returns the preferred session unless it is flood-limited, in which
+        case the next available one on the ring is used; if every session
+        is limited, the one whose wait ends soonest.
+        """
+        candidates = self.sessions_for(channel_name)
+        for session in candidates:
+            if not session.flood_limited:
+                return session
+        return min(candidates, key=lambda session: session.flood_until)
+
+    def session_for_client(self, client: Any) -> TelegramSession:
+        """Find the session owning a client, defaulting to the first session."""
+        for session in self.sessions:
+            if session.client is client:
+                return session
+        return self.default
+
+    def mark_flood_limited(self, session: TelegramSession, seconds: float):
+        """Record a flood wait so channels avoid the session until it passes."""
+        session.flood_until = max(session.flood_until, time.monotonic() + seconds)
+        session.rate_limiter.on_flood_wait(seconds)
+
+    async def start_all(self):
+        """Connect and authorize every session."""
+        for session in self.sessions:
+            await session.client.start()
+
+    async def disconnect_all(self):
+        """Disconnect every session."""
+        for session in self.sessions:
+            await session.client.disconnect()
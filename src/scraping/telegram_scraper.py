@@ -4,40 +4,103 @@ import asyncio
 import logging
 import json
 import os
-from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+import time
+from contextlib import nullcontext
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Any, Awaitable, Callable, Optional, Tuple
 from pathlib import Path
 import pandas as pd
-from telethon import TelegramClient
-from telethon.tl.types import MessageMediaPhoto, MessageMediaDocument
-from telethon.errors import FloodWaitError, ChannelPrivateError, UsernameNotOccupiedError
+from telethon.tl.types import InputPeerChannel, MessageMediaPhoto, MessageMediaDocument
+from telethon.errors import (
+    ChannelInvalidError,
+    ChannelPrivateError,
+    FloodWaitError,
+    PeerIdInvalidError,
+    UsernameNotOccupiedError
+)
 import nest_asyncio
 
 from src.config import Config
 from src.utils import DatabaseManager
+from src.scraping.checkpoints import CheckpointStore
+from src.scraping.entity_cache import EntityCache
+from src.scraping.media_downloader import MediaCallbackError, MediaDownloadPool
+from src.scraping.media_store import MediaStore
+from src.scraping.lake_catalog import ALBUMS, IMAGE, MESSAGES, LakeCatalog
+from src.scraping.metrics import ScraperMetrics
+from src.scraping.session_pool import TelegramSession, TelegramSessionPool
+from src.scraping.lake_io import NdjsonLakeWriter, iter_lake_records, lake_file_name
+from src.scraping.parquet_lake import ParquetLakeWriter, PARQUET_DATASET_DIR
 
 # Apply nest_asyncio to handle asyncio in Jupyter notebooks
 nest_asyncio.apply()
 
 logger = logging.getLogger(__name__)
 
+# Telethon fetches channel history in pages of this many messages
+MESSAGES_PER_REQUEST = 100
+
+
+class RequestBudgetExceeded(Exception):
+    """Raised when the global Telegram request budget has been spent."""
+
+
+class RequestBudget:
+    """Global cap on the number of Telegram API requests made in one run."""
+    
+    def __init__(self, max_requests: int = 0):
+        self.max_requests = max_requests
+        self.used = 0
+    
+    @property
+    def exhausted(self) -> bool:
+        """Whether no further requests may be made."""
+        return bool(self.max_requests) and self.used >= self.max_requests
+    
+    def spend(self, requests: int = 1):
+        """Charge requests against the budget, raising once it is spent."""
+        if self.exhausted:
+            raise RequestBudgetExceeded(
+                f"Request budget of {self.max_requests} requests exhausted"
+            )
+        self.used += requests
+
+
 class TelegramScraper:
     """Scrapes data from Telegram channels."""
     
-    def __init__(self, config: Config, db_manager: DatabaseManager):
+    def __init__(
+        self,
+        config: Config,
+        db_manager: DatabaseManager,
+        session_pool: Optional[TelegramSessionPool] = None
+    ):
         self.config = config
         self.db_manager = db_manager
         self.client = None
+        self.session_pool = session_pool
+        self.request_budget = RequestBudget(self.config.SCRAPER_REQUEST_BUDGET)
+        self.channel_timings: Dict[str, float] = {}
+        self.metrics = ScraperMetrics()
+        self.albums: Dict[str, List[Dict[str, Any]]] = {}
+        self.checkpoints = CheckpointStore(self.config.CHECKPOINT_PATH)
+        self.entity_cache = EntityCache(
+            self.config.ENTITY_CACHE_PATH,
+            ttl_seconds=self.config.ENTITY_CACHE_TTL_HOURS * 3600
+        )
+        self.media_store = (
+            MediaStore(self.config.DATA_LAKE_PATH)
+            if self.config.MEDIA_STORE_LAYOUT == 'content' else None
+        )
+        self.lake_catalog = LakeCatalog(self.config.DATA_LAKE_PATH)
         self._initialize_client()
     
     def _initialize_client(self):
-        """Initialize Telegram client."""
+        """Initialize the Telegram session pool; `client` is its first session's client."""
         try:
-            self.client = TelegramClient(
-                'telegram_session',
-                self.config.TELEGRAM_API_ID,
-                self.config.TELEGRAM_API_HASH
-            )
+            if self.session_pool is None:
+                self.session_pool = TelegramSessionPool.from_config(self.config)
+            self.client = self.session_pool.default.client
             logger.info("Telegram client initialized")
         except Exception as e:
             logger.error(f"Failed to initialize Telegram client: {e}")
@@ -47,74 +110,386 @@ class TelegramScraper:
         self, 
         channel_username: str, 
         limit: int = 100,
-        days_back: int = 30
+        days_back: int = 30,
+        incremental: bool = True,
+        on_message: Optional[Callable[[Dict[str, Any]], None]] = None
     ) -> List[Dict[str, Any]]:
         """
         Scrape messages from a specific Telegram channel.
         
+        When incremental and the channel has a checkpoint, only messages newer
+        than the stored high-water mark are fetched, oldest first, so a run cut
+        short by `limit` resumes from where it stopped on the next run.
+        
         Args:
             channel_username: Channel username without @
             limit: Maximum number of messages to scrape
             days_back: Number of days to look back
+            incremental: Resume from the channel's checkpoint instead of
+                        re-reading the whole `days_back` window
+            on_message: Called with each message once it is complete (after
+                        its media download, if any), e.g. to stream it to the lake
             
         Returns:
             List of message dictionaries
         """
         messages_data = []
         
+        async def collect(chunk: List[Dict[str, Any]]):
+            messages_data.extend(chunk)
+        
+        await self.stream_channel(
+            channel_username,
+            collect,
+            limit=limit,
+            days_back=days_back,
+            incremental=incremental,
+            on_message=on_message
+        )
+        return messages_data
+    
+    async def stream_channel(
+        self,
+        channel_username: str,
+        on_chunk: Callable[[List[Dict[str, Any]]], Awaitable[None]],
+        limit: int = 100,
+        days_back: int = 30,
+        incremental: bool = True,
+        chunk_size: Optional[int] = None,
+        on_message: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Tuple[int, bool]:
+        """
+        Scrape a channel, handing messages on in chunks instead of keeping them.
+        
+        Each chunk is passed to `on_chunk` once all of its media downloads have
+        finished, then released, so memory stays bounded by `chunk_size`
+        however many messages are scraped. Errors raised by `on_chunk`
+        propagate; scraping errors end the walk early, and the messages
+        gathered so far are still handed on. Errors from `on_message` in the
+        media pool propagate without handing on the chunk they belong to.
+        
+        Args:
+            channel_username: Channel username without @
+            on_chunk: Awaited with each chunk of complete message dictionaries
+            limit: Maximum number of messages to scrape
+            days_back: Number of days to look back
+            incremental: Resume from the channel's checkpoint
+            chunk_size: Messages per chunk. If None, everything is one chunk
+            on_message: Called with each message once it is complete
+            
+        Returns:
+            Tuple of the number of messages handed to `on_chunk` and whether
+            the walk completed; False if it ended early on an error, a flood
+            wait or the request budget
+        """
+        count = 0
+        completed = False
+        chunk: List[Dict[str, Any]] = []
+        flush_failed = False
+        session = self.session_pool.session_for(channel_username)
+        
+        async def flush():
+            nonlocal chunk, count, flush_failed
+            pending, chunk = chunk, []
+            try:
+                await on_chunk(pending)
+            except Exception:
+                flush_failed = True
+                raise
+            count += len(pending)
+            self.metrics.inc(channel_username, 'messages_total', len(pending))
+        
         try:
-            await self.client.start()
-            logger.info(f"Started scraping channel: {channel_username}")
+            await session.client.start()
+            logger.info(f"Started scraping channel: {channel_username} (session {session.name})")
             
-            # Calculate date range
-            end_date = datetime.now()
+            # Calculate date range (Telegram message dates are UTC-aware)
+            end_date = datetime.now(timezone.utc)
             start_date = end_date - timedelta(days=days_back)
+            min_id = self.checkpoints.get(channel_username) if incremental else 0
             
             # Get channel entity
             try:
-                channel = await self.client.get_entity(channel_username)
+                channel = await self._resolve_channel(session, channel_username)
             except (ChannelPrivateError, UsernameNotOccupiedError) as e:
                 logger.error(f"Channel {channel_username} not accessible: {e}")
-                return messages_data
+                return count, completed
             
-            # Scrape messages
-            message_count = 0
-            async for message in self.client.iter_messages(
-                channel, 
-                limit=limit,
-                offset_date=end_date
-            ):
-                # Stop if message is older than start_date
-                if message.date < start_date:
-                    break
-                
-                message_data = await self._extract_message_data(
-                    message, 
-                    channel_username
+            if min_id:
+                logger.info(f"Resuming {channel_username} after message {min_id}")
+            
+            def open_history(client, entity, remaining, resume_after):
+                return self._iter_history(
+                    client, entity, remaining, start_date, end_date, min_id, resume_after
                 )
-                messages_data.append(message_data)
-                message_count += 1
-                
-                # Handle rate limiting
-                if message_count % 50 == 0:
-                    await asyncio.sleep(1)
             
-            logger.info(f"Scraped {len(messages_data)} messages from {channel_username}")
+            history = self._iter_resumable(session, channel_username, channel, open_history, limit)
+            async with self._new_media_pool() as media_pool:
+                async for message_data in self._extract_stream(
+                    self._until(history, start_date),
+                    channel_username,
+                    media_pool,
+                    on_message
+                ):
+                    chunk.append(message_data)
+                    if chunk_size and len(chunk) >= chunk_size:
+                        if media_pool:
+                            # Image paths must be filled in before the chunk is handed on
+                            await media_pool.drain()
+                        await flush()
+            completed = True
             
+        except RequestBudgetExceeded as e:
+            logger.warning(f"Stopped scraping {channel_username} early: {e}")
         except FloodWaitError as e:
-            logger.warning(f"Rate limited. Waiting {e.seconds} seconds")
-            await asyncio.sleep(e.seconds)
+            logger.warning(
+                f"Giving up on {channel_username} after {self.config.SCRAPER_MAX_FLOOD_RETRIES} "
+                f"flood waits ({e.seconds}s requested); keeping {count + len(chunk)} messages"
+            )
         except Exception as e:
+            # A failed lake write must not be loaded and checkpointed as if
+            # it had succeeded, whether it ran inline or in the media pool
+            if flush_failed or isinstance(e, MediaCallbackError):
+                raise
             logger.error(f"Error scraping channel {channel_username}: {e}")
         
-        return messages_data
+        # The media pool has been joined, so the remainder is complete
+        if chunk:
+            await flush()
+        logger.info(f"Scraped {count} messages from {channel_username}")
+        
+        return count, completed
     
-    async def _extract_message_data(
-        self, 
-        message, 
-        channel_name: str
-    ) -> Dict[str, Any]:
-        """Extract relevant data from a Telegram message."""
+    async def _iter_resumable(
+        self,
+        session: TelegramSession,
+        channel_username: str,
+        channel,
+        open_history: Callable,
+        limit: Optional[int] = None,
+        resume_after: Optional[int] = None
+    ):
+        """
+        Yield a channel's messages, surviving flood waits.
+        
+        `open_history(client, entity, remaining, resume_after)` builds the
+        underlying iterator. After a FloodWaitError the walk either waits on
+        the same session or fails over to another account, then reopens the
+        history after the last message yielded. `resume_after` continues a
+        walk persisted by an earlier run. A cached input peer that Telegram
+        rejects is dropped from the entity cache and resolved again.
+        """
+        last_id = resume_after
+        seen = 0
+        flood_retries = 0
+        while True:
+            remaining = limit - seen if limit else None
+            try:
+                async for message in open_history(session.client, channel, remaining, last_id):
+                    # Each page of history is one throttled request
+                    if seen % MESSAGES_PER_REQUEST == 0:
+                        await self._throttle(session)
+                    seen += 1
+                    last_id = message.id
+                    yield message
+                return
+            except (ChannelInvalidError, PeerIdInvalidError):
+                if not isinstance(channel, InputPeerChannel):
+                    raise
+                # The cached access hash is no longer valid for this account
+                self.entity_cache.invalidate(session.name, channel_username)
+                channel = await self._resolve_channel(session, channel_username)
+            except FloodWaitError as e:
+                flood_retries += 1
+                self.metrics.inc(channel_username, 'flood_waits_total')
+                self.metrics.inc(channel_username, 'flood_wait_seconds_total', e.seconds)
+                if flood_retries > self.config.SCRAPER_MAX_FLOOD_RETRIES:
+                    raise
+                self.session_pool.mark_flood_limited(session, e.seconds)
+                fallback = self.session_pool.session_for(channel_username)
+                if (
+                    fallback is not session
+                    and e.seconds >= self.config.SESSION_FAILOVER_SECONDS
+                ):
+                    # Another account can carry on while this one waits
+                    logger.warning(
+                        f"Session {session.name} flood-limited for {e.seconds} seconds; "
+                        f"failing {channel_username} over to {fallback.name} after message {last_id}"
+                    )
+                    session = fallback
+                    await session.client.start()
+                    channel = await self._resolve_channel(session, channel_username)
+                else:
+                    logger.warning(
+                        f"Rate limited on {channel_username}. Waiting {e.seconds} seconds, "
+                        f"then resuming after message {last_id}"
+                    )
+                    await session.rate_limiter.wait()
+    
+    @staticmethod
+    async def _until(messages, start_date: datetime):
+        """Pass messages through until one is older than `start_date`."""
+        async for message in messages:
+            if message.date < start_date:
+                return
+            yield message
+    
+    async def _extract_stream(
+        self,
+        messages,
+        channel_username: str,
+        media_pool: Optional[MediaDownloadPool] = None,
+        on_message: Optional[Callable[[Dict[str, Any]], None]] = None
+    ):
+        """
+        Turn messages into records, grouping albums.
+        
+        Consecutive messages sharing a grouped_id are buffered and extracted
+        together; records are yielded in message order.
+        """
+        album = []
+        try:
+            async for message in messages:
+                grouped_id = getattr(message, 'grouped_id', None)
+                if album and album[0].grouped_id != grouped_id:
+                    for message_data in await self._extract_album(
+                        album, channel_username, media_pool, on_message
+                    ):
+                        yield message_data
+                    album = []
+                if grouped_id:
+                    album.append(message)
+                    continue
+                
+                yield await self._extract_message_data(
+                    message, 
+                    channel_username,
+                    media_pool=media_pool,
+                    on_complete=on_message
+                )
+        except FloodWaitError:
+            # Giving up on the channel: keep the buffered album rather than drop it
+            for message_data in await self._extract_album(
+                album, channel_username, media_pool, on_message
+            ) if album else []:
+                yield message_data
+            raise
+        
+        if album:
+            for message_data in await self._extract_album(
+                album, channel_username, media_pool, on_message
+            ):
+                yield message_data
+    
+    def _iter_history(
+        self,
+        client,
+        channel,
+        limit: Optional[int],
+        start_date: datetime,
+        end_date: datetime,
+        min_id: int = 0,
+        resume_after: Optional[int] = None
+    ):
+        """
+        Build the message iterator for one pass over a channel's history.
+        
+        Cold starts walk newest first from `end_date`; with a checkpoint the
+        walk goes oldest first from `min_id`. `resume_after` continues a pass
+        that was interrupted after that message id.
+        """
+        if min_id:
+            return client.iter_messages(
+                channel,
+                limit=limit,
+                min_id=max(min_id, resume_after or 0),
+                offset_date=start_date,
+                reverse=True
+            )
+        
+        if resume_after:
+            return client.iter_messages(
+                channel,
+                limit=limit,
+                offset_id=resume_after
+            )
+        
+        return client.iter_messages(
+            channel, 
+            limit=limit,
+            offset_date=end_date
+        )
+    
+    async def _throttle(self, session: TelegramSession, requests: int = 1):
+        """Charge requests to the global budget and wait for the session's rate-limit tokens."""
+        self.request_budget.spend(requests)
+        await session.rate_limiter.acquire(requests)
+    
+    async def _with_flood_retry(
+        self,
+        session: TelegramSession,
+        request,
+        channel_name: Optional[str] = None
+    ):
+        """
+        Make a throttled API call, waiting out and retrying flood waits.
+        
+        Args:
+            session: Session whose account makes the call
+            request: Zero-argument callable returning the awaitable to run
+            channel_name: Channel that flood waits are counted against
+        """
+        for attempt in range(self.config.SCRAPER_MAX_FLOOD_RETRIES + 1):
+            await self._throttle(session)
+            try:
+                return await request()
+            except FloodWaitError as e:
+                if channel_name:
+                    self.metrics.inc(channel_name, 'flood_waits_total')
+                    self.metrics.inc(channel_name, 'flood_wait_seconds_total', e.seconds)
+                if attempt == self.config.SCRAPER_MAX_FLOOD_RETRIES:
+                    raise
+                self.session_pool.mark_flood_limited(session, e.seconds)
+                await session.rate_limiter.wait()
+    
+    async def _resolve_channel(self, session: TelegramSession, channel_username: str):
+        """
+        Resolve a channel username for the session's account.
+        
+        Returns an InputPeerChannel built from the entity cache when it holds
+        a fresh entry, so no request is made; otherwise resolves the username
+        with get_entity and caches the channel id and access hash.
+        """
+        cached = self.entity_cache.get(session.name, channel_username)
+        if cached:
+            self.metrics.inc(channel_username, 'entity_cache_hits_total')
+            return InputPeerChannel(cached['channel_id'], cached['access_hash'])
+        
+        with self.metrics.timer(channel_username, 'entity_resolve'):
+            entity = await self._with_flood_retry(
+                session,
+                lambda: session.client.get_entity(channel_username),
+                channel_name=channel_username
+            )
+        self.metrics.inc(channel_username, 'entity_resolutions_total')
+        if getattr(entity, 'access_hash', None) is not None:
+            self.entity_cache.put(session.name, channel_username, entity.id, entity.access_hash)
+        return entity
+    
+    def _new_media_pool(self):
+        """Create the media download pool, or a no-op context for inline downloads."""
+        if self.config.MEDIA_DOWNLOAD_WORKERS <= 0:
+            return nullcontext()
+        
+        return MediaDownloadPool(
+            self._download_media,
+            workers=self.config.MEDIA_DOWNLOAD_WORKERS,
+            max_bytes_in_flight=self.config.MEDIA_MAX_BYTES_IN_FLIGHT,
+            queue_size=self.config.MEDIA_QUEUE_SIZE
+        )
+    
+    def _build_message_data(self, message, channel_name: str) -> Dict[str, Any]:
+        """Extract relevant data from a Telegram message, without downloading media."""
         
         # Basic message data
         message_data = {
@@ -140,31 +515,121 @@ class TelegramScraper:
         if message.media:
             if isinstance(message.media, MessageMediaPhoto):
                 message_data['media_type'] = 'photo'
-                image_path = await self._download_media(message, channel_name)
-                message_data['image_path'] = image_path
             elif isinstance(message.media, MessageMediaDocument):
                 # Check if it's an image document
                 if message.media.document.mime_type and message.media.document.mime_type.startswith('image/'):
                     message_data['media_type'] = 'image'
-                    image_path = await self._download_media(message, channel_name)
-                    message_data['image_path'] = image_path
                 else:
                     message_data['media_type'] = 'document'
         
         return message_data
     
+    async def _extract_message_data(
+        self, 
+        message, 
+        channel_name: str,
+        media_pool: Optional[MediaDownloadPool] = None,
+        on_complete: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Extract relevant data from a Telegram message.
+        
+        With a media pool the image download is queued and `image_path` is
+        filled in by a download worker once it completes. `on_complete` is
+        called with the record as soon as it is final.
+        """
+        message_data = self._build_message_data(message, channel_name)
+        
+        if message_data['media_type'] in ('photo', 'image'):
+            if media_pool:
+                await media_pool.submit(message, channel_name, message_data, on_done=on_complete)
+                return message_data
+            message_data['image_path'] = await self._download_media(message, channel_name)
+        
+        if on_complete:
+            on_complete(message_data)
+        
+        return message_data
+    
+    async def _extract_album(
+        self,
+        messages: List[Any],
+        channel_name: str,
+        media_pool: Optional[MediaDownloadPool] = None,
+        on_complete: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Extract the messages of one album (shared grouped_id) as a unit.
+        
+        All of the album's images are queued as a single download job, and
+        the album's metadata is recorded once when that job completes.
+        """
+        records = [self._build_message_data(message, channel_name) for message in messages]
+        media = [
+            (message, record) for message, record in zip(messages, records)
+            if record['media_type'] in ('photo', 'image')
+        ]
+        
+        def finish(_downloaded=None):
+            self._record_album(channel_name, records)
+            if on_complete:
+                for record in records:
+                    on_complete(record)
+        
+        if media_pool and media:
+            await media_pool.submit_batch(
+                [message for message, _ in media],
+                channel_name,
+                [record for _, record in media],
+                on_done=finish
+            )
+        else:
+            for message, record in media:
+                record['image_path'] = await self._download_media(message, channel_name)
+            finish()
+        
+        return records
+    
+    def _record_album(self, channel_name: str, records: List[Dict[str, Any]]):
+        """Keep one metadata row for an album, to be persisted with its channel."""
+        records = sorted(records, key=lambda record: record['message_id'])
+        caption = next((record['text'] for record in records if record['text']), '')
+        self.albums.setdefault(channel_name, []).append({
+            'grouped_id': records[0]['raw_data']['grouped_id'],
+            'channel_name': channel_name,
+            'date': records[0]['date'],
+            'message_ids': [record['message_id'] for record in records],
+            'caption': caption,
+            'media_count': sum(1 for record in records if record['media_type'] in ('photo', 'image')),
+            'image_paths': [record['image_path'] for record in records if record['image_path']],
+            'scraped_at': datetime.now()
+        })
+    
     async def _download_media(self, message, channel_name: str) -> Optional[str]:
         """Download media from message and return file path."""
         try:
-            # Create directory structure
-            date_str = message.date.strftime('%Y-%m-%d')
-            media_dir = Path(self.config.DATA_LAKE_PATH) / 'images' / channel_name / date_str
-            media_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Download media
-            file_path = await message.download_media(file=str(media_dir))
+            with self.metrics.timer(channel_name, 'media_download'):
+                if self.media_store:
+                    return await self._download_media_content_addressed(message, channel_name)
+                
+                # Create directory structure
+                date_str = message.date.strftime('%Y-%m-%d')
+                media_dir = Path(self.config.DATA_LAKE_PATH) / 'images' / channel_name / date_str
+                media_dir.mkdir(parents=True, exist_ok=True)
+                
+                # Download media with the account that fetched the message
+                session = self.session_pool.session_for_client(message.client)
+                file_path = await self._with_flood_retry(
+                    session,
+                    lambda: message.download_media(file=str(media_dir)),
+                    channel_name=channel_name
+                )
             
             if file_path:
+                self.metrics.inc(channel_name, 'media_downloads_total')
+                self.metrics.inc(channel_name, 'media_bytes_total', os.path.getsize(file_path))
+                # Cataloguing reads the file for its checksum; keep that off the event loop
+                await asyncio.to_thread(self.catalog_file, file_path, IMAGE, channel_name, date_str)
                 # Return relative path from data lake root
                 relative_path = os.path.relpath(file_path, self.config.DATA_LAKE_PATH)
                 logger.debug(f"Downloaded media: {relative_path}")
@@ -175,18 +640,93 @@ class TelegramScraper:
         
         return None
     
+    async def _download_media_content_addressed(self, message, channel_name: str) -> Optional[str]:
+        """Download media into the content-addressed store, skipping known photos."""
+        media = message.photo or message.document
+        media_id = getattr(media, 'id', None)
+        date_str = message.date.strftime('%Y-%m-%d')
+        
+        stored = self.media_store.lookup(media_id) if media_id is not None else None
+        if stored:
+            logger.debug(f"Skipping download of known media {media_id}: {stored['path']}")
+            self.metrics.inc(channel_name, 'media_dedup_hits_total')
+        else:
+            session = self.session_pool.session_for_client(message.client)
+            data = await self._with_flood_retry(
+                session,
+                lambda: message.download_media(file=bytes),
+                channel_name=channel_name
+            )
+            if not data:
+                return None
+            self.metrics.inc(channel_name, 'media_downloads_total')
+            self.metrics.inc(channel_name, 'media_bytes_total', len(data))
+            extension = getattr(message.file, 'ext', None) or '.jpg'
+            stored = self.media_store.put(data, extension, media_id=media_id)
+            logger.debug(f"Downloaded media: {stored['path']}")
+        
+        self.media_store.link(channel_name, date_str, message.id, stored['sha256'])
+        self.catalog_file(stored['path'], IMAGE, channel_name, date_str, checksum=stored['sha256'])
+        return stored['path']
+    
+    def catalog_file(self, file_path: Path, kind: str, channel_name: str, date_str: str, **kwargs):
+        """Record a written lake file or image in the lake catalog (see LakeCatalog.record_file)."""
+        try:
+            self.lake_catalog.record_file(file_path, kind, channel_name, date_str, **kwargs)
+        except Exception:
+            # Already logged; the catalog must never fail a scrape
+            pass
+    
+    def _lake_file_path(
+        self,
+        channel_name: str,
+        date_str: Optional[str] = None,
+        lake_format: Optional[str] = None
+    ) -> Path:
+        """Path of a channel's data lake file for a day (today by default) in the configured format."""
+        date_str = date_str or datetime.now().strftime('%Y-%m-%d')
+        data_dir = Path(self.config.DATA_LAKE_PATH) / 'telegram_messages' / date_str
+        data_dir.mkdir(parents=True, exist_ok=True)
+        return data_dir / lake_file_name(
+            channel_name,
+            lake_format or self.config.LAKE_FORMAT,
+            self.config.LAKE_COMPRESSION
+        )
+    
+    def open_lake_writer(self, channel_name: str):
+        """
+        Open a streaming writer for a channel in the configured lake format.
+        
+        NDJSON appends to today's file of the channel; Parquet writes into
+        the dataset partitioned by channel and message date.
+        """
+        if self.config.LAKE_FORMAT == 'parquet':
+            return ParquetLakeWriter(
+                Path(self.config.DATA_LAKE_PATH) / PARQUET_DATASET_DIR,
+                batch_size=self.config.PARQUET_BATCH_SIZE
+            )
+        return NdjsonLakeWriter(self._lake_file_path(channel_name))
+    
     def save_to_data_lake(self, messages_data: List[Dict[str, Any]], channel_name: str):
-        """Save scraped data to data lake as JSON files."""
+        """Save scraped data to data lake as JSON, NDJSON or Parquet files."""
         try:
-            # Create directory structure
-            date_str = datetime.now().strftime('%Y-%m-%d')
-            data_dir = Path(self.config.DATA_LAKE_PATH) / 'telegram_messages' / date_str
-            data_dir.mkdir(parents=True, exist_ok=True)
+            if self.config.LAKE_FORMAT in ('ndjson', 'parquet'):
+                with self.open_lake_writer(channel_name) as writer:
+                    writer.write_many(messages_data)
+                file_path = writer.file_path
+            else:
+                file_path = self._lake_file_path(channel_name)
+                messages_data = self._merge_json_lake_file(file_path, messages_data)
+                # Save to JSON file, replacing it only once fully written
+                tmp_path = file_path.with_name(file_path.name + '.tmp')
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(messages_data, f, ensure_ascii=False, indent=2, default=str)
+                os.replace(tmp_path, file_path)
             
-            # Save to JSON file
-            file_path = data_dir / f'{channel_name}.json'
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(messages_data, f, ensure_ascii=False, indent=2, default=str)
+            if self.config.LAKE_FORMAT == 'json':
+                self.catalog_file(file_path, MESSAGES, channel_name, file_path.parent.name, row_count=len(messages_data))
+            elif self.config.LAKE_FORMAT == 'ndjson':
+                self.catalog_file(file_path, MESSAGES, channel_name, file_path.parent.name)
             
             logger.info(f"Saved {len(messages_data)} messages to {file_path}")
             
@@ -194,6 +734,75 @@ class TelegramScraper:
             logger.error(f"Failed to save data to data lake: {e}")
             raise
     
+    @staticmethod
+    def _merge_json_lake_file(file_path: Path, messages_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Combine new messages with those already in a day's JSON lake file.
+
+        A JSON file is rewritten as a whole, so without this a second
+        incremental run on the same day would drop the first run's messages.
+        Messages scraped again replace their earlier copy.
+        """
+        if not file_path.exists():
+            return messages_data
+        new_ids = {message['message_id'] for message in messages_data}
+        kept = [message for message in iter_lake_records(file_path) if message.get('message_id') not in new_ids]
+        if kept:
+            logger.info(f"Keeping {len(kept)} messages already in {file_path}")
+        return kept + messages_data
+    
+    def save_to_date_partitions(self, messages_data: List[Dict[str, Any]], channel_name: str):
+        """
+        Append messages to the lake partition of the day each was posted.
+        
+        Used by backfills, whose messages belong to past days rather than
+        the day of the run. The JSON format cannot be appended to, so it is
+        written as NDJSON here; the loaders read both.
+        """
+        try:
+            if self.config.LAKE_FORMAT == 'parquet':
+                # The Parquet dataset is already partitioned by message date
+                with self.open_lake_writer(channel_name) as writer:
+                    writer.write_many(messages_data)
+                return
+            
+            by_date: Dict[str, List[Dict[str, Any]]] = {}
+            for message in messages_data:
+                by_date.setdefault(message['date'].strftime('%Y-%m-%d'), []).append(message)
+            
+            for date_str, messages in sorted(by_date.items()):
+                file_path = self._lake_file_path(channel_name, date_str, lake_format='ndjson')
+                with NdjsonLakeWriter(file_path) as writer:
+                    writer.write_many(messages)
+                self.catalog_file(file_path, MESSAGES, channel_name, date_str)
+                logger.debug(f"Appended {len(messages)} messages to {file_path}")
+            
+        except Exception as e:
+            logger.error(f"Failed to save backfilled data for {channel_name}: {e}")
+            raise
+    
+    def save_albums(self, channel_name: str):
+        """Persist a channel's album metadata to the lake and the database, once per group."""
+        albums = self.albums.pop(channel_name, [])
+        if not albums:
+            return
+        
+        try:
+            date_str = datetime.now().strftime('%Y-%m-%d')
+            file_path = Path(self.config.DATA_LAKE_PATH) / 'telegram_albums' / date_str / f'{channel_name}.ndjson'
+            with NdjsonLakeWriter(file_path) as writer:
+                writer.write_many(albums)
+            self.catalog_file(file_path, ALBUMS, channel_name, date_str)
+            
+            # Merged into the album's existing row, if any
+            self.db_manager.upsert_albums(albums)
+            
+            logger.info(f"Saved {len(albums)} albums for {channel_name}")
+            
+        except Exception as e:
+            logger.error(f"Failed to save albums for {channel_name}: {e}")
+            raise
+    
     def load_to_database(self, messages_data: List[Dict[str, Any]]):
         """Load scraped data into PostgreSQL database."""
         try:
@@ -205,61 +814,424 @@ class TelegramScraper:
             df = pd.DataFrame(messages_data)
             
             # Convert raw_data to JSON string for database storage
-            df['raw_data'] = df['raw_data'].apply(json.dumps)
+            df['raw_data'] = df['raw_data'].apply(lambda x: json.dumps(x, default=str))
             
-            # Insert into database
-            self.db_manager.bulk_insert_dataframe(
-                df, 
-                'telegram_messages', 
-                schema='raw'
-            )
+            # Insert into database, merging messages loaded before
+            self.db_manager.load_messages(df)
             
         except Exception as e:
             logger.error(f"Failed to load data into database: {e}")
             raise
     
+    async def _scrape_and_store_channel(
+        self,
+        channel: str,
+        limit: int,
+        days_back: int,
+        incremental: bool = True
+    ) -> int:
+        """
+        Scrape one channel, persist it and record how long it took.
+        
+        Messages are persisted every LOAD_BATCH_SIZE messages and then
+        dropped, so memory does not grow with the size of the scrape. The
+        legacy JSON format rewrites whole files, so it is persisted in one
+        chunk at the end.
+        
+        Returns:
+            Number of messages persisted
+        """
+        started = time.perf_counter()
+        streaming = self.config.LAKE_FORMAT in ('ndjson', 'parquet')
+        # Checkpointed walks run oldest first, so the high-water mark can
+        # advance with every chunk; cold starts run newest first and may
+        # only advance it once the whole walk completed and is stored
+        ascending = incremental and bool(self.checkpoints.get(channel))
+        max_message_id = 0
+        
+        try:
+            with self.open_lake_writer(channel) if streaming else nullcontext() as writer:
+                
+                def write_to_lake(record: Dict[str, Any]):
+                    with self.metrics.timer(channel, 'lake_write'):
+                        writer.write(record)
+                    self.metrics.inc(channel, 'lake_records_total')
+                
+                async def persist(chunk: List[Dict[str, Any]]):
+                    nonlocal max_message_id
+                    if streaming:
+                        # The lake must hold the chunk before the database
+                        # and the checkpoint move past it. The media pool is
+                        # drained, so nothing writes while this runs
+                        with self.metrics.timer(channel, 'lake_write'):
+                            await asyncio.to_thread(writer.flush)
+                    else:
+                        # Save to data lake
+                        with self.metrics.timer(channel, 'lake_write'):
+                            await asyncio.to_thread(self.save_to_data_lake, chunk, channel)
+                        self.metrics.inc(channel, 'lake_records_total', len(chunk))
+                    # Load to database
+                    with self.metrics.timer(channel, 'db_load'):
+                        await asyncio.to_thread(self.load_to_database, chunk)
+                        await asyncio.to_thread(self.save_albums, channel)
+                    self.metrics.inc(channel, 'db_rows_total', len(chunk))
+                    
+                    max_message_id = max(max_message_id, *(message['message_id'] for message in chunk))
+                    if ascending:
+                        self.checkpoints.update(channel, max_message_id)
+                
+                # Stream each message to the lake as soon as it is complete
+                count, completed = await self.stream_channel(
+                    channel,
+                    persist,
+                    limit=limit,
+                    days_back=days_back,
+                    incremental=incremental,
+                    chunk_size=self.config.LOAD_BATCH_SIZE if streaming else None,
+                    on_message=write_to_lake if streaming else None
+                )
+                if streaming:
+                    # Parquet writes its last buffered batch on close
+                    with self.metrics.timer(channel, 'lake_write'):
+                        writer.close()
+            if streaming and count:
+                if self.config.LAKE_FORMAT == 'ndjson':
+                    await asyncio.to_thread(
+                        self.catalog_file, writer.file_path, MESSAGES, channel, writer.file_path.parent.name
+                    )
+                logger.info(f"Streamed {writer.count} messages to {writer.file_path}")
+            
+            # Only advance the high-water mark once the data is persisted. A
+            # newest-first walk that stopped early left older messages behind,
+            # so its checkpoint stays put and the next run walks them again
+            if ascending or completed:
+                self.checkpoints.update(channel, max_message_id)
+            else:
+                logger.warning(
+                    f"Not advancing the checkpoint of {channel}: its first walk stopped early"
+                )
+            
+            return count
+            
+        except Exception as e:
+            logger.error(f"Failed to scrape channel {channel}: {e}")
+            return 0
+        finally:
+            self.channel_timings[channel] = time.perf_counter() - started
+            self.metrics.observe(channel, 'scrape', self.channel_timings[channel])
+            self.export_metrics()
+            logger.info(f"Channel {channel} finished in {self.channel_timings[channel]:.2f}s")
+    
+    def export_metrics(self):
+        """Write the run's metrics to Config.METRICS_PATH, if set."""
+        if not self.config.METRICS_PATH:
+            return
+        try:
+            self.metrics.write(self.config.METRICS_PATH)
+        except Exception:
+            # Already logged; metrics must never fail a scrape
+            pass
+    
+    def _log_timing_summary(self, wall_clock: float):
+        """Log per-channel timings and the speedup over a serial run."""
+        serial_time = sum(self.channel_timings.values())
+        snapshot = self.metrics.snapshot()
+        for channel, seconds in sorted(self.channel_timings.items(), key=lambda item: -item[1]):
+            metrics = snapshot.get(channel, {})
+            logger.info(
+                f"  {channel}: {seconds:.2f}s, {metrics.get('messages_total', 0):.0f} messages "
+                f"({metrics.get('messages_per_second', 0):.1f}/s), "
+                f"{metrics.get('media_bytes_total', 0) / 1e6:.1f} MB media in "
+                f"{metrics.get('media_download_seconds_total', 0):.1f}s, "
+                f"{metrics.get('flood_wait_seconds_total', 0):.0f}s flood wait, "
+                f"lake {metrics.get('lake_write_seconds_total', 0):.2f}s, "
+                f"db {metrics.get('db_load_seconds_total', 0):.2f}s"
+            )
+        if wall_clock > 0:
+            logger.info(
+                f"Scraped {len(self.channel_timings)} channels in {wall_clock:.2f}s "
+                f"(sum of channel times {serial_time:.2f}s, speedup {serial_time / wall_clock:.2f}x)"
+            )
+    
     async def scrape_all_channels(
         self, 
         limit_per_channel: int = 100,
-        days_back: int = 30
-    ) -> Dict[str, List[Dict[str, Any]]]:
-        """Scrape all configured channels."""
-        all_channel_data = {}
+        days_back: int = 30,
+        concurrency: Optional[int] = None,
+        incremental: bool = True
+    ) -> Dict[str, int]:
+        """
+        Scrape all configured channels.
         
-        for channel in self.config.TELEGRAM_CHANNELS:
-            logger.info(f"Starting to scrape channel: {channel}")
+        Args:
+            limit_per_channel: Maximum number of messages to scrape per channel
+            days_back: Number of days to look back
+            concurrency: Number of channels scraped at once over the shared client.
+                        Defaults to Config.SCRAPER_CONCURRENCY; 1 runs the serial loop
+            incremental: Fetch only messages newer than each channel's checkpoint
             
-            try:
-                messages_data = await self.scrape_channel(
-                    channel, 
+        Returns:
+            Dictionary mapping channel names to the number of messages stored
+        """
+        concurrency = concurrency or self.config.SCRAPER_CONCURRENCY
+        message_counts: Dict[str, int] = {}
+        self.channel_timings = {}
+        started = time.perf_counter()
+        
+        await self.session_pool.start_all()
+        
+        if concurrency <= 1:
+            for channel in self.config.TELEGRAM_CHANNELS:
+                if self.request_budget.exhausted:
+                    logger.warning(f"Request budget exhausted, skipping channel: {channel}")
+                    continue
+                
+                logger.info(f"Starting to scrape channel: {channel}")
+                count = await self._scrape_and_store_channel(
+                    channel,
                     limit=limit_per_channel,
-                    days_back=days_back
+                    days_back=days_back,
+                    incremental=incremental
                 )
-                
-                if messages_data:
-                    # Save to data lake
-                    self.save_to_data_lake(messages_data, channel)
-                    
-                    # Load to database
-                    self.load_to_database(messages_data)
-                    
-                    all_channel_data[channel] = messages_data
+                if count:
+                    message_counts[channel] = count
                 
                 # Sleep between channels to avoid rate limiting
-                await asyncio.sleep(5)
-                
-            except Exception as e:
-                logger.error(f"Failed to scrape channel {channel}: {e}")
-                continue
+                await asyncio.sleep(self.config.SCRAPER_CHANNEL_PAUSE)
+        else:
+            logger.info(f"Scraping {len(self.config.TELEGRAM_CHANNELS)} channels with concurrency {concurrency}")
+            semaphore = asyncio.Semaphore(concurrency)
+            
+            async def scrape_with_limit(channel: str):
+                async with semaphore:
+                    if self.request_budget.exhausted:
+                        logger.warning(f"Request budget exhausted, skipping channel: {channel}")
+                        return channel, 0
+                    logger.info(f"Starting to scrape channel: {channel}")
+                    return channel, await self._scrape_and_store_channel(
+                        channel,
+                        limit=limit_per_channel,
+                        days_back=days_back,
+                        incremental=incremental
+                    )
+            
+            results = await asyncio.gather(
+                *(scrape_with_limit(channel) for channel in self.config.TELEGRAM_CHANNELS)
+            )
+            for channel, count in results:
+                if count:
+                    message_counts[channel] = count
         
-        await self.client.disconnect()
+        await self.session_pool.disconnect_all()
         logger.info("Finished scraping all channels")
+        logger.info(
+            f"Entity cache: {self.entity_cache.hits} hits, {self.entity_cache.misses} lookups resolved"
+        )
+        self._log_timing_summary(time.perf_counter() - started)
         
-        return all_channel_data
+        return message_counts
+
+    
+    @staticmethod
+    def _backfill_windows(start_date: datetime, end_date: datetime, window_days: int):
+        """Split [start_date, end_date] into consecutive windows of `window_days` days."""
+        windows = []
+        window_start = start_date
+        range_end = end_date + timedelta(days=1)
+        while window_start < range_end:
+            window_end = min(window_start + timedelta(days=window_days), range_end)
+            windows.append((window_start, window_end))
+            window_start = window_end
+        return windows
+    
+    async def _persist_backfill_chunk(
+        self,
+        channel_name: str,
+        window_key: str,
+        messages_data: List[Dict[str, Any]],
+        media_pool: Optional[MediaDownloadPool] = None
+    ) -> int:
+        """Write a chunk of a backfill window to the lake and database, then checkpoint it."""
+        if not messages_data:
+            return 0
+        
+        if media_pool:
+            # Image paths must be known before the records are written
+            await media_pool.drain()
+        
+        with self.metrics.timer(channel_name, 'lake_write'):
+            await asyncio.to_thread(self.save_to_date_partitions, messages_data, channel_name)
+        with self.metrics.timer(channel_name, 'db_load'):
+            await asyncio.to_thread(self.load_to_database, messages_data)
+            await asyncio.to_thread(self.save_albums, channel_name)
+        for name in ('messages_total', 'lake_records_total', 'db_rows_total'):
+            self.metrics.inc(channel_name, name, len(messages_data))
+        
+        # Messages arrive newest first, so everything above the oldest id is stored
+        self.checkpoints.update_window(
+            channel_name,
+            window_key,
+            resume_after=min(message['message_id'] for message in messages_data)
+        )
+        return len(messages_data)
+    
+    async def _backfill_window(
+        self,
+        channel_username: str,
+        window_start: datetime,
+        window_end: datetime
+    ) -> int:
+        """
+        Scrape and persist one channel's messages posted in [window_start, window_end).
+        
+        The window is walked newest first from `window_end` and persisted every
+        LOAD_BATCH_SIZE messages. An interrupted window resumes below the
+        oldest message it persisted; finished windows are skipped.
+        
+        Returns:
+            Number of messages persisted
+        """
+        window_key = f"{window_start:%Y-%m-%d}_{window_end:%Y-%m-%d}"
+        window = self.checkpoints.get_window(channel_username, window_key)
+        if window.get('done'):
+            logger.info(f"Backfill window {window_key} of {channel_username} already done, skipping")
+            return 0
+        
+        count = 0
+        chunk: List[Dict[str, Any]] = []
+        finished = False
+        started = time.perf_counter()
+        try:
+            session = self.session_pool.session_for(channel_username)
+            channel = await self._resolve_channel(session, channel_username)
+            if window.get('resume_after'):
+                logger.info(
+                    f"Resuming backfill window {window_key} of {channel_username} "
+                    f"below message {window['resume_after']}"
+                )
+            
+            def open_history(client, entity, remaining, resume_after):
+                return self._iter_history(
+                    client, entity, remaining, window_start, window_end, resume_after=resume_after
+                )
+            
+            history = self._iter_resumable(
+                session, channel_username, channel, open_history,
+                resume_after=window.get('resume_after')
+            )
+            async with self._new_media_pool() as media_pool:
+                try:
+                    async for message_data in self._extract_stream(
+                        self._until(history, window_start),
+                        channel_username,
+                        media_pool
+                    ):
+                        chunk.append(message_data)
+                        if len(chunk) >= self.config.LOAD_BATCH_SIZE:
+                            count += await self._persist_backfill_chunk(
+                                channel_username, window_key, chunk, media_pool
+                            )
+                            chunk = []
+                    finished = True
+                except (RequestBudgetExceeded, FloodWaitError) as e:
+                    logger.warning(
+                        f"Backfill window {window_key} of {channel_username} interrupted, "
+                        f"it resumes on the next run: {e}"
+                    )
+                count += await self._persist_backfill_chunk(
+                    channel_username, window_key, chunk, media_pool
+                )
+            
+            if finished:
+                self.checkpoints.update_window(channel_username, window_key, done=True)
+            logger.info(f"Backfilled {count} messages of {channel_username} for {window_key}")
+            
+        except Exception as e:
+            logger.error(f"Backfill window {window_key} of {channel_username} failed: {e}")
+        
+        # Windows of a channel overlap in time, so this sums their durations
+        self.metrics.observe(channel_username, 'scrape', time.perf_counter() - started)
+        return count
+    
+    async def backfill(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        window_days: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        channels: Optional[List[str]] = None
+    ) -> Dict[str, int]:
+        """
+        Scrape a historical date range, split into windows scraped in parallel.
+        
+        Every window keeps its own checkpoint, so rerunning the same backfill
+        after an interruption only scrapes what is missing. Messages are
+        written to the lake partition of the day they were posted.
+        
+        Args:
+            start_date: First day to backfill (UTC)
+            end_date: Last day to backfill, inclusive (UTC)
+            window_days: Days per window. Defaults to Config.BACKFILL_WINDOW_DAYS
+            concurrency: Number of windows scraped at once.
+                        Defaults to Config.SCRAPER_CONCURRENCY
+            channels: Channels to backfill. Defaults to Config.TELEGRAM_CHANNELS
+            
+        Returns:
+            Dictionary mapping channel names to the number of messages stored
+        """
+        window_days = window_days or self.config.BACKFILL_WINDOW_DAYS
+        concurrency = concurrency or self.config.SCRAPER_CONCURRENCY
+        channels = channels or self.config.TELEGRAM_CHANNELS
+        windows = self._backfill_windows(start_date, end_date, window_days)
+        started = time.perf_counter()
+        
+        logger.info(
+            f"Backfilling {len(channels)} channels from {start_date:%Y-%m-%d} to {end_date:%Y-%m-%d} "
+            f"in {len(windows)} windows of {window_days} days, concurrency {concurrency}"
+        )
+        await self.session_pool.start_all()
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def backfill_with_limit(channel: str, window_start: datetime, window_end: datetime):
+            async with semaphore:
+                if self.request_budget.exhausted:
+                    logger.warning(f"Request budget exhausted, skipping backfill of {channel} from {window_start:%Y-%m-%d}")
+                    return channel, 0
+                return channel, await self._backfill_window(channel, window_start, window_end)
+        
+        # Interleave channels so parallel windows spread across sessions
+        results = await asyncio.gather(*(
+            backfill_with_limit(channel, window_start, window_end)
+            for window_start, window_end in windows
+            for channel in channels
+        ))
+        
+        await self.session_pool.disconnect_all()
+        
+        counts: Dict[str, int] = {channel: 0 for channel in channels}
+        for channel, count in results:
+            counts[channel] += count
+        logger.info(
+            f"Backfill finished in {time.perf_counter() - started:.2f}s: "
+            f"{sum(counts.values())} messages from {len(channels)} channels"
+        )
+        self.export_metrics()
+        return counts
 
 
-async def run_telegram_scraper():
-    """Main function to run the Telegram scraper."""
+async def run_telegram_scraper(
+    concurrency: Optional[int] = None,
+    incremental: bool = True,
+    reset_checkpoints: bool = False
+):
+    """
+    Main function to run the Telegram scraper.
+    
+    Args:
+        concurrency: Number of channels to scrape at once
+        incremental: Only fetch messages newer than each channel's checkpoint
+        reset_checkpoints: Clear all checkpoints before scraping (full backfill)
+    """
     # Setup logging
     logging.basicConfig(
         level=logging.INFO,
@@ -278,16 +1250,23 @@ async def run_telegram_scraper():
         logger.error("Database connection failed. Exiting.")
         return
     
+    db_manager.maintain_message_partitions()
+    
     # Initialize and run scraper
     scraper = TelegramScraper(config, db_manager)
     
+    if reset_checkpoints:
+        scraper.checkpoints.reset()
+    
     try:
         results = await scraper.scrape_all_channels(
             limit_per_channel=200,
-            days_back=7  # Scrape last 7 days
+            days_back=7,  # Scrape last 7 days
+            concurrency=concurrency,
+            incremental=incremental
         )
         
-        total_messages = sum(len(messages) for messages in results.values())
+        total_messages = sum(results.values())
         logger.info(f"Successfully scraped {total_messages} messages from {len(results)} channels")
         
         return results
@@ -297,6 +1276,50 @@ async def run_telegram_scraper():
         raise
 
 
+async def run_backfill(
+    start_date: str,
+    end_date: str,
+    window_days: Optional[int] = None,
+    concurrency: Optional[int] = None,
+    channels: Optional[List[str]] = None
+) -> Dict[str, int]:
+    """
+    Backfill channel history between two dates.
+    
+    Args:
+        start_date: First day to backfill (YYYY-MM-DD)
+        end_date: Last day to backfill, inclusive (YYYY-MM-DD)
+        window_days: Days per parallel window
+        concurrency: Number of windows scraped at once
+        channels: Channels to backfill; all configured channels if None
+    """
+    config = Config()
+    config.validate()
+    
+    db_manager = DatabaseManager(config)
+    if not db_manager.test_connection():
+        logger.error("Database connection failed. Exiting.")
+        return {}
+    
+    start = datetime.strptime(start_date, '%Y-%m-%d').replace(tzinfo=timezone.utc)
+    end = datetime.strptime(end_date, '%Y-%m-%d').replace(tzinfo=timezone.utc)
+    db_manager.ensure_message_partitions(start.date(), end.date())
+    
+    scraper = TelegramScraper(config, db_manager)
+    
+    try:
+        return await scraper.backfill(
+            start,
+            end,
+            window_days=window_days,
+            concurrency=concurrency,
+            channels=channels
+        )
+    except Exception as e:
+        logger.error(f"Backfill failed: {e}")
+        raise
+
+
 if __name__ == "__main__":
     # Run the scraper
     asyncio.run(run_telegram_scraper())
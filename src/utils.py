@@ -1,16 +1,140 @@
 """Database utilities for the data pipeline."""
 
+import json
 import logging
+import math
+import re
+from datetime import date, datetime, timedelta
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import QueuePool
 from contextlib import contextmanager
-from typing import Generator
+from typing import Any, Generator, Iterable, List, Optional, Sequence
 import pandas as pd
 from src.config import Config
 
 logger = logging.getLogger(__name__)
 
+# Unquoted marker COPY reads as NULL; a quoted "\N" stays a literal string
+COPY_NULL = '\\N'
+
+# Natural key of raw.telegram_messages; it includes the partition key, date
+MESSAGE_KEY_COLUMNS = ['channel_name', 'message_id', 'date']
+
+# Opening tag of a dollar-quoted string, e.g. $$ or $body$
+DOLLAR_QUOTE = re.compile(r'\$([A-Za-z_][A-Za-z0-9_]*)?\$')
+
+# An already-loaded message is only rewritten when one of these changed;
+# `{row}` stands for the stored or the incoming row
+MESSAGE_CHANGE_EXPRESSIONS = ["{row}.raw_data->'edit_date'", "{row}.raw_data->'views'"]
+
+
+def _copy_field(value: Any) -> str:
+    """Encode one value as a CSV field for COPY, keeping NULL and '' apart."""
+    if value is None or value is pd.NaT:
+        return COPY_NULL
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, float):
+        if math.isnan(value):
+            return COPY_NULL
+        # Integer columns holding NULLs come out of pandas as floats
+        return str(int(value)) if value.is_integer() else repr(value)
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        value = value.isoformat()
+    elif isinstance(value, (dict, list)):
+        value = json.dumps(value, default=str)
+    elif not isinstance(value, str):
+        if pd.isna(value):
+            return COPY_NULL
+        value = str(value)
+    return '"' + value.replace('"', '""') + '"'
+
+
+def split_sql_statements(sql: str) -> List[str]:
+    """
+    Split a SQL script into statements on the semicolons that end them.
+
+    Semicolons inside quoted strings, identifiers, comments and
+    dollar-quoted bodies (e.g. PL/pgSQL functions) do not split.
+    Comment-only fragments are dropped.
+    """
+    statements = []
+    start = 0
+    has_code = False
+    i = 0
+    while i < len(sql):
+        char = sql[i]
+        if char in ("'", '"'):
+            # A doubled quote is an escaped quote inside the string
+            end = i + 1
+            while end < len(sql):
+                if sql[end] == char:
+                    if sql[end + 1:end + 2] != char:
+                        break
+                    end += 1
+                end += 1
+            i = end + 1
+            has_code = True
+        elif sql.startswith('--', i):
+            end = sql.find('\n', i)
+            i = len(sql) if end < 0 else end + 1
+        elif sql.startswith('/*', i):
+            end = sql.find('*/', i + 2)
+            i = len(sql) if end < 0 else end + 2
+        elif char == '$' and DOLLAR_QUOTE.match(sql, i):
+            tag = DOLLAR_QUOTE.match(sql, i).group(0)
+            end = sql.find(tag, i + len(tag))
+            i = len(sql) if end < 0 else end + len(tag)
+            has_code = True
+        elif char == ';':
+            if has_code:
+                statements.append(sql[start:i].strip())
+            start = i + 1
+            has_code = False
+            i += 1
+        else:
+            has_code = has_code or not char.isspace()
+            i += 1
+
+    if has_code:
+        statements.append(sql[start:].strip())
+    return statements
+
+
+class CopyRowStream:
+    """
+    File-like object that encodes rows as CSV for COPY FROM STDIN on demand.
+
+    Rows are pulled from the iterable only as the driver reads, so loads
+    stream with memory bounded by the read size rather than the row count.
+    """
+
+    def __init__(self, rows: Iterable[Sequence[Any]]):
+        self._rows = iter(rows)
+        self._pending = ''
+        self.rows = 0
+
+    def read(self, size: int = -1) -> str:
+        chunks = [self._pending]
+        length = len(self._pending)
+        for row in self._rows:
+            line = ','.join(_copy_field(value) for value in row) + '\n'
+            chunks.append(line)
+            length += len(line)
+            self.rows += 1
+            if 0 <= size <= length:
+                break
+
+        data = ''.join(chunks)
+        if size < 0 or size >= len(data):
+            self._pending = ''
+            return data
+        self._pending = data[size:]
+        return data[:size]
+
 class DatabaseManager:
     """Manages database connections and operations."""
     
@@ -73,9 +197,8 @@ class DatabaseManager:
                 sql_commands = file.read()
             
             with self.engine.connect() as conn:
-                # Split by semicolon and execute each command
-                commands = [cmd.strip() for cmd in sql_commands.split(';') if cmd.strip()]
-                for command in commands:
+                # Split into statements, keeping function bodies whole
+                for command in split_sql_statements(sql_commands):
                     conn.execute(text(command))
                 conn.commit()
             
@@ -84,8 +207,167 @@ class DatabaseManager:
             logger.error(f"Failed to execute SQL file {file_path}: {e}")
             raise
     
-    def bulk_insert_dataframe(self, df: pd.DataFrame, table_name: str, schema: str = "raw"):
-        """Bulk insert DataFrame into database table."""
+    def ensure_message_partitions(self, start_date: date, end_date: date) -> int:
+        """
+        Create the monthly raw.telegram_messages partitions covering a date range.
+        
+        Messages for a month without a partition land in the default
+        partition and are moved out when the month's partition is created,
+        so this only has to run before large loads, not before every insert.
+        
+        Args:
+            start_date: First day that needs a partition
+            end_date: Last day that needs a partition
+            
+        Returns:
+            Number of partitions created
+        """
+        try:
+            with self.engine.begin() as conn:
+                created = conn.execute(
+                    text("SELECT raw.ensure_telegram_messages_partitions(:start_date, :end_date)"),
+                    {'start_date': start_date, 'end_date': end_date}
+                ).scalar()
+            if created:
+                logger.info(f"Created {created} raw.telegram_messages partitions for {start_date} to {end_date}")
+            return created
+        except Exception as e:
+            logger.error(f"Failed to create raw.telegram_messages partitions: {e}")
+            raise
+    
+    def drop_message_partitions(self, retention_months: Optional[int] = None) -> int:
+        """
+        Drop raw.telegram_messages partitions older than the retention period.
+        
+        Args:
+            retention_months: Whole months to keep before the current one.
+                             Defaults to Config.MESSAGE_RETENTION_MONTHS; 0 keeps everything
+            
+        Returns:
+            Number of partitions dropped
+        """
+        retention_months = retention_months if retention_months is not None else self.config.MESSAGE_RETENTION_MONTHS
+        if retention_months <= 0:
+            return 0
+        
+        today = date.today()
+        month_index = today.year * 12 + today.month - 1 - retention_months
+        cutoff = date(month_index // 12, month_index % 12 + 1, 1)
+        try:
+            with self.engine.begin() as conn:
+                dropped = conn.execute(
+                    text("SELECT raw.drop_telegram_messages_partitions(:cutoff)"),
+                    {'cutoff': cutoff}
+                ).scalar()
+            logger.info(f"Dropped {dropped} raw.telegram_messages partitions before {cutoff}")
+            return dropped
+        except Exception as e:
+            logger.error(f"Failed to drop raw.telegram_messages partitions: {e}")
+            raise
+    
+    def maintain_message_partitions(self):
+        """Create the coming months' partitions and apply the retention period."""
+        today = date.today()
+        self.ensure_message_partitions(
+            today,
+            today + timedelta(days=31 * self.config.MESSAGE_PARTITION_MONTHS_AHEAD)
+        )
+        self.drop_message_partitions()
+    
+    def upsert_albums(self, albums: List[dict]) -> int:
+        """
+        Merge album rows into raw.telegram_albums, one row per (channel_name, grouped_id).
+        
+        An album seen again, whether re-scraped or cut in two at a scrape
+        boundary, is merged into its row: message ids and image paths are
+        combined, the earliest date and first caption kept, and the media
+        count summed for disjoint parts or kept for repeats.
+        
+        Args:
+            albums: Album dictionaries as built by the scraper
+            
+        Returns:
+            Number of albums written
+        """
+        if not albums:
+            return 0
+        
+        rows = [
+            {
+                **album,
+                'message_ids': json.dumps(album['message_ids']),
+                'image_paths': json.dumps(album['image_paths'], default=str)
+            }
+            for album in albums
+        ]
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(
+                    text("""
+                        INSERT INTO raw.telegram_albums AS target
+                            (grouped_id, channel_name, date, message_ids, caption, media_count, image_paths, scraped_at)
+                        VALUES
+                            (:grouped_id, :channel_name, :date, CAST(:message_ids AS JSONB), :caption,
+                             :media_count, CAST(:image_paths AS JSONB), :scraped_at)
+                        ON CONFLICT (channel_name, grouped_id) DO UPDATE SET
+                            date = LEAST(target.date, EXCLUDED.date),
+                            message_ids = (
+                                SELECT jsonb_agg(DISTINCT id ORDER BY id)
+                                FROM jsonb_array_elements(
+                                    COALESCE(target.message_ids, '[]'::jsonb) || EXCLUDED.message_ids
+                                ) AS ids(id)
+                            ),
+                            caption = COALESCE(target.caption, EXCLUDED.caption),
+                            media_count = CASE
+                                WHEN target.message_ids @> EXCLUDED.message_ids
+                                  OR EXCLUDED.message_ids @> target.message_ids
+                                THEN GREATEST(target.media_count, EXCLUDED.media_count)
+                                ELSE target.media_count + EXCLUDED.media_count
+                            END,
+                            image_paths = (
+                                SELECT COALESCE(jsonb_agg(DISTINCT path), '[]'::jsonb)
+                                FROM jsonb_array_elements(
+                                    COALESCE(target.image_paths, '[]'::jsonb) || EXCLUDED.image_paths
+                                ) AS paths(path)
+                            ),
+                            scraped_at = EXCLUDED.scraped_at
+                    """),
+                    rows
+                )
+            logger.info(f"Upserted {len(rows)} albums into raw.telegram_albums")
+            return len(rows)
+        except Exception as e:
+            logger.error(f"Failed to upsert albums into raw.telegram_albums: {e}")
+            raise
+    
+    def bulk_insert_dataframe(
+        self,
+        df: pd.DataFrame,
+        table_name: str,
+        schema: str = "raw",
+        method: Optional[str] = None
+    ):
+        """
+        Bulk insert DataFrame into database table.
+        
+        Args:
+            df: Rows to insert; columns must match the table's
+            table_name: Target table
+            schema: Target schema
+            method: 'copy' streams the rows with COPY FROM STDIN, 'insert'
+                    uses multi-row INSERTs. Defaults to Config.DB_LOAD_METHOD;
+                    COPY is only used on PostgreSQL
+        """
+        method = method or self.config.DB_LOAD_METHOD
+        if method == 'copy' and self.engine.dialect.name == 'postgresql':
+            self.copy_rows(
+                df.itertuples(index=False, name=None),
+                list(df.columns),
+                table_name,
+                schema=schema
+            )
+            return
+        
         try:
             df.to_sql(
                 table_name,
@@ -100,3 +382,236 @@ class DatabaseManager:
         except Exception as e:
             logger.error(f"Failed to insert data into {schema}.{table_name}: {e}")
             raise
+    
+    def load_messages(self, df: pd.DataFrame, mode: Optional[str] = None) -> int:
+        """
+        Load message rows into raw.telegram_messages.
+        
+        'upsert' merges on (channel_name, message_id), so reloading the same
+        messages does not duplicate them; 'append' inserts every row.
+        
+        Args:
+            df: Message rows
+            mode: 'upsert' or 'append'. Defaults to Config.LOAD_MODE
+        
+        Returns:
+            Number of rows inserted or updated
+        """
+        if (mode or self.config.LOAD_MODE) == 'upsert':
+            return self.upsert_dataframe(
+                df,
+                'telegram_messages',
+                MESSAGE_KEY_COLUMNS,
+                schema='raw',
+                change_expressions=MESSAGE_CHANGE_EXPRESSIONS
+            )
+        
+        self.bulk_insert_dataframe(df, 'telegram_messages', schema='raw')
+        return len(df)
+    
+    def load_message_rows(
+        self,
+        rows: Iterable[Sequence[Any]],
+        columns: List[str],
+        mode: Optional[str] = None
+    ) -> int:
+        """
+        Load message rows into raw.telegram_messages without a DataFrame.
+        
+        Streams the rows through COPY; dict and list values (raw_data) are
+        serialised to JSON as they are encoded. Only the 'append' mode with
+        the 'insert' load method, or a non-PostgreSQL database, falls back
+        to building a DataFrame.
+        
+        Args:
+            rows: Tuples of values, aligned with `columns`
+            columns: Message column names
+            mode: 'upsert' or 'append'. Defaults to Config.LOAD_MODE
+            
+        Returns:
+            Number of rows inserted or updated
+        """
+        if (mode or self.config.LOAD_MODE) == 'upsert':
+            return self.upsert_rows(
+                rows,
+                columns,
+                'telegram_messages',
+                MESSAGE_KEY_COLUMNS,
+                schema='raw',
+                change_expressions=MESSAGE_CHANGE_EXPRESSIONS
+            )
+        
+        if self.config.DB_LOAD_METHOD == 'copy' and self.engine.dialect.name == 'postgresql':
+            return self.copy_rows(rows, columns, 'telegram_messages', schema='raw')
+        
+        df = pd.DataFrame.from_records(list(rows), columns=columns)
+        df['date'] = pd.to_datetime(df['date'])
+        df['scraped_at'] = pd.to_datetime(df['scraped_at'])
+        df['raw_data'] = df['raw_data'].apply(
+            lambda x: json.dumps(x, default=str) if isinstance(x, (dict, list)) else x
+        )
+        self.bulk_insert_dataframe(df, 'telegram_messages', schema='raw')
+        return len(df)
+    
+    def upsert_dataframe(
+        self,
+        df: pd.DataFrame,
+        table_name: str,
+        key_columns: List[str],
+        schema: str = "raw",
+        change_expressions: Optional[List[str]] = None
+    ) -> int:
+        """
+        Merge a DataFrame into a table on its unique key.
+        
+        The rows are copied into a temporary table with COPY, then merged
+        with INSERT ... ON CONFLICT. Existing rows are only rewritten when
+        they changed, so reloading unchanged data costs no writes.
+        
+        Args:
+            df: Rows to merge; columns must match the table's
+            table_name: Target table, with a unique index on `key_columns`
+            key_columns: Columns identifying a row
+            schema: Target schema
+            change_expressions: SQL expressions, with `{row}` for the row alias,
+                               compared to decide whether a stored row changed.
+                               Defaults to every non-key column
+            
+        Returns:
+            Number of rows inserted or updated
+        """
+        return self.upsert_rows(
+            df.itertuples(index=False, name=None),
+            list(df.columns),
+            table_name,
+            key_columns,
+            schema=schema,
+            change_expressions=change_expressions
+        )
+    
+    def upsert_rows(
+        self,
+        rows: Iterable[Sequence[Any]],
+        columns: List[str],
+        table_name: str,
+        key_columns: List[str],
+        schema: str = "raw",
+        change_expressions: Optional[List[str]] = None
+    ) -> int:
+        """
+        Merge rows into a table on its unique key (see upsert_dataframe).
+        
+        Rows are encoded lazily while COPY reads them, so the caller can
+        stream them without building a DataFrame.
+        
+        Args:
+            rows: Tuples of values, aligned with `columns`
+            columns: Target column names
+            table_name: Target table, with a unique index on `key_columns`
+            key_columns: Columns identifying a row
+            schema: Target schema
+            change_expressions: As for upsert_dataframe
+            
+        Returns:
+            Number of rows inserted or updated
+        """
+        update_columns = [column for column in columns if column not in key_columns]
+        change_expressions = change_expressions or [f'{{row}}."{column}"' for column in update_columns]
+        
+        quoted_columns = ', '.join(f'"{column}"' for column in columns)
+        quoted_keys = ', '.join(f'"{column}"' for column in key_columns)
+        staging_table = f'upsert_{table_name}'
+        
+        def changed_values(row: str) -> str:
+            return ', '.join(f'({expression.format(row=row)})' for expression in change_expressions)
+        
+        merge_sql = f"""
+            INSERT INTO "{schema}"."{table_name}" AS target ({quoted_columns})
+            SELECT DISTINCT ON ({quoted_keys}) {quoted_columns}
+            FROM "{staging_table}"
+            ORDER BY {quoted_keys}
+            ON CONFLICT ({quoted_keys}) DO UPDATE SET
+                {', '.join(f'"{column}" = EXCLUDED."{column}"' for column in update_columns)}
+            WHERE ROW({changed_values('target')}) IS DISTINCT FROM ROW({changed_values('EXCLUDED')})
+        """
+        
+        connection = self.engine.raw_connection()
+        try:
+            with connection.cursor() as cursor:
+                # Same column types as the target, none of its defaults or sequences
+                cursor.execute(
+                    f'CREATE TEMP TABLE "{staging_table}" ON COMMIT DROP AS '
+                    f'SELECT {quoted_columns} FROM "{schema}"."{table_name}" WITH NO DATA'
+                )
+                stream = CopyRowStream(rows)
+                cursor.copy_expert(
+                    f'COPY "{staging_table}" ({quoted_columns}) '
+                    f"FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')",
+                    stream
+                )
+                cursor.execute(merge_sql)
+                merged = cursor.rowcount
+            connection.commit()
+            logger.info(
+                f"Upserted {stream.rows} rows into {schema}.{table_name}: "
+                f"{merged} inserted or changed, {stream.rows - merged} unchanged"
+            )
+            return merged
+        except Exception as e:
+            connection.rollback()
+            logger.error(f"Failed to upsert data into {schema}.{table_name}: {e}")
+            raise
+        finally:
+            connection.close()
+    
+    def copy_rows(
+        self,
+        rows: Iterable[Sequence[Any]],
+        columns: List[str],
+        table_name: str,
+        schema: str = "raw",
+        cursor: Optional[Any] = None
+    ) -> int:
+        """
+        Load rows with COPY FROM STDIN in CSV format.
+        
+        Rows are encoded lazily while PostgreSQL reads them, in a single
+        transaction: either every row is loaded or none is.
+        
+        Args:
+            rows: Tuples of values, aligned with `columns`
+            columns: Target column names
+            table_name: Target table
+            schema: Target schema
+            cursor: DBAPI cursor of a transaction the caller is running, to
+                   copy as part of it; the caller commits. If None, the rows
+                   are copied in a transaction of their own
+            
+        Returns:
+            Number of rows loaded
+        """
+        column_list = ', '.join(f'"{column}"' for column in columns)
+        sql = (
+            f'COPY "{schema}"."{table_name}" ({column_list}) '
+            f"FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')"
+        )
+        stream = CopyRowStream(rows)
+        
+        if cursor is not None:
+            cursor.copy_expert(sql, stream)
+            logger.info(f"Copied {stream.rows} rows into {schema}.{table_name}")
+            return stream.rows
+        
+        connection = self.engine.raw_connection()
+        try:
+            with connection.cursor() as cursor:
+                cursor.copy_expert(sql, stream)
+            connection.commit()
+            logger.info(f"Successfully copied {stream.rows} rows into {schema}.{table_name}")
+            return stream.rows
+        except Exception as e:
+            connection.rollback()
+            logger.error(f"Failed to copy data into {schema}.{table_name}: {e}")
+            raise
+        finally:
+            connection.close()
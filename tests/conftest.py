@@ -0,0 +1,7 @@
+"""Shared pytest setup: make the project packages importable."""
+
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -0,0 +1,110 @@
+"""Tests for the CSV encoding that feeds COPY FROM STDIN."""
+
+import json
+from datetime import date, datetime, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils import COPY_NULL, CopyRowStream, _copy_field
+
+
+def parse(data: str):
+    """Read COPY CSV back the way PostgreSQL does: only an unquoted \\N is NULL."""
+    rows, row, field, quoted, in_quotes = [], [], '', False, False
+    i = 0
+    while i < len(data):
+        char = data[i]
+        if in_quotes:
+            if char == '"' and data[i + 1:i + 2] == '"':
+                field += '"'
+                i += 1
+            elif char == '"':
+                in_quotes = False
+            else:
+                field += char
+        elif char == '"':
+            in_quotes = quoted = True
+        elif char in ',\n':
+            row.append(None if field == COPY_NULL and not quoted else field)
+            field, quoted = '', False
+            if char == '\n':
+                rows.append(row)
+                row = []
+        else:
+            field += char
+        i += 1
+    return rows
+
+
+@pytest.mark.parametrize('value, expected', [
+    (None, COPY_NULL),
+    (pd.NaT, COPY_NULL),
+    (float('nan'), COPY_NULL),
+    (np.nan, COPY_NULL),
+    (True, 'true'),
+    (False, 'false'),
+    (42, '42'),
+    (42.0, '42'),
+    (0.25, '0.25'),
+    ('', '""'),
+    ('\\N', '"\\N"'),
+    ('say "hi"', '"say ""hi"""'),
+    ('a,b\nc', '"a,b\nc"'),
+    (date(2024, 1, 31), '"2024-01-31"'),
+    (datetime(2024, 1, 31, 12, 30, tzinfo=timezone.utc), '"2024-01-31T12:30:00+00:00"'),
+    ({'views': 1}, '"{""views"": 1}"'),
+    ([1, 2], '"[1, 2]"'),
+])
+def test_copy_field(value, expected):
+    assert _copy_field(value) == expected
+
+
+def test_empty_string_and_null_stay_apart():
+    data = CopyRowStream([('', None, '\\N')]).read()
+    assert parse(data) == [['', None, '\\N']]
+
+
+def test_stream_round_trips_awkward_values():
+    rows = [
+        (1, 'plain', None, {'text': 'comma, "quote"\nnewline'}),
+        (2, 'ünïcode ✓', 1.5, [1, 'two']),
+        (3, '', np.int64(7), None),
+    ]
+    decoded = parse(CopyRowStream(rows).read())
+    assert decoded == [
+        ['1', 'plain', None, json.dumps(rows[0][3])],
+        ['2', 'ünïcode ✓', '1.5', json.dumps(rows[1][3])],
+        ['3', '', '7', None],
+    ]
+
+
+@pytest.mark.parametrize('size', [1, 3, 17, 4096])
+def test_sized_reads_match_one_read(size):
+    rows = [(i, f'message "{i}", with text', i * 0.5, None) for i in range(200)]
+    expected = CopyRowStream(rows).read()
+
+    stream = CopyRowStream(rows)
+    chunks = []
+    while True:
+        chunk = stream.read(size)
+        if not chunk:
+            break
+        assert len(chunk) <= size
+        chunks.append(chunk)
+    assert ''.join(chunks) == expected
+    assert stream.rows == len(rows)
+
+
+def test_rows_are_pulled_lazily():
+    pulled = []
+
+    def rows():
+        for i in range(1000):
+            pulled.append(i)
+            yield (i, 'x' * 10)
+
+    stream = CopyRowStream(rows())
+    stream.read(50)
+    assert len(pulled) < 10
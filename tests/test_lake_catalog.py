@@ -0,0 +1,120 @@
+"""Tests for the SQLite index of the data lake."""
+
+import json
+
+import pytest
+
+from src.scraping.lake_catalog import ALBUMS, IMAGE, MESSAGES, LakeCatalog
+from src.scraping.media_store import MediaStore
+
+
+def write_messages(lake, date, channel, count):
+    folder = lake / 'telegram_messages' / date
+    folder.mkdir(parents=True, exist_ok=True)
+    file_path = folder / f'{channel}.json'
+    file_path.write_text(json.dumps([{'message_id': i} for i in range(count)]), encoding='utf-8')
+    return file_path
+
+
+def write_image(lake, channel, date, name):
+    folder = lake / 'images' / channel / date
+    folder.mkdir(parents=True, exist_ok=True)
+    image_path = folder / name
+    image_path.write_bytes(b'\xff\xd8 not really a jpeg')
+    return image_path
+
+
+@pytest.fixture
+def relative_lake(tmp_path, monkeypatch):
+    """A lake at ./data/raw, like the default DATA_LAKE_PATH."""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path / 'data' / 'raw'
+
+
+def test_first_catalog_indexes_existing_lake_with_relative_path(relative_lake):
+    write_messages(relative_lake, '2024-01-01', 'channel_a', 3)
+    write_image(relative_lake, 'channel_a', '2024-01-01', 'photo.jpg')
+
+    catalog = LakeCatalog('./data/raw')
+    messages = list(catalog.iter_files(MESSAGES))
+    images = list(catalog.iter_files(IMAGE))
+    catalog.close()
+
+    assert [(m['path'], m['channel_name'], m['row_count']) for m in messages] == [
+        ('telegram_messages/2024-01-01/channel_a.json', 'channel_a', 3)
+    ]
+    assert [image['path'] for image in images] == ['images/channel_a/2024-01-01/photo.jpg']
+
+
+def test_record_file_accepts_working_directory_and_lake_relative_paths(relative_lake):
+    catalog = LakeCatalog('./data/raw')
+    file_path = write_messages(relative_lake, '2024-01-02', 'channel_b', 2)
+
+    # As the scraper passes it: relative to the working directory
+    catalog.record_file('data/raw/telegram_messages/2024-01-02/channel_b.json', MESSAGES, 'channel_b', '2024-01-02')
+    # As the media store returns it: relative to the lake root
+    write_image(relative_lake, 'objects', 'ab', 'abcdef.jpg')
+    catalog.record_file('images/objects/ab/abcdef.jpg', IMAGE, 'channel_b', '2024-01-02')
+    # Absolute
+    catalog.record_file(file_path.resolve(), MESSAGES, 'channel_b', '2024-01-02')
+
+    assert [entry['path'] for entry in catalog.iter_files(MESSAGES)] == [
+        'telegram_messages/2024-01-02/channel_b.json'
+    ]
+    assert [entry['path'] for entry in catalog.iter_files(IMAGE)] == ['images/objects/ab/abcdef.jpg']
+    with pytest.raises(ValueError):
+        catalog.record_file(relative_lake.parent / 'elsewhere.json', MESSAGES, 'channel_b', '2024-01-02')
+    catalog.close()
+
+
+def test_empty_catalog_is_rebuilt_on_next_open(tmp_path):
+    lake = tmp_path / 'lake'
+    LakeCatalog(str(lake)).close()
+    write_messages(lake, '2024-01-03', 'channel_c', 1)
+
+    catalog = LakeCatalog(str(lake))
+    assert catalog.summary(MESSAGES)['files'] == 1
+    catalog.close()
+
+
+def test_reconcile_adds_updates_and_removes(tmp_path):
+    lake = tmp_path / 'lake'
+    kept = write_messages(lake, '2024-01-04', 'channel_d', 1)
+    gone = write_messages(lake, '2024-01-04', 'channel_e', 1)
+    catalog = LakeCatalog(str(lake))
+    start_seq, _ = catalog.changes_since(0)
+
+    # Files written behind the catalog's back
+    write_messages(lake, '2024-01-05', 'channel_f', 4)
+    kept.write_text(json.dumps([{'message_id': i} for i in range(10)]), encoding='utf-8')
+    gone.unlink()
+    albums = lake / 'telegram_albums' / '2024-01-05'
+    albums.mkdir(parents=True)
+    (albums / 'channel_f.ndjson').write_text('{"grouped_id": 1}\n', encoding='utf-8')
+
+    assert catalog.reconcile() == {'added': 2, 'updated': 1, 'removed': 1}
+    assert catalog.reconcile() == {'added': 0, 'updated': 0, 'removed': 0}
+
+    rows = {entry['channel_name']: entry['row_count'] for entry in catalog.iter_files(MESSAGES)}
+    assert rows == {'channel_d': 10, 'channel_f': 4}
+    assert catalog.summary(ALBUMS)['files'] == 1
+    assert catalog.changes_since(start_seq, kind=MESSAGES)[1] == 2
+    catalog.close()
+
+
+def test_rebuild_indexes_content_addressed_links(tmp_path):
+    lake = tmp_path / 'lake'
+    media_store = MediaStore(str(lake))
+    stored = media_store.put(b'image bytes', '.jpg', media_id=7)
+    media_store.link('channel_g', '2024-01-06', 1, stored['sha256'])
+    media_store.link('channel_h', '2024-01-06', 2, stored['sha256'])
+    media_store.close()
+
+    catalog = LakeCatalog(str(lake))
+    entries = list(catalog.iter_files(IMAGE))
+    catalog.close()
+
+    assert {(entry['path'], entry['channel_name']) for entry in entries} == {
+        (stored['path'], 'channel_g'), (stored['path'], 'channel_h')
+    }
+    assert {entry['checksum'] for entry in entries} == {stored['sha256']}
@@ -0,0 +1,80 @@
+"""Tests for streaming reads of data lake files."""
+
+import io
+import json
+import random
+
+import pytest
+
+from src.scraping.lake_io import iter_json_array, iter_lake_records
+
+
+def decode(text: str, chunk_size: int):
+    return list(iter_json_array(io.StringIO(text), chunk_size))
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 5, 7, 16, 1024])
+@pytest.mark.parametrize('text', [
+    '[]',
+    ' [ ] ',
+    '[-25000000000.0]',
+    '[1, 22, 333, -4444.5e-3]',
+    '[1.5e10,2E-3]',
+    '[true, false, null]',
+    '["a,]b", "\\"quoted\\"", "\\u00e9"]',
+    '[{"message_id": 1, "views": 120}, {"message_id": 2, "nested": [1, [2, 3]]}]',
+    '[\n  {\n    "message_id": 12345678901234567890\n  }\n]',
+])
+def test_matches_json_loads(text, chunk_size):
+    assert decode(text, chunk_size) == json.loads(text)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 5, 7])
+def test_numbers_split_at_chunk_boundaries(chunk_size):
+    # Every prefix of a number is itself a valid number, so a value cut at
+    # the end of a chunk must not be taken as complete
+    values = [-25000000000.0, 123456789, 0.000123, -1e-300, 98765.4321e12]
+    for indent in (None, 2):
+        text = json.dumps(values, indent=indent)
+        assert decode(text, chunk_size) == values
+
+
+def test_random_documents_match_json_loads():
+    rnd = random.Random(42)
+
+    def value(depth=0):
+        roll = rnd.random()
+        if depth > 2 or roll < 0.5:
+            return rnd.choice([
+                rnd.uniform(-1e12, 1e12), rnd.randint(-10 ** 12, 10 ** 12), 1.5e-7,
+                'text "with" quotes, commas] and é', True, False, None
+            ])
+        if roll < 0.75:
+            return [value(depth + 1) for _ in range(rnd.randint(0, 3))]
+        return {f'k{i}': value(depth + 1) for i in range(rnd.randint(0, 3))}
+
+    for _ in range(300):
+        text = json.dumps([value() for _ in range(rnd.randint(0, 6))], indent=rnd.choice([None, 2]))
+        for chunk_size in (1, 3, 7, 64):
+            assert decode(text, chunk_size) == json.loads(text)
+
+
+@pytest.mark.parametrize('text', ['{}', '[1 2]', '[1x]', '[1,]', '[', '[1, 2'])
+def test_malformed_arrays_raise(text):
+    with pytest.raises(ValueError):
+        decode(text, 2)
+
+
+def test_iter_lake_records_reads_json_and_ndjson(tmp_path):
+    records = [{'message_id': i, 'text': f'message {i}'} for i in range(5)]
+    json_file = tmp_path / 'channel.json'
+    json_file.write_text(json.dumps(records, indent=2), encoding='utf-8')
+    ndjson_file = tmp_path / 'channel.ndjson'
+    ndjson_file.write_text(
+        ''.join(json.dumps(record) + '\n' for record in records) + '{"message_id": 5, "te',
+        encoding='utf-8'
+    )
+
+    assert list(iter_lake_records(json_file)) == records
+    # A truncated last line is skipped, not fatal
+    assert list(iter_lake_records(ndjson_file)) == records
@@ -0,0 +1,44 @@
+"""Tests for the media download worker pool."""
+
+import asyncio
+
+import pytest
+
+from src.scraping.media_downloader import MediaCallbackError, MediaDownloadPool
+
+
+async def download(message, channel_name):
+    return f'{channel_name}/{message}.jpg'
+
+
+def test_failed_completion_callback_is_raised_from_drain():
+    def on_done(record):
+        if record['message_id'] == 2:
+            raise OSError('disk full')
+
+    async def scenario():
+        records = [{'message_id': i} for i in range(3)]
+        async with MediaDownloadPool(download, workers=2) as pool:
+            for record in records:
+                await pool.submit(record['message_id'], 'channel_a', record, on_done=on_done)
+            with pytest.raises(MediaCallbackError, match='disk full'):
+                await pool.drain()
+            # The error is reported once; later drains succeed
+            await pool.drain()
+        return records
+
+    records = asyncio.run(scenario())
+    assert [record['image_path'] for record in records] == [f'channel_a/{i}.jpg' for i in range(3)]
+
+
+def test_failed_completion_callback_is_raised_on_exit():
+    def on_done(record):
+        raise OSError('disk full')
+
+    async def scenario():
+        async with MediaDownloadPool(download, workers=1) as pool:
+            await pool.submit(1, 'channel_a', {'message_id': 1}, on_done=on_done)
+        return pool
+
+    with pytest.raises(MediaCallbackError):
+        asyncio.run(scenario())
@@ -0,0 +1,54 @@
+"""Tests for the Parquet layout of the data lake."""
+
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from src.scraping.parquet_lake import (
+    ParquetLakeWriter,
+    iter_parquet_batches,
+    records_to_table,
+    table_rows_to_records,
+)
+
+GROUPED_ID = 13391744563426337
+
+
+def message(message_id, grouped_id=None, sender_id=None):
+    return {
+        'message_id': message_id,
+        'channel_name': 'channel_a',
+        'date': '2024-01-01T10:00:00+00:00',
+        'text': f'message {message_id}',
+        'sender_id': sender_id,
+        'has_media': grouped_id is not None,
+        'media_type': 'photo' if grouped_id is not None else None,
+        'image_path': None,
+        'scraped_at': datetime(2024, 1, 2, 8, 0),
+        'raw_data': {'views': 10, 'forwards': None, 'replies': None, 'edit_date': None, 'grouped_id': grouped_id},
+    }
+
+
+def test_records_to_table_keeps_large_ids_next_to_none():
+    table = records_to_table([
+        message(1, grouped_id=GROUPED_ID, sender_id=-1001234567890123),
+        message(2),
+    ])
+
+    assert table.column('grouped_id').to_pylist() == [GROUPED_ID, None]
+    assert table.column('sender_id').to_pylist() == [-1001234567890123, None]
+
+
+def test_grouped_id_round_trips_through_the_dataset(tmp_path):
+    with ParquetLakeWriter(tmp_path / 'lake') as writer:
+        writer.write_many([message(1, grouped_id=GROUPED_ID), message(2), message(3, grouped_id=GROUPED_ID + 1)])
+
+    rows = [row for batch in iter_parquet_batches(tmp_path / 'lake') for row in batch]
+    records = {record['message_id']: record for record in table_rows_to_records(rows)}
+
+    assert records[1]['raw_data']['grouped_id'] == GROUPED_ID
+    assert records[2]['raw_data']['grouped_id'] is None
+    assert records[3]['raw_data']['grouped_id'] == GROUPED_ID + 1
+    assert records[1]['raw_data']['views'] == 10
@@ -0,0 +1,58 @@
+"""Tests for splitting SQL scripts into statements."""
+
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+
+from src.utils import split_sql_statements
+
+SQL_DIR = Path(__file__).parent.parent / 'sql'
+
+
+def test_splits_on_statement_semicolons():
+    assert split_sql_statements('SELECT 1; SELECT 2;\nSELECT 3') == ['SELECT 1', 'SELECT 2', 'SELECT 3']
+
+
+@pytest.mark.parametrize('statement', [
+    "SELECT 'a;b', 'it''s; fine'",
+    'SELECT 1 AS "odd;name"',
+    'SELECT 1 -- trailing; comment\n',
+    'SELECT /* block; comment */ 1',
+    "SELECT $$a; b$$, $body$ nested $$; $$ still; $body$",
+])
+def test_semicolons_inside_literals_and_comments_do_not_split(statement):
+    assert split_sql_statements(statement + ';\nSELECT 2;') == [statement.strip(), 'SELECT 2']
+
+
+def test_function_bodies_stay_whole():
+    sql = """
+        CREATE OR REPLACE FUNCTION raw.f(x INTEGER) RETURNS INTEGER AS $$
+        BEGIN
+            PERFORM 1;
+            RETURN x + 1;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        SELECT raw.f(1);
+    """
+    statements = split_sql_statements(sql)
+    assert len(statements) == 2
+    assert statements[0].endswith('$$ LANGUAGE plpgsql')
+    assert 'RETURN x + 1;' in statements[0]
+
+
+def test_comment_only_fragments_are_dropped():
+    sql = '-- header\n;\n/* nothing */;\nSELECT 1;\n-- footer\n'
+    assert split_sql_statements(sql) == ['SELECT 1']
+
+
+@pytest.mark.parametrize('sql_file', sorted(SQL_DIR.rglob('*.sql')), ids=lambda path: path.name)
+def test_repo_scripts_split_without_bind_parameters(sql_file):
+    statements = split_sql_statements(sql_file.read_text(encoding='utf-8'))
+    assert statements
+    for statement in statements:
+        assert not statement.endswith(';')
+        # execute_sql_file runs each statement through text(); a stray
+        # `:name` would turn into a bind parameter
+        assert not text(statement).compile().params